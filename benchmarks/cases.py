@@ -0,0 +1,254 @@
+"""Benchmark cases: the functions called from the dashboard timers.
+
+Each case is a setup function returning the zero-argument callable to
+time; setup cost (parsing fixtures, warming caches) is not measured.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+from quelio_cli.aggregate import WeekTotals
+from quelio_cli.model import parse_week
+from quelio_cli.utils_time import (
+    day_paid_bonus,
+    day_total_from_points,
+    day_total_from_points_dynamic,
+    format_week_summary,
+    hhmm_to_minutes,
+)
+
+from .fixtures import MONDAY, NOW, dense_week, multi_week, normal_week
+
+CASES: Dict[str, Callable[[], Callable[[], object]]] = {}
+NOW_MIN = NOW.hour * 60 + NOW.minute
+MONDAY_KEY = MONDAY.strftime("%d-%m-%Y")
+
+
+def case(name: str):
+    def register(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def _today(payload: Dict):
+    week = parse_week(payload)
+    return week.minutes(NOW.strftime("%d-%m-%Y"))
+
+
+# --- time math (utils_time) -------------------------------------------------
+
+
+@case("hhmm_to_minutes")
+def _():
+    return lambda: hhmm_to_minutes("13:47")
+
+
+@case("day_total/normal")
+def _():
+    points = parse_week(normal_week()).minutes(MONDAY_KEY)
+    return lambda: day_total_from_points(points)
+
+
+@case("day_total/dense")
+def _():
+    points = parse_week(dense_week()).minutes(MONDAY_KEY)
+    return lambda: day_total_from_points(points)
+
+
+@case("day_total_dynamic/open")
+def _():
+    points = _today(normal_week())
+    return lambda: day_total_from_points_dynamic(points, NOW_MIN)
+
+
+@case("day_total_dynamic/dense-open")
+def _():
+    points = _today(dense_week())
+    return lambda: day_total_from_points_dynamic(points, NOW_MIN)
+
+
+@case("day_paid_bonus/today")
+def _():
+    points = _today(normal_week())
+    return lambda: day_paid_bonus(points, NOW.date(), NOW)
+
+
+@case("format_week_summary/normal")
+def _():
+    week = parse_week(normal_week())
+    return lambda: format_week_summary(week)
+
+
+@case("format_week_summary/multi-week")
+def _():
+    week = parse_week(multi_week())
+    return lambda: format_week_summary(week)
+
+
+# --- parsing and weekly totals ----------------------------------------------
+
+
+@case("parse_week/normal")
+def _():
+    payload = normal_week()
+    return lambda: parse_week(payload)
+
+
+@case("parse_week/multi-week")
+def _():
+    payload = multi_week()
+    return lambda: parse_week(payload)
+
+
+@case("week_totals/freeze")
+def _():
+    week = parse_week(dense_week())
+    return lambda: WeekTotals(week, 38 * 60, [0, 1, 2, 3, 4], NOW, reference=NOW.date())
+
+
+@case("week_totals/at")
+def _():
+    totals = WeekTotals(parse_week(dense_week()), 38 * 60, [0, 1, 2, 3, 4], NOW, reference=NOW.date())
+    return lambda: totals.at(NOW)
+
+
+# --- timeline geometry (timeline.py) -----------------------------------------
+
+
+def _layout(points, now_min):
+    from quelio_cli.timeline import fit_window, merge_intervals
+
+    intervals, live = merge_intervals(points, now_min)
+    return intervals, live, fit_window(intervals + [live] if live else intervals)
+
+
+@case("timeline_runs/dense-live")
+def _():
+    from quelio_cli.timeline import timeline_runs
+
+    intervals, live, window = _layout(_today(dense_week()), NOW_MIN)
+    return lambda: timeline_runs(intervals, live, 40, window)
+
+
+@case("timeline_runs/normal-wide")
+def _():
+    # Four times the usual width: same number of intervals, same cost
+    from quelio_cli.timeline import timeline_runs
+
+    intervals, live, window = _layout(parse_week(normal_week()).minutes(MONDAY_KEY), None)
+    return lambda: timeline_runs(intervals, live, 160, window)
+
+
+# --- lite ANSI dashboard (lite.py) -------------------------------------------
+
+
+def _lite_view(pulse: bool):
+    from quelio_cli.lite import build_view
+
+    week = parse_week(dense_week())
+    days = [(f"Jour {key}", week.minutes(key), key == NOW.strftime("%d-%m-%Y")) for key in sorted(week.days)]
+    return lambda now: build_view("Ma semaine", ("21:35", "22:17", "15:43"), days, now, 80, 45, [], pulse=pulse)
+
+
+@case("lite/build_view")
+def _():
+    view = _lite_view(pulse=False)
+    return lambda: view(NOW)
+
+
+@case("lite/draw-unchanged")
+def _():
+    from quelio_cli.lite import Palette, Screen
+
+    screen = Screen(Palette("256"))
+    lines = _lite_view(pulse=False)(NOW)
+    screen.draw(lines, 80, 45)
+    return lambda: screen.draw(lines, 80, 45)
+
+
+@case("lite/draw-pulse-frame")
+def _():
+    from datetime import timedelta
+
+    from quelio_cli.lite import Palette, Screen
+
+    screen = Screen(Palette("truecolor"))
+    view = _lite_view(pulse=True)
+    frames = [view(NOW + timedelta(seconds=0.1 * i)) for i in range(35)]
+    screen.draw(frames[-1], 80, 45)
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) % len(frames)
+        return screen.draw(frames[state["i"]], 80, 45)
+
+    return run
+
+
+# --- Rich renderables (render.py) --------------------------------------------
+# Registered only when Rich is installed, like the dashboard itself.
+
+try:
+    from rich.console import Console
+
+    from quelio_cli.render import DayCardRenderer, render_totals, timeline_segments
+except ImportError:  # pragma: no cover - optional dependency
+    Console = None
+
+if Console is not None:
+    # Same width as a day card in the dashboard column
+    CARD_WIDTH = 47
+
+    @case("timeline/closed")
+    def _():
+        points = parse_week(normal_week()).minutes(MONDAY_KEY)
+        return lambda: timeline_segments(points, None, live=False)
+
+    @case("timeline/dense-live")
+    def _():
+        points = _today(dense_week())
+        return lambda: timeline_segments(points, NOW_MIN, live=True)
+
+    @case("day_card/closed-cached")
+    def _():
+        points = parse_week(normal_week()).minutes(MONDAY_KEY)
+        renderer = DayCardRenderer()
+        renderer.render("lundi 15-01-2024", points, False, False, CARD_WIDTH, NOW)
+        return lambda: renderer.render("lundi 15-01-2024", points, False, False, CARD_WIDTH, NOW)
+
+    @case("day_card/live-frame")
+    def _():
+        points = _today(normal_week())
+        renderer = DayCardRenderer()
+        renderer.render("mercredi 17-01-2024", points, False, True, CARD_WIDTH, NOW)
+        return lambda: renderer.render("mercredi 17-01-2024", points, False, True, CARD_WIDTH, NOW)
+
+    @case("day_card/rebuild-expanded-dense")
+    def _():
+        points = _today(dense_week())
+
+        def run():
+            # A fresh renderer: the cold path taken when punches change
+            return DayCardRenderer().render("mercredi 17-01-2024", points, True, True, CARD_WIDTH, NOW)
+
+        return run
+
+    @case("day_card/layout")
+    def _():
+        # What Textual does with the renderable on every repaint
+        points = _today(normal_week())
+        console = Console(width=CARD_WIDTH, color_system="truecolor", force_terminal=True)
+        panel = DayCardRenderer().render("mercredi 17-01-2024", points, False, True, CARD_WIDTH, NOW)
+        return lambda: console.render_lines(panel, console.options)
+
+    @case("totals/render")
+    def _():
+        return lambda: render_totals("21:35", "22:17", "15:43")
+
+    @case("totals/layout")
+    def _():
+        console = Console(width=CARD_WIDTH, color_system="truecolor", force_terminal=True)
+        return lambda: console.render_lines(render_totals("21:35", "22:17", "15:43"), console.options)
@@ -0,0 +1,70 @@
+"""Synthetic API payloads for the benchmarks (deterministic)."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+# Every benchmark runs "at" this instant: a Wednesday afternoon, so the
+# current week has past days, an open punch today and future days.
+NOW = datetime(2024, 1, 17, 14, 5)
+MONDAY = NOW.date() - timedelta(days=NOW.weekday())
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def punches(rng: random.Random, count: int, start: int = 7 * 60 + 30, end: int = 19 * 60) -> List[str]:
+    """`count` sorted, distinct punch times between `start` and `end`."""
+    return [_hhmm(m) for m in sorted(rng.sample(range(start, end), count))]
+
+
+def normal_day(rng: random.Random) -> List[str]:
+    """Morning and afternoon: 4 punches."""
+    return [
+        _hhmm(rng.randint(7 * 60 + 45, 8 * 60 + 45)),
+        _hhmm(rng.randint(11 * 60 + 45, 12 * 60 + 30)),
+        _hhmm(rng.randint(13 * 60, 14 * 60)),
+        _hhmm(rng.randint(16 * 60 + 30, 18 * 60)),
+    ]
+
+
+def week_payload(monday: date, days: Dict[int, List[str]]) -> Dict:
+    """API-shaped payload from {weekday: punches}."""
+    hours = {(monday + timedelta(days=wd)).strftime("%d-%m-%Y"): p for wd, p in days.items()}
+    return {"hours": hours, "total_effective": "00:00", "total_paid": "00:00"}
+
+
+def normal_week(seed: int = 1) -> Dict:
+    """Monday..Tuesday closed, Wednesday open since the afternoon."""
+    rng = random.Random(seed)
+    today = normal_day(rng)[:3]
+    return week_payload(MONDAY, {0: normal_day(rng), 1: normal_day(rng), 2: today})
+
+
+def dense_week(seed: int = 2, per_day: int = 40) -> Dict:
+    """Dozens of punches a day; today ends on an open punch."""
+    rng = random.Random(seed)
+    return week_payload(
+        MONDAY,
+        {
+            0: punches(rng, per_day),
+            1: punches(rng, per_day),
+            2: punches(rng, per_day - 1, end=NOW.hour * 60 + NOW.minute),
+        },
+    )
+
+
+def multi_week(seed: int = 3, weeks: int = 26) -> Dict:
+    """Half a year of work days in one payload (backfill-sized)."""
+    rng = random.Random(seed)
+    hours: Dict[str, List[str]] = {}
+    for w in range(weeks):
+        monday = MONDAY - timedelta(weeks=w)
+        for wd in range(5):
+            day = monday + timedelta(days=wd)
+            if day <= NOW.date():
+                hours[day.strftime("%d-%m-%Y")] = normal_day(rng)
+    return {"hours": hours}
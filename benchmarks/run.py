@@ -0,0 +1,141 @@
+"""Run the micro-benchmarks and compare them with the stored baseline.
+
+    python -m benchmarks.run                 # compare with baseline.json
+    python -m benchmarks.run --save          # record a new baseline
+    python -m benchmarks.run -k day_card     # only cases containing "day_card"
+
+Each repeat of a case is followed by a fixed pure-Python calibration
+loop, and cases are compared in calibration units (case time / loop time,
+median over repeats), which cancels most of the CPU frequency and load
+changes between runs. Absolute times are shown for reference. A case is
+flagged as a regression when it is still slower than its baseline by more
+than `--tolerance` after a second measurement; the exit status is then 1.
+Baselines are only comparable on the machine and Python version that
+recorded them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, Tuple
+
+from .cases import CASES
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Shared machines easily swing by 30 %; the regressions we care about
+# (losing a cache, rebuilding per frame) are several times slower.
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_REPEAT = 7
+
+
+def _calibration() -> int:
+    total = 0
+    for i in range(2000):
+        total += i * i % 7
+    return total
+
+
+CALIBRATION = timeit.Timer(_calibration)
+
+
+def measure(fn: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> Tuple[float, float]:
+    """Return (best seconds per call, median time in calibration units)."""
+    # autorange() sizes a batch to at least 0.2 s; half keeps runs short
+    timer = timeit.Timer(fn)
+    number = max(1, timer.autorange()[0] // 2)
+    calib_number = max(1, CALIBRATION.autorange()[0] // 2)
+    best = float("inf")
+    units = []
+    for _ in range(repeat):
+        per_call = timer.timeit(number) / number
+        calib = CALIBRATION.timeit(calib_number) / calib_number
+        best = min(best, per_call)
+        units.append(per_call / calib)
+    return best, statistics.median(units)
+
+
+def _environment() -> Dict[str, str]:
+    return {"python": platform.python_version(), "machine": f"{platform.system()} {platform.machine()}"}
+
+
+def _format(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.2f} µs"
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Micro-benchmarks quelio-cli.")
+    parser.add_argument("-k", dest="pattern", default="", help="ne lancer que les cas contenant ce texte")
+    parser.add_argument("--save", action="store_true", help="enregistrer les mesures comme nouvelle référence")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"ralentissement toléré avant de signaler une régression, en fraction ({DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="répétitions par cas")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="fichier de référence")
+    opts = parser.parse_args(argv)
+
+    baseline = load_baseline(opts.baseline)
+    reference = baseline.get("cases", {})
+    env = _environment()
+    if reference and baseline.get("environment") != env:
+        print(f"Attention: référence mesurée sur {baseline.get('environment')}, ici {env}.", file=sys.stderr)
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    for name, setup in CASES.items():
+        if opts.pattern not in name:
+            continue
+        fn = setup()
+        seconds, units = measure(fn, max(1, opts.repeat))
+        base = reference.get(name)
+        if base and not opts.save and units > base["units"] * (1 + opts.tolerance):
+            # Measure once more before blaming the code for a noisy neighbour
+            again = measure(fn, max(1, opts.repeat))
+            seconds, units = min(seconds, again[0]), min(units, again[1])
+        results[name] = {"seconds": seconds, "units": units}
+        line = f"{name:<34} {_format(seconds)}"
+        if base:
+            ratio = units / base["units"]
+            line += f"   réf {_format(base['seconds'])}   x{ratio:5.2f}"
+            if ratio > 1 + opts.tolerance:
+                regressions.append(name)
+                line += "   RÉGRESSION"
+            elif ratio < 1 / (1 + opts.tolerance):
+                line += "   amélioration"
+        print(line)
+        sys.stdout.flush()
+
+    if opts.save:
+        # Keep the reference of cases that were filtered out
+        merged = {**reference, **results} if opts.pattern else results
+        with open(opts.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": env, "cases": merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Référence enregistrée: {opts.baseline}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} régression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
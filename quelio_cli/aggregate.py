@@ -0,0 +1,97 @@
+"""Weekly totals (effective, paid, remaining) computed incrementally."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from .constants import PAUSE_PAID_MINUTES
+from .model import Week
+from .utils_time import current_week_dates, day_paid_bonus, day_total_from_points
+
+# Times (hour, minute) at which today's paid break bonuses kick in
+BONUS_TIMES = ((10, 30), (15, 30))
+
+
+class WeekTotals:
+    """Week figures split into a frozen part and a live part.
+
+    Everything that cannot change until new data arrives (closed days,
+    their bonuses, the number of work days without punches) is summed once
+    in `freeze()`. `at(now)` then only adds today's open interval and
+    today's bonuses, so each tick costs O(1).
+    """
+
+    def __init__(
+        self,
+        week: Week,
+        weekly_minutes: int,
+        work_days: List[int],
+        now: Optional[datetime] = None,
+        reference: Optional[date] = None,
+    ) -> None:
+        self.week = week
+        # Any day of the week to total; None means the current week
+        self.reference = reference
+        self.weekly_minutes = int(weekly_minutes)
+        self.work_days = work_days if work_days else [0, 1, 2, 3, 4]
+        self.freeze(now or datetime.now())
+
+    def freeze(self, now: datetime) -> None:
+        """Precompute everything that only depends on the data and the date."""
+        today = now.date()
+        self.day = today
+        self.other_effective = 0
+        self.other_paid = 0
+        self.today_closed = 0
+        self.today_open_since: Optional[int] = None
+        missing_work_days = 0
+        for key, _wd, dt in current_week_dates(self.reference):
+            points = self.week.minutes(key)
+            if dt.weekday() in self.work_days and dt.date() <= today and len(points) == 0:
+                missing_work_days += 1
+            if dt.date() == today:
+                self.today_closed = day_total_from_points(points)
+                if len(points) % 2 == 1:
+                    self.today_open_since = points[-1]
+            else:
+                eff_day = day_total_from_points(points)
+                self.other_effective += eff_day
+                self.other_paid += eff_day + day_paid_bonus(points, dt.date(), now)
+        minutes_per_work_day = self.weekly_minutes / len(self.work_days)
+        self.missing_minutes = int(missing_work_days * minutes_per_work_day)
+
+    def at(self, now: Optional[datetime] = None) -> Tuple[int, int, int]:
+        """Return (effective, paid, remaining) minutes at `now`."""
+        if now is None:
+            now = datetime.now()
+        if now.date() != self.day:
+            self.freeze(now)
+        eff_today = self.today_closed
+        if self.today_open_since is not None:
+            eff_today += max(0, now.hour * 60 + now.minute - self.today_open_since)
+        bonus = 0
+        # Same rule as `day_paid_bonus`: only days with a closed interval
+        if self.today_closed > 0:
+            for hm in BONUS_TIMES:
+                if (now.hour, now.minute) >= hm:
+                    bonus += PAUSE_PAID_MINUTES
+        effective = self.other_effective + eff_today
+        paid = self.other_paid + eff_today + bonus
+        remaining = max(0, self.weekly_minutes - paid - self.missing_minutes)
+        return effective, paid, remaining
+
+    def next_change(self, now: Optional[datetime] = None) -> datetime:
+        """Return the next minute boundary at which `at()` may change."""
+        if now is None:
+            now = datetime.now()
+        minute = now.replace(second=0, microsecond=0)
+        if self.today_open_since is not None:
+            return minute + timedelta(minutes=1)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        if self.today_closed > 0:
+            for h, m in BONUS_TIMES:
+                at = minute.replace(hour=h, minute=m)
+                if at > now:
+                    return at
+        return midnight
@@ -2,47 +2,411 @@
 
 from __future__ import annotations
 
-from typing import Dict
-
-import requests
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
 
 from .config import normalize_url
-from .constants import DEFAULT_COOKIES
+from .constants import CONNECT_TIMEOUT, DEFAULT_COOKIES, DEFAULT_REQUEST_DEADLINE, READ_TIMEOUT
+from .credentials import invalidate
+from .trace import span
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+# Attempts per request for failures worth retrying (network, timeout, 5xx),
+# spaced by a jittered exponential backoff, all within the fetch deadline
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.25
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Hedging: latencies kept to estimate the p95, and samples needed before
+# a slow request is doubled
+LATENCY_WINDOW = 50
+HEDGE_MIN_SAMPLES = 20
+# A session refused on its first reuse within this many seconds of the
+# login means the server does not honour sessions at all
+SESSION_PROBE_WINDOW = 120.0
 
 
 class ApiError(RuntimeError):
     """Raised when the API call fails or returns an invalid response."""
 
 
+class WeekNotSupported(ApiError):
+    """The server ignored the requested week and answered with another one."""
+
+
+class TransientError(ApiError):
+    """Network failure, timeout or server error: the same call may succeed later."""
+
+
+class DeadlineExceeded(TransientError):
+    """The overall time budget of a fetch ran out."""
+
+
+class LoginRefused(ApiError):
+    """The server rejected the password (or answered the login with something else)."""
+
+
+class _SessionExpired(ApiError):
+    """The server no longer accepts the reused session; log in again."""
+
+
 class BadgeApi:
-    """Simple API wrapper around a single POST endpoint."""
+    """Simple API wrapper around a single POST endpoint.
+
+    A single pooled `requests.Session` is kept for the lifetime of the
+    object so refreshes reuse the same keep-alive connection. When the
+    server hands out a session (a cookie or a `token` field in the JSON
+    body), later calls present it instead of logging in with the password
+    again, until the server rejects it. A refused login raises
+    `LoginRefused` and, when `account` (the keyring key of the password)
+    is given, drops the cached copies of the password so the next command
+    reads it again from the keyring or asks for it.
+
+    Each `fetch()` has an overall `deadline` (seconds) shared by its
+    requests and their retries; connect and read timeouts are capped by
+    what is left of it. With `hedge=True`, a request still unanswered
+    after the p95 of recent latencies is sent a second time and the first
+    answer wins, which cuts the tail for long-running clients (dashboard,
+    daemon) at the cost of at most ~5 % extra requests.
 
-    def __init__(self, api_url: str, username: str, password: str) -> None:
+    Refreshes of the current week are conditional when the server allows
+    it: an `ETag` response header is sent back as `If-None-Match` and a
+    `cursor` field of the JSON body as a `since` form field. The server
+    may then answer `304 Not Modified` (the previous data is returned
+    as is, the very same object, and `not_modified` is set) or a body with
+    `"partial": true` whose `hours` only holds the days that changed
+    (`null` for a removed day), merged into the previous data.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        username: str,
+        password: str,
+        adapter: Optional[HTTPAdapter] = None,
+        deadline: float = DEFAULT_REQUEST_DEADLINE,
+        hedge: bool = False,
+        account: Optional[str] = None,
+    ) -> None:
         self.api_url = normalize_url(api_url)
         self.username = username
         self.password = password
+        self.account = account
+        # Connection pool shared with other clients (team mode); each client
+        # still keeps its own cookies and token.
+        self._adapter = adapter
+        self._session: Optional[requests.Session] = None
+        self._token: Optional[str] = None
+        self._has_server_session = False
+        # Flipped off when the server ignores sessions, so we don't pay an
+        # extra round-trip before every login.
+        self._session_reuse_supported = True
+        self._session_reused = False
+        self._logged_in_at = 0.0
+        self.deadline = float(deadline)
+        self.hedge = hedge
+        self._expires = float("inf")
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        # Delta sync state: last full payload of the current week and its validators
+        self._last: Optional[Dict] = None
+        self._etag: Optional[str] = None
+        self._cursor: Optional[str] = None
+        self._etag_seen: Optional[str] = None
+        self.not_modified = False
+        # Requests sent by the last `fetch()`, retries included
+        self.attempts = 0
+        # Set once an answer proved that the server honours the `date` field
+        self._dates_honoured = False
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with span("api.session"):
+                # Imported lazily: answers served from the cache never pay for it
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                s = requests.Session()
+                adapter = self._adapter or HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.cookies.update(DEFAULT_COOKIES)
+                self._session = s
+        return self._session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None:
+            if self._adapter is None:
+                self._session.close()
+            self._session = None
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        self._forget_session()
+
+    @property
+    def validators(self) -> Tuple[Optional[str], Optional[str]]:
+        """(ETag, cursor) of the last current-week response."""
+        return self._etag, self._cursor
+
+    def prime(self, data: Dict, etag: Optional[str], cursor: Optional[str]) -> None:
+        """Start from a payload fetched earlier (another process, the cache)."""
+        if self._last is None and (etag or cursor):
+            self._last, self._etag, self._cursor = data, etag, cursor
+
+    def fetch(self, week: Optional[date] = None) -> Dict:
+        """POST credentials (or reuse the server session) and return parsed JSON data.
+
+        `week` is any day of the week to fetch (default: the current week).
+        It is sent as a `date` field (JJ-MM-AAAA); servers that ignore it
+        answer with the current week, which is reported as an `ApiError`.
+        Failures that may go away on their own raise `TransientError`.
+        """
+        extra = {"date": (None, week.strftime("%d-%m-%Y"))} if week is not None else {}
+        self._expires = time.monotonic() + self.deadline
+        self.not_modified = False
+        self.attempts = 0
+        if week is not None:
+            data = self._fetch(extra, {})
+            self._check_week(data, week)
+            return data
+        headers = {}
+        if self._last is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._cursor:
+                extra["since"] = (None, self._cursor)
+        return self._sync(self._fetch(extra, headers), conditional=bool(headers or extra))
 
-    def fetch(self) -> Dict:
-        """POST credentials and return parsed JSON data."""
+    def _sync(self, data: Optional[Dict], conditional: bool) -> Dict:
+        """Fold a (possibly empty or partial) answer into the last payload."""
+        if data is None:
+            self.not_modified = True
+            return self._last
+        cursor = data.pop("cursor", None)
+        if data.pop("partial", False) and conditional:
+            merged = {**self._last, **data}
+            hours = dict(self._last.get("hours") or {})
+            for key, points in (data.get("hours") or {}).items():
+                if points is None:
+                    hours.pop(key, None)
+                else:
+                    hours[key] = points
+            merged["hours"] = hours
+            data = merged
+        self._last = data
+        self._etag = self._etag_seen
+        self._cursor = cursor if isinstance(cursor, str) and cursor else None
+        return data
+
+    def _fetch(self, extra: Dict, headers: Dict) -> Optional[Dict]:
+        """Log in or reuse the session; None when the server answered 304."""
+        if self._has_server_session and self._session_reuse_supported:
+            try:
+                data = self._post(
+                    {"username": (None, self.username), **self._token_field(), **extra}, reuse=True, headers=headers
+                )
+                self._session_reused = True
+                if data is not None and isinstance(data.get("token"), str) and data["token"]:
+                    self._token = data["token"]
+                return data
+            except _SessionExpired:
+                if not self._session_reused and time.monotonic() - self._logged_in_at < SESSION_PROBE_WINDOW:
+                    # Rejected right after a fresh login: the server does not
+                    # honour sessions at all. Later, the session may simply
+                    # have outlived its lifetime between two refreshes.
+                    self._session_reuse_supported = False
+                self._forget_session()
         try:
-            resp = requests.post(
-                self.api_url,
-                files={
+            data = self._post(
+                {
                     "username": (None, self.username),
                     "password": (None, self.password),
+                    **extra,
                 },
-                cookies=DEFAULT_COOKIES,
-                timeout=20,
+                reuse=False,
+                headers=headers,
             )
-        except requests.RequestException as e:  # pragma: no cover
-            raise ApiError(f"Erreur réseau: {e}")
+        except LoginRefused:
+            if self.account:
+                # Possibly a changed password: don't keep serving it from the session cache
+                invalidate(self.account)
+            raise
+        self._logged_in_at = time.monotonic()
+        token = data.get("token") if data is not None else None
+        self._token = token if isinstance(token, str) and token else None
+        issued = {c.name for c in self.session.cookies} - set(DEFAULT_COOKIES)
+        self._has_server_session = bool(self._token or issued)
+        return data
+
+    def _check_week(self, data: Dict, week: date) -> None:
+        """Raise unless `data` can be trusted to be the week of `week`.
+
+        A server ignoring `date` answers with the current week: days outside
+        the requested week give it away. An empty answer for a past week
+        proves nothing when the current week is empty too, so it is compared
+        once with an undated fetch.
+        """
+        from .model import parse_week
+
+        monday = week - timedelta(days=week.weekday())
+        sunday = monday + timedelta(days=6)
+        days = list(parse_week(data))
+        for day in days:
+            if not monday <= day.date <= sunday:
+                raise WeekNotSupported("L'API ne permet pas de choisir la semaine (paramètre `date` ignoré)")
+        today = date.today()
+        if self._dates_honoured or monday <= today <= sunday:
+            return
+        if days or len(parse_week(self._fetch({}, {}))):
+            # Days of a past week, or a non-empty current week the server did not send back
+            self._dates_honoured = True
+            return
+        raise ApiError(
+            "Semaine vide, comme la semaine courante: impossible de vérifier que l'API tient compte du paramètre `date`"
+        )
+
+    def _token_field(self) -> Dict:
+        return {"token": (None, self._token)} if self._token else {}
+
+    def _forget_session(self) -> None:
+        self._token = None
+        self._has_server_session = False
+        self._session_reused = False
+        if self._session is not None:
+            self._session.cookies.clear()
+            self._session.cookies.update(DEFAULT_COOKIES)
+
+    def _post(self, files: Dict, reuse: bool, headers: Dict) -> Optional[Dict]:
+        attempt = 1
+        while True:
+            self.attempts += 1
+            try:
+                return self._post_once(files, reuse, headers)
+            except DeadlineExceeded:
+                raise
+            except TransientError:
+                delay = RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                if attempt >= MAX_ATTEMPTS or self._remaining() <= delay:
+                    raise
+                with span("api.retry", attempt=attempt, delay=round(delay, 3)):
+                    time.sleep(delay)
+                attempt += 1
+
+    def _remaining(self) -> float:
+        return self._expires - time.monotonic()
+
+    def _post_once(self, files: Dict, reuse: bool, headers: Dict) -> Optional[Dict]:
+        remaining = self._remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Délai dépassé ({self.deadline:g} s)")
+        timeout = (min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining))
+        session = self.session  # first use imports `requests` (traced there)
+
+        with span("api.post", reuse=reuse) as sp:
+            resp = self._send(lambda s: self._request(s, files, headers, timeout), session, sp)
+            # `elapsed` stops at the response headers: the rest is the body
+            sp.set(status=resp.status_code, bytes=len(resp.content), headers_ms=resp.elapsed.total_seconds() * 1000)
+        if reuse and 400 <= resp.status_code < 500 and resp.status_code not in RETRY_STATUSES:
+            # Whatever the code, a refused password-less form calls for a login
+            raise _SessionExpired(f"HTTP {resp.status_code}")
+        if resp.status_code in (401, 403):
+            raise LoginRefused(f"HTTP {resp.status_code}: {resp.text[:200]}")
+        if resp.status_code == 304 and (headers or "since" in files):
+            return None
+        if resp.status_code in RETRY_STATUSES:
+            raise TransientError(f"HTTP {resp.status_code}: {resp.text[:200]}")
         if resp.status_code != 200:
             raise ApiError(f"HTTP {resp.status_code}: {resp.text[:200]}")
         try:
-            data = resp.json()
+            with span("api.json"):
+                data = resp.json()
         except Exception:
             raise ApiError("Réponse invalide (JSON)")
         if not isinstance(data, dict) or "hours" not in data:
-            raise ApiError("Réponse inattendue de l'API")
+            if reuse:
+                raise _SessionExpired("Session refusée")
+            raise LoginRefused("Réponse inattendue de l'API")
+        self._etag_seen = resp.headers.get("ETag")
         return data
 
+    def _request(self, session: "requests.Session", files: Dict, headers: Dict, timeout) -> "requests.Response":
+        import requests
+
+        t0 = time.monotonic()
+        try:
+            resp = session.post(self.api_url, files=files, headers=headers, timeout=timeout)
+        except requests.Timeout:
+            if self._remaining() <= 0:
+                raise DeadlineExceeded(f"Délai dépassé ({self.deadline:g} s)")
+            raise TransientError("Délai de réponse dépassé")
+        except requests.ConnectionError as e:
+            raise TransientError(f"Erreur réseau: {e}")
+        except requests.RequestException as e:  # pragma: no cover
+            raise ApiError(f"Erreur réseau: {e}")
+        self._latencies.append(time.monotonic() - t0)
+        return resp
+
+    def _hedge_after(self) -> Optional[float]:
+        """p95 of recent latencies, once there are enough of them."""
+        if not self.hedge or len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)]
+
+    def _send(
+        self, call: Callable[["requests.Session"], "requests.Response"], session: "requests.Session", sp
+    ) -> "requests.Response":
+        """Run `call` on `session`, and a second copy of it if the first one is slow."""
+        after = self._hedge_after()
+        if after is None or after >= self._remaining():
+            return call(session)
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                # Losers are abandoned, not cancelled: leave room for them
+                self._hedge_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="quelio-hedge")
+            pool = self._hedge_pool
+        first = pool.submit(call, session)
+        done, _ = wait([first], timeout=after)
+        if done:
+            return first.result()
+        sp.set(hedged=round(after * 1000, 1))
+        # Sessions are not thread-safe: the copy runs on its own one
+        hedge_session = self._hedge_session(session)
+        second = pool.submit(call, hedge_session)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, self._remaining()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"Délai dépassé ({self.deadline:g} s)")
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        # Keep the server session it may have opened
+                        session.cookies.update(hedge_session.cookies)
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    @staticmethod
+    def _hedge_session(session: "requests.Session") -> "requests.Session":
+        """A Session with the pools and cookies of `session`, and its own state."""
+        import requests
+
+        s = requests.Session()
+        for prefix, adapter in session.adapters.items():
+            s.mount(prefix, adapter)
+        s.cookies.update(session.cookies)
+        return s
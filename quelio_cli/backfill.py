@@ -0,0 +1,107 @@
+"""Fetch many past weeks concurrently to rebuild the local history."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .api import ApiError, BadgeApi, TransientError, WeekNotSupported
+from .model import Week, parse_week
+
+DEFAULT_JOBS = 4
+DEFAULT_RETRIES = 3
+# First retry waits about this long (seconds), then doubles
+RETRY_BACKOFF = 1.0
+
+
+def mondays_between(start: date, end: date) -> List[date]:
+    """Mondays of every week overlapping [start, end], oldest first."""
+    monday = start - timedelta(days=start.weekday())
+    out = []
+    while monday <= end:
+        out.append(monday)
+        monday += timedelta(weeks=1)
+    return out
+
+
+def backfill(
+    make_api: Callable[[], BadgeApi],
+    mondays: List[date],
+    jobs: int = DEFAULT_JOBS,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = RETRY_BACKOFF,
+    ordered: bool = False,
+) -> Iterator[Tuple[date, Optional[Week], Optional[ApiError]]]:
+    """Fetch `mondays` with at most `jobs` requests in flight.
+
+    Yields `(monday, week, None)` or `(monday, None, error)` in completion
+    order, so callers can persist each week as soon as it lands and a later
+    run can resume. Each worker thread logs in once with its own client
+    (sessions are not shared across threads). Only `TransientError` is
+    retried, and `retries` bounds the requests sent for a week beyond the
+    first, the client's own retries included. `WeekNotSupported` aborts the
+    whole run instead of failing every week.
+
+    With `ordered=True` a week only starts while it is fewer than `jobs`
+    weeks after the oldest one not yet yielded: a consumer restoring the
+    chronological order (`export.in_order`) then buffers fewer than `jobs`
+    weeks, even while an early week keeps retrying.
+    """
+    local = threading.local()
+
+    def client() -> BadgeApi:
+        api = getattr(local, "api", None)
+        if api is None:
+            api = local.api = make_api()
+        return api
+
+    def fetch_one(monday: date) -> Week:
+        left = retries + 1
+        pause = 0
+        while True:
+            api = client()
+            try:
+                return parse_week(api.fetch(week=monday))
+            except TransientError:
+                left -= max(1, api.attempts)
+                if left <= 0:
+                    raise
+            # Jittered exponential backoff so workers don't retry in lockstep
+            time.sleep(backoff * (2 ** pause) * random.uniform(0.5, 1.5))
+            pause += 1
+
+    jobs = max(1, jobs)
+    next_index = 0
+    # future -> (position in `mondays`, monday)
+    in_flight: Dict[Future, Tuple[int, date]] = {}
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="quelio-backfill") as pool:
+
+        def submit_ready() -> None:
+            nonlocal next_index
+            while next_index < len(mondays) and len(in_flight) < jobs:
+                if ordered and in_flight and next_index >= min(i for i, _m in in_flight.values()) + jobs:
+                    break
+                monday = mondays[next_index]
+                in_flight[pool.submit(fetch_one, monday)] = (next_index, monday)
+                next_index += 1
+
+        # Only `jobs` futures exist at a time: an interrupted run leaves no
+        # queued work behind and memory does not grow with the range.
+        submit_ready()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                _index, monday = in_flight.pop(future)
+                try:
+                    week = future.result()
+                except WeekNotSupported:
+                    raise
+                except ApiError as e:
+                    yield monday, None, e
+                else:
+                    yield monday, week, None
+                submit_ready()
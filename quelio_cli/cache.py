@@ -0,0 +1,305 @@
+"""On-disk response cache shared by every CLI invocation."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from .api import BadgeApi, TransientError
+from .constants import BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN, BREAKER_THRESHOLD, CACHE_DIR, DEFAULT_CACHE_TTL
+from .model import parse_week
+from .store import HistoryStore
+from .trace import span
+
+
+class _FileLock:
+    """Advisory lock on a side file, shared across processes (POSIX only)."""
+
+    def __init__(self, path: str, blocking: bool = True) -> None:
+        self.path = path
+        self.blocking = blocking
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> bool:
+        if fcntl is None:
+            return True
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        flags = fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(self._fd, flags)
+        except BlockingIOError:
+            os.close(self._fd)
+            self._fd = None
+            return False
+        return True
+
+    def __exit__(self, *exc) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class CircuitOpen(TransientError):
+    """The API is considered down and nothing is cached to answer with."""
+
+
+def _write_json(path: str, obj: Dict) -> None:
+    """Atomically replace `path` (write to temp file, then rename)."""
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker, persisted so every invocation shares it.
+
+    After `threshold` failed fetches in a row the circuit opens for
+    `cooldown` seconds: callers answer from the cache without waiting on
+    the network. The first fetch after that is a trial; each new failure
+    reopens the circuit for twice as long (up to `max_cooldown`), and any
+    success closes it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+    ) -> None:
+        self.path = path
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def retry_in(self) -> float:
+        """Seconds before the API may be called again (0 when closed)."""
+        until = self._read().get("open_until")
+        if not isinstance(until, (int, float)):
+            return 0.0
+        return max(0.0, until - time.time())
+
+    def record_success(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def record_failure(self) -> None:
+        failures = int(self._read().get("failures", 0)) + 1
+        state: Dict = {"failures": failures}
+        if failures >= self.threshold:
+            delay = min(self.max_cooldown, self.cooldown * 2 ** (failures - self.threshold))
+            state["open_until"] = time.time() + delay
+        _write_json(self.path, state)
+
+
+class CachedApi:
+    """`BadgeApi` wrapper serving recent responses from `~/.badgecli/cache`.
+
+    Entries younger than `ttl` seconds are returned without touching the
+    network. Older entries are returned immediately while a background
+    thread revalidates them (stale-while-revalidate). Upstream fetches are
+    serialized by a file lock so concurrent invocations share one request.
+    Every upstream response is also merged into `history` when given,
+    except "not modified" answers. The entry keeps the response validators
+    so that the next process can make a conditional request from it.
+
+    Network failures feed a `CircuitBreaker`: while it is open, the cached
+    entry is returned at once whatever its age (`offline` is then set) and
+    `CircuitOpen` is raised when there is none.
+    """
+
+    def __init__(
+        self,
+        api: BadgeApi,
+        ttl: float = DEFAULT_CACHE_TTL,
+        cache_dir: str = CACHE_DIR,
+        on_revalidated: Callable[[Dict], None] | None = None,
+        history: HistoryStore | None = None,
+    ) -> None:
+        self.api = api
+        self.history = history
+        self.ttl = max(0.0, float(ttl))
+        self.cache_dir = cache_dir
+        self.on_revalidated = on_revalidated
+        key = f"{api.username}@{api.api_url}"
+        self.account = key
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"{digest}.json")
+        self.lock_path = self.path + ".lock"
+        self.breaker = CircuitBreaker(self.path + ".breaker")
+        # True when the last answer is a cached copy served because the API is down
+        self.offline = False
+        self._revalidation: threading.Thread | None = None
+
+    def fetch(self, force: bool = False, stale_ok: bool = True) -> Dict:
+        """Return API data, from cache when possible.
+
+        `force=True` bypasses the cache but still reuses a response that
+        another process fetched while this one was waiting for the lock.
+        `stale_ok=False` only accepts a fresh entry and otherwise fetches
+        synchronously (used by background polling). With `ttl` 0 the cache
+        never answers: every call fetches synchronously, and the entry is
+        only used for conditional requests and while the API is down.
+        """
+        with span("cache.fetch", force=force) as sp:
+            self.offline = False
+            entry = None
+            if not force and self.ttl > 0:
+                entry = self._read()
+                if entry is not None:
+                    if self._age(entry) < self.ttl:
+                        sp.set(result="fresh")
+                        return entry["data"]
+                    if stale_ok:
+                        sp.set(result="stale")
+                        if not self.breaker.retry_in():
+                            self._revalidate_in_background()
+                        return entry["data"]
+            data = self._serve_offline(entry)
+            if data is not None:
+                sp.set(result="offline")
+                return data
+            sp.set(result="miss")
+            return self._fetch_locked(not_before=time.time() if force else None)
+
+    def _serve_offline(self, entry: Optional[Dict]) -> Optional[Dict]:
+        """While the circuit is open: the cached data, or `CircuitOpen`."""
+        retry_in = self.breaker.retry_in()
+        if not retry_in:
+            return None
+        entry = entry or self._read()
+        if entry is None:
+            raise CircuitOpen(f"API indisponible, nouvel essai dans {retry_in:.0f} s")
+        self.offline = True
+        return entry["data"]
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until a pending background revalidation has finished."""
+        thread = self._revalidation
+        if thread is not None:
+            thread.join(timeout)
+
+    def _fetch_locked(self, not_before: float | None, blocking: bool = True) -> Optional[Dict]:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with _FileLock(self.lock_path, blocking=blocking) as acquired:
+            if not acquired:
+                # Someone else is already revalidating this entry.
+                return None
+            # Another process may have refreshed the entry while we waited.
+            entry = self._read()
+            if entry is not None:
+                if not_before is not None and entry["fetched_at"] >= not_before:
+                    return entry["data"]
+                if not_before is None and self._age(entry) < self.ttl:
+                    return entry["data"]
+                # Lets a new process ask "what changed since this entry?"
+                prime = getattr(self.api, "prime", None)
+                if prime is not None:
+                    prime(entry["data"], entry.get("etag"), entry.get("cursor"))
+            # The previous holder of the lock may just have opened the circuit
+            data = self._serve_offline(entry)
+            if data is not None:
+                return data
+            try:
+                data = self.api.fetch()
+            except TransientError:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            etag, cursor = getattr(self.api, "validators", (None, None))
+            with span("cache.write"):
+                self._write(data, etag, cursor)
+            if getattr(self.api, "not_modified", False):
+                return data
+            with span("history.merge"):
+                self._record_history(data)
+            return data
+
+    def _revalidate_in_background(self) -> None:
+        if self._revalidation is not None and self._revalidation.is_alive():
+            return
+
+        def worker() -> None:
+            try:
+                data = self._fetch_locked(not_before=None, blocking=False)
+            except Exception:
+                # Keep serving the stale copy; the next call will retry.
+                return
+            if data is not None and self.on_revalidated is not None:
+                self.on_revalidated(data)
+
+        self._revalidation = threading.Thread(target=worker, name="quelio-revalidate", daemon=True)
+        self._revalidation.start()
+
+    def _record_history(self, data: Dict) -> None:
+        """Merge freshly fetched days into the local history, if enabled."""
+        if self.history is None:
+            return
+        try:
+            # The payload is the whole current week: days it no longer has are dropped
+            self.history.merge(self.account, parse_week(data), week=date.today())
+        except Exception:
+            # History is a convenience; it must never break a fetch.
+            pass
+
+    @staticmethod
+    def _age(entry: Dict) -> float:
+        return time.time() - entry["fetched_at"]
+
+    def _read(self) -> Optional[Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("data"), dict):
+            return None
+        if not isinstance(entry.get("fetched_at"), (int, float)):
+            return None
+        return entry
+
+    def _write(self, data: Dict, etag: Optional[str] = None, cursor: Optional[str] = None) -> None:
+        entry = {"fetched_at": time.time(), "data": data}
+        if etag:
+            entry["etag"] = etag
+        if cursor:
+            entry["cursor"] = cursor
+        _write_json(self.path, entry)
+
+
+def clear_cache(cache_dir: str = CACHE_DIR) -> None:
+    """Remove every cached response (used on logout)."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
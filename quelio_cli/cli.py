@@ -6,9 +6,26 @@ import sys
 from typing import List
 
 
+def _enable_tracing(argv: List[str]) -> List[str]:
+    """Strip leading `--trace[=FICHIER]` options and turn tracing on."""
+    from .trace import TRACER
+
+    TRACER.enable_from_env()
+    while len(argv) > 1 and argv[1].startswith("--trace"):
+        opt = argv.pop(1)
+        TRACER.enable(opt.partition("=")[2] or None)
+    return argv
+
+
 def main(argv: List[str] | None = None) -> None:
-    if argv is None:
-        argv = sys.argv
+    argv = _enable_tracing(list(sys.argv if argv is None else argv))
+    from .trace import span
+
+    with span("command", command=argv[1].lower() if len(argv) > 1 else "dashboard"):
+        _dispatch(argv)
+
+
+def _dispatch(argv: List[str]) -> None:
     if len(argv) <= 1:
         from .commands import dashboard
         dashboard.run()
@@ -22,15 +39,38 @@ def main(argv: List[str] | None = None) -> None:
         logout.run()
     elif cmd == "status":
         from .commands import status
-        status.run()
+        status.run(argv[2:])
+    elif cmd == "backfill":
+        from .commands import backfill
+        backfill.run(argv[2:])
+    elif cmd == "export":
+        from .commands import export
+        export.run(argv[2:])
+    elif cmd == "stats":
+        from .commands import stats
+        stats.run(argv[2:])
+    elif cmd == "team":
+        from .commands import team
+        team.run(argv[2:])
+    elif cmd == "daemon":
+        from .commands import daemon
+        daemon.run(argv[2:])
     elif cmd in ("dashboard", "ui", "tui"):
         from .commands import dashboard
-        dashboard.run()
+        dashboard.run(argv[2:])
     else:
         print(
             "Commandes disponibles :\n"
             "  setup       – configurer et tester la connexion\n"
             "  logout      – supprimer les identifiants\n"
             "  status      – résumé non-interactif\n"
-            "  dashboard   – interface interactive (par défaut)\n"
+            "  backfill    – récupérer des semaines passées (--from JJ-MM-AAAA)\n"
+            "  export      – exporter les pointages en CSV, JSON lines ou Parquet (--from JJ-MM-AAAA)\n"
+            "  stats       – statistiques sur l'historique local (NumPy requis)\n"
+            "  team        – équipe : add|remove|list, grille interactive sans argument\n"
+            "  daemon      – récupérateur résident partagé (start|stop|status)\n"
+            "  dashboard   – interface interactive (par défaut ; --lite : rendu ANSI léger)\n"
+            "\n"
+            "Options : quelio --trace[=FICHIER] <commande> enregistre la durée de chaque\n"
+            "étape (JSON lines) ; QUELIO_PROFILE=1 ajoute un profil cProfile.\n"
         )
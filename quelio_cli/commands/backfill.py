@@ -0,0 +1,98 @@
+"""`backfill` command: fetch past weeks into the local history."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date, timedelta
+from typing import List
+
+from ..api import ApiError, BadgeApi, WeekNotSupported
+from ..backfill import DEFAULT_JOBS, DEFAULT_RETRIES, backfill, mondays_between
+from ..config import Config
+from ..credentials import resolve_password
+from ..model import parse_date_key
+from ..store import HistoryStore
+from ..utils_time import day_total_from_points, minutes_to_hhmm
+
+
+def _parse_args(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="quelio backfill", description="Récupère des semaines passées dans l'historique local."
+    )
+    parser.add_argument("--from", dest="start", required=True, metavar="JJ-MM-AAAA", help="premier jour")
+    parser.add_argument("--to", dest="end", metavar="JJ-MM-AAAA", help="dernier jour (aujourd'hui par défaut)")
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, help=f"requêtes simultanées au maximum ({DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=DEFAULT_RETRIES, help=f"nouvelles tentatives par semaine ({DEFAULT_RETRIES})"
+    )
+    parser.add_argument("--force", action="store_true", help="récupérer aussi les semaines déjà présentes")
+    return parser.parse_args(args)
+
+
+def run(args: List[str] | None = None) -> None:
+    opts = _parse_args(args or [])
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup")
+        sys.exit(1)
+
+    today = date.today()
+    try:
+        start = parse_date_key(opts.start)
+        end = min(parse_date_key(opts.end), today) if opts.end else today
+    except ApiError as e:
+        print(e)
+        sys.exit(1)
+    if start > end:
+        print("Période vide: --from doit précéder --to.")
+        sys.exit(1)
+
+    store = HistoryStore()
+    mondays = mondays_between(start, end)
+    if not opts.force:
+        # Resume: closed weeks already fetched in full are final. The current
+        # week keeps changing and is always refetched.
+        done = store.fetched_weeks(conf.account, mondays[0], mondays[-1])
+        current = today - timedelta(days=today.weekday())
+        skipped = len(mondays)
+        mondays = [m for m in mondays if m not in done or m >= current]
+        skipped -= len(mondays)
+        if skipped:
+            print(f"{skipped} semaine(s) déjà dans l'historique (--force pour les récupérer à nouveau).")
+    if not mondays:
+        print("Rien à récupérer.")
+        return
+
+    pwd = resolve_password(conf.account, conf.session_cache_ttl)
+    total = len(mondays)
+    failed = 0
+    print(f"Récupération de {total} semaine(s), {max(1, opts.jobs)} à la fois…")
+    results = backfill(
+        lambda: BadgeApi(conf.api_url, conf.username, pwd, deadline=conf.request_deadline, account=conf.account),
+        mondays,
+        jobs=opts.jobs,
+        retries=max(0, opts.retries),
+    )
+    try:
+        for i, (monday, week, error) in enumerate(results, 1):
+            if error is not None:
+                failed += 1
+                print(f"[{i}/{total}] semaine du {monday:%d/%m/%Y} : échec ({error})")
+                continue
+            # Persist each week as it lands so an interrupted run resumes here
+            store.merge(conf.account, week, week=monday)
+            store.mark_week(conf.account, monday)
+            minutes = sum(day_total_from_points(d.minutes) for d in week)
+            print(f"[{i}/{total}] semaine du {monday:%d/%m/%Y} : {len(week)} jour(s), {minutes_to_hhmm(minutes)}")
+    except WeekNotSupported as e:
+        print(f"Erreur: {e}")
+        sys.exit(2)
+    except KeyboardInterrupt:
+        print("\nInterrompu. Relancez la même commande pour reprendre.")
+        sys.exit(130)
+    if failed:
+        print(f"{failed} semaine(s) en échec. Relancez la même commande pour réessayer.")
+        sys.exit(2)
@@ -0,0 +1,61 @@
+"""`daemon` command: resident fetcher answering other commands over a socket."""
+
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime
+from typing import List
+
+from ..api import ApiError
+from ..config import Config
+from ..constants import CONFIG_DIR, DAEMON_SOCKET
+from ..daemon import Daemon, DaemonClient, DaemonUnavailable
+from ..credentials import resolve_password
+
+
+def run(args: List[str] | None = None) -> None:
+    action = (args[0].lower() if args else "start")
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup")
+        sys.exit(1)
+
+    if action == "start":
+        pwd = resolve_password(conf.account, conf.session_cache_ttl)
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        daemon = Daemon(conf, pwd)
+        print(f"Démon démarré (pid {os.getpid()}), socket: {DAEMON_SOCKET}. Ctrl+C pour arrêter.")
+        try:
+            daemon.serve_forever()
+        except ApiError as e:
+            print(f"Erreur: {e}")
+            sys.exit(2)
+        except KeyboardInterrupt:
+            pass
+        print("Démon arrêté.")
+    elif action == "stop":
+        client = DaemonClient(conf.username, conf.api_url)
+        try:
+            client.request("shutdown")
+        except DaemonUnavailable:
+            print("Aucun démon actif.")
+            sys.exit(1)
+        print("Démon arrêté.")
+    elif action == "status":
+        client = DaemonClient(conf.username, conf.api_url)
+        try:
+            pid = client.request("ping").get("pid")
+            resp = client.request("week")
+        except DaemonUnavailable as e:
+            print(f"Démon inactif ou sans données: {e}")
+            sys.exit(1)
+        fetched = datetime.fromtimestamp(resp.get("fetched_at") or 0).strftime("%H:%M:%S")
+        print(f"Démon actif (pid {pid}), dernières données récupérées à {fetched}.")
+    else:
+        print(
+            "Usage : quelio daemon [start|stop|status]\n"
+            "  start   – lancer le démon au premier plan (par défaut)\n"
+            "  stop    – arrêter le démon\n"
+            "  status  – état du démon\n"
+        )
@@ -2,153 +2,135 @@
 
 from __future__ import annotations
 
-import math
+import argparse
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, List
 
 # Rich/Textual are imported lazily inside `run()` to allow using
 # non-TUI commands without these optional dependencies installed.
 
+from ..aggregate import WeekTotals
 from ..api import BadgeApi
+from ..cache import CachedApi, clear_cache
 from ..config import Config
-from ..constants import CONFIG_PATH, KEYRING_SERVICE, PAUSE_PAID_MINUTES
+from ..constants import CONFIG_PATH
+from ..credentials import forget_password, resolve_password
+from ..daemon import DaemonClient
+from ..model import EMPTY_WEEK, Week, parse_week
+from ..polling import PollScheduler
+from ..store import HistoryStore
+from ..trace import TRACER, span, timed
 from ..utils_time import (
     current_week_dates,
     day_total_from_points,
-    day_total_from_points_dynamic,
-    hhmm_to_minutes,
     minutes_to_hhmm,
 )
 
 
-def _resolve_password(username: str, api_url: str) -> str:
-    """Resolve password from keychain, env vars, or prompt interactively."""
-    import getpass
-    import sys
-    import keyring
+def _parse_args(args: List[str]) -> argparse.Namespace:
+    from ..lite import DEFAULT_FPS
 
-    key = f"{username}@{api_url}"
-    pwd = None
-    try:
-        pwd = keyring.get_password(KEYRING_SERVICE, key)
-    except Exception:
-        pwd = None
-    if not pwd:
-        import os
+    parser = argparse.ArgumentParser(prog="quelio dashboard", description="Tableau de bord interactif.")
+    parser.add_argument(
+        "--lite", action="store_true", help="rendu ANSI léger, sans Textual (liaisons SSH lentes, démarrage rapide)"
+    )
+    parser.add_argument(
+        "--colors",
+        choices=("256", "truecolor"),
+        default="256",
+        help="avec --lite : 256 couleurs sans animation (défaut) ou 24 bits avec animation",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=DEFAULT_FPS, help=f"avec --lite : images par seconde au plus ({DEFAULT_FPS})"
+    )
+    return parser.parse_args(args)
 
-        pwd = os.environ.get("BADGECLI_PASSWORD") or os.environ.get("BADGECLI_PWD")
-    if not pwd:
-        print("Mot de passe introuvable (keychain/env). Saisissez-le (non stocké):", file=sys.stderr)
-        pwd = getpass.getpass("Mot de passe: ")
-    return pwd
 
+def run(args: List[str] | None = None) -> None:
+    opts = _parse_args(args or [])
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup")
+        raise SystemExit(1)
+
+    def _on_revalidated(data: Dict) -> None:
+        # Called from the cache's revalidation thread once fresher data landed
+        try:
+            app.call_from_thread(app.apply_data, parse_week(data))
+        except Exception:
+            pass
+
+    history = HistoryStore()
+
+    # Prefer a running daemon; otherwise fetch directly through the cache
+    api = DaemonClient.connect(conf)
+    if api is None:
+        pwd = resolve_password(conf.account, conf.session_cache_ttl)
+        api = CachedApi(
+            BadgeApi(
+                conf.api_url,
+                conf.username,
+                pwd,
+                deadline=conf.request_deadline,
+                hedge=conf.hedge_requests,
+                account=conf.account,
+            ),
+            ttl=conf.cache_ttl,
+            on_revalidated=_on_revalidated,
+            history=history,
+        )
+
+    if opts.lite:
+        from ..lite import LiteDashboard
+
+        app = LiteDashboard(conf, api, history, colors=opts.colors, fps=opts.fps)
+        app.run()
+        return
 
-def run() -> None:
     # Lazy imports to avoid requiring Rich/Textual for non-TUI commands
-    from rich.panel import Panel
     from rich.text import Text
     from textual.app import App, ComposeResult
     from textual.containers import Center, VerticalScroll
     from textual.reactive import reactive
     from textual.widgets import Static
+    from textual.worker import Worker, WorkerState
 
-    conf = Config.load()
-    if not conf:
-        print("Pas encore configuré. Lancez: quelio setup")
-        raise SystemExit(1)
-
-    pwd = _resolve_password(conf.username, conf.api_url)
-    api = BadgeApi(conf.api_url, conf.username, pwd)
+    from ..render import DayCardRenderer, render_totals
 
     class State:
-        hours: Dict[str, List[str]] = {}
+        week: Week = EMPTY_WEEK
         total_effective: str = "--:--"
         total_paid: str = "--:--"
 
-    def _day_paid_bonus(points: list[str], dt: datetime, now: datetime) -> int:
-        """Return additional paid minutes for the given day.
-        Business rule: +7 min at 10:30 and +7 min at 15:30 if the day has work.
-        For past days, both bonuses are applied. For today, apply each bonus
-        only once its time has passed. For future days, none.
-        """
-        # If no work that day, no bonus
-        eff_static = day_total_from_points(points)
-        if eff_static <= 0:
-            return 0
-        bonus = 0
-        # Compare day with now to decide if break times have occurred
-        if dt.date() < now.date():
-            # Past day: both bonuses apply
-            return PAUSE_PAID_MINUTES * 2
-        if dt.date() > now.date():
-            return 0
-        # Today: check current time against 10:30 and 15:30
-        if (now.hour, now.minute) >= (10, 30):
-            bonus += PAUSE_PAID_MINUTES
-        if (now.hour, now.minute) >= (15, 30):
-            bonus += PAUSE_PAID_MINUTES
-        return bonus
-
     class Totals(Static):
         total_effective = reactive("--:--")
         total_paid = reactive("--:--")
-        weekly_minutes: int = 38 * 60
-        hours_data: Dict[str, List[str]] = {}
-        work_days: list[int] = [0, 1, 2, 3, 4]  # Default: Mon-Fri
+        remaining = reactive("--:--")
+        title = reactive("Ma semaine")
 
         def render(self):
-            # Remaining time = weekly target - paid - (missing work days * daily hours)
-            def to_min(txt: str) -> int | None:
-                try:
-                    h, m = txt.split(":")
-                    return int(h) * 60 + int(m)
-                except Exception:
-                    return None
-
-            paid_m = to_min(self.total_paid)
-            remaining = None
-            if paid_m is not None:
-                # Count configured work days without time entries (only past/current days)
-                missing_work_days = 0
-                now = datetime.now()
-                for key, wd, dt in current_week_dates():
-                    # Only check configured work days
-                    weekday = dt.weekday()
-                    if weekday not in self.work_days:
-                        continue
-                    # Only check past and current days, not future
-                    if dt.date() > now.date():
-                        continue
-                    # Check if no time entries for this work day
-                    points = self.hours_data.get(key, [])
-                    if len(points) == 0:
-                        missing_work_days += 1
-
-                # Calculate minutes per work day (weekly_minutes / number of work days)
-                num_work_days = len(self.work_days) if self.work_days else 5
-                minutes_per_work_day = self.weekly_minutes / num_work_days
-                missing_minutes = int(missing_work_days * minutes_per_work_day)
-
-                remaining = int(self.weekly_minutes) - paid_m - missing_minutes
-                if remaining < 0:
-                    remaining = 0
-
-            remain_str = minutes_to_hhmm(remaining) if isinstance(remaining, int) else "--:--"
-
-            body = (
-                f"[b]Total effectif[/b]: [green]{self.total_effective}[/green]\n"
-                f"[b]Total payé[/b]: [cyan]{self.total_paid}[/cyan]\n"
-                f"[b]Temps restant[/b]: [red]{remain_str}[/red]"
-            )
-            return Panel(
-                body,
-                title="Ma semaine",
-                border_style="#1F2937",
-                padding=(0, 1),
-                style="on #1F2937",
-                expand=True,
-            )
+            return render_totals(self.total_effective, self.total_paid, self.remaining, self.title)
+
+        def render_lines(self, crop):
+            with timed("render.totals"):
+                return super().render_lines(crop)
+
+    class TraceOverlay(Static):
+        """Render/tick duration histograms, toggled with `t`."""
+
+        def render(self):
+            txt = Text()
+            txt.append("mesure              n    moy    p95    max (ms)\n", style="bold")
+            for name in sorted(TRACER.histograms):
+                h = TRACER.histograms[name]
+                txt.append(
+                    f"{name:<16} {h.count:>5} {h.mean:6.2f} {h.percentile(0.95):6.2f} {h.max:6.1f}\n",
+                    style="#E5E7EB",
+                )
+            if not TRACER.histograms:
+                txt.append("(en attente de mesures…)", style="#9CA3AF")
+            return txt
 
     class BreakLine(Static):
         def __init__(self, total_spaces: int) -> None:
@@ -159,6 +141,8 @@ def run() -> None:
             return Text("\n" * self.total_spaces)
 
     class CustomFooter(Static):
+        busy = reactive(False)
+
         def render(self):
             # Minimalistic help bar with app palette
             help_txt = Text()
@@ -166,15 +150,19 @@ def run() -> None:
             help_txt.append(" Quitter  ", style="#9CA3AF")
             help_txt.append(" r ", style="bold #111827 on #9CA3AF")
             help_txt.append(" Rafraîchir  ", style="#9CA3AF")
+            help_txt.append(" p/n ", style="bold #111827 on #9CA3AF")
+            help_txt.append(" Semaines  ", style="#9CA3AF")
             help_txt.append(" d ", style="bold #111827 on #9CA3AF")
             help_txt.append(" Déconnexion  ", style="#9CA3AF")
+            if self.busy:
+                help_txt.append(" ⟳ Actualisation…", style="#7C3AED")
             return help_txt
 
     class DayItem(Static):
         can_focus = True
         expanded = reactive(False)
 
-        def __init__(self, title: str, points: list[str], total_str: str, date_key: str, is_today: bool) -> None:
+        def __init__(self, title: str, points: tuple[int, ...], total_str: str, date_key: str, is_today: bool) -> None:
             super().__init__()
             self.title = title
             self.points = points
@@ -182,149 +170,46 @@ def run() -> None:
             self.date_key = date_key
             self.is_today = is_today
             self.empty = len(points) == 0
+            self._renderer = DayCardRenderer()
             try:
                 if self.empty:
                     self.can_focus = False
             except Exception:
                 pass
 
-        def _timeline(self) -> Text:
-            # Render a time bar from 08:00 to 18:00 with half-column precision
-            start_day = 8 * 60
-            end_day = 18 * 60
-            width = 40
-
-            def t_to_x2(hhmm: str) -> int:
-                # position in half-columns [0, width*2]
-                m = hhmm_to_minutes(hhmm)
-                ratio = (m - start_day) / (end_day - start_day)
-                x2 = int(ratio * (width * 2))
-                return max(0, min(width * 2, x2))
-
-            halves = [False] * (width * 2)
-            for i in range(0, len(self.points) - 1, 2):
-                s2 = t_to_x2(self.points[i])
-                e2 = t_to_x2(self.points[i + 1])
-                if e2 <= s2:
-                    e2 = min(s2 + 1, width * 2)
-                for h in range(s2, min(e2, width * 2)):
-                    halves[h] = True
-            # If last punch is open, extend to 'now' and store live segment indices
-            live_range = None  # type: tuple[int, int] | None
-            if len(self.points) % 2 == 1:
-                now = datetime.now()
-                now_hhmm = f"{now.hour:02d}:{now.minute:02d}"
-                s2 = t_to_x2(self.points[-1])
-                e2 = t_to_x2(now_hhmm)
-                if e2 <= s2:
-                    e2 = min(s2 + 1, width * 2)
-                for h in range(s2, min(e2, width * 2)):
-                    halves[h] = True
-                live_range = (s2, min(e2, width * 2))
-
-            text = Text()
-            text.append(" ")  # left margin
-            base_bg = (0x1F, 0x29, 0x37)
-            base_purple = (0x7C, 0x3A, 0xED)
-            for col in range(width):
-                left = halves[col * 2]
-                right = halves[col * 2 + 1]
-                if left or right:
-                    in_live = self.is_today and live_range is not None and (
-                        (col * 2 >= live_range[0] and col * 2 < live_range[1]) or
-                        (col * 2 + 1 >= live_range[0] and col * 2 + 1 < live_range[1])
-                    )
-                    if in_live:
-                        tnow = datetime.now().timestamp()
-                        period = 3.5
-                        ph = (math.sin(tnow * math.tau / period) + 1) / 2
-                        min_alpha = 0.35
-                        alpha = min_alpha + (1.0 - min_alpha) * ph
-                        r = int(base_bg[0] * (1 - alpha) + base_purple[0] * alpha)
-                        g = int(base_bg[1] * (1 - alpha) + base_purple[1] * alpha)
-                        b = int(base_bg[2] * (1 - alpha) + base_purple[2] * alpha)
-                        style = f"#{r:02X}{g:02X}{b:02X}"
-                    else:
-                        style = "#7C3AED"
-                    if left and right:
-                        ch = "█"
-                    elif left and not right:
-                        ch = "▌"
-                    elif right and not left:
-                        ch = "▐"
-                    else:
-                        ch = " "
-                else:
-                    ch = "─"
-                    style = "#4B5563"
-                text.append(ch, style=style)
-            return text
+        @property
+        def time_dependent(self) -> bool:
+            """True while the card shows an open punch running until now.
+
+            Only today: a past day with a forgotten exit does not move.
+            """
+            return self.is_today and len(self.points) % 2 == 1
+
+        def update_day(self, points: tuple[int, ...], total_str: str, is_today: bool) -> None:
+            """Apply fresh data to this card, repainting only if it changed."""
+            if points == self.points and is_today == self.is_today:
+                return
+            geometry_changed = (len(points) == 0) != self.empty or (self.expanded and points != self.points)
+            self.points = points
+            self.total_str = total_str
+            self.is_today = is_today
+            self.empty = len(points) == 0
+            self.can_focus = not self.empty
+            self.set_class(self.empty, "empty-day")
+            if self.empty and self.expanded:
+                self.expanded = False
+            self.refresh(layout=geometry_changed)
 
         def render(self):
-            # Header line (chevron, day name, date, total)
-            chev = ("▾" if self.expanded else "▸") if not self.empty else ""
-            space = self.title.find(" ")
-            if space != -1:
-                day_name = self.title[:space]
-                date_str = self.title[space + 1 :]
-            else:
-                day_name = self.title
-                date_str = ""
-            head = Text()
-            if chev:
-                head.append(f"{chev} ", style="#E5E7EB")
-            else:
-                head.append("  ")
-            head.append(day_name, style="bold #E5E7EB")
-            if date_str:
-                head.append(f" {date_str}", style="#9CA3AF")
-            head.append("  ")
-            # Show dynamic total (accounts for an open interval)
-            dyn_minutes = day_total_from_points_dynamic(self.points)
-            head.append(minutes_to_hhmm(dyn_minutes), style="#9CA3AF")
-
-            if not self.empty:
-                head.append("\n")
-
-            # Compose main body content
-            body = Text.assemble(head)
-            if not self.empty:
-                timeline = self._timeline()
-                ticks = Text("08  09  10  11  12  13  14  15  16  17  18", style="dim")
-                body.append("\n")
-                body.append(timeline)
-                body.append("\n")
-                body.append(ticks)
-
-            # Expanded details
-            if self.expanded and self.points:
-                tbl = Text()
-                tbl.append("\n\n")
-                tbl.append(" Entrées/Sorties:\n\n", style="#9CA3AF")
-                for i in range(0, len(self.points), 2):
-                    if i + 1 < len(self.points):
-                        a, b = self.points[i], self.points[i + 1]
-                        tbl.append(f"  - {a}  →  {b}\n")
-                    else:
-                        a = self.points[i]
-                        now = datetime.now()
-                        now_str = f"{now.hour:02d}:{now.minute:02d}"
-                        tbl.append(f"  - {a}  →  {now_str} (en cours)\n", style="#7C3AED")
-
-                # dynamic day total if open interval
-                mins = day_total_from_points_dynamic(self.points)
-                tbl.append(f"\n Total: {minutes_to_hhmm(mins)}", style="#9CA3AF")
-                body.append(tbl)
-
-            # Wrap in a Panel to restore background for day sections
-            return Panel(
-                body,
-                border_style="#1F2937",
-                padding=(0, 1),
-                style="on #1F2937",
-                expand=True,
+            return self._renderer.render(
+                self.title, self.points, self.expanded, self.is_today, self.size.width
             )
 
+        def render_lines(self, crop):
+            # Includes Rich layout of the renderable when the card is dirty
+            with timed("render.day"):
+                return super().render_lines(crop)
+
         def on_click(self, event) -> None:
             if self.empty:
                 return
@@ -350,6 +235,7 @@ def run() -> None:
         #daylist { padding: 1 2; align-horizontal: center; max-width: 51; width: 100%; background: transparent; scrollbar-size-vertical: 1; scrollbar-size-horizontal: 1; }
         .day-card { padding: 0; border: none; background: transparent; margin: 0 0 1 0; }
         .empty-day { opacity: 0.5; }
+        #trace { dock: right; width: 50; height: auto; padding: 0 1; background: #1F2937; display: none; }
         #footer { dock: bottom; padding: 1 2; color: #9CA3AF; }
         """
 
@@ -357,6 +243,9 @@ def run() -> None:
             ("q", "quit", "Quitter"),
             ("r", "refresh", "Rafraîchir"),
             ("d", "logout", "Déconnexion"),
+            ("p", "previous_week", "Semaine précédente"),
+            ("n", "next_week", "Semaine suivante"),
+            ("t", "toggle_trace", "Mesures"),
             ("ctrl+q", "quit"),
             ("ctrl+c", "quit"),
             ("ctrl+r", "refresh"),
@@ -368,63 +257,210 @@ def run() -> None:
             self.totals = Totals(id="totals")
             # Configure weekly target from saved config
             try:
-                self.totals.weekly_minutes = int(getattr(conf, "weekly_hours", 38)) * 60
+                self.weekly_minutes = int(getattr(conf, "weekly_hours", 38)) * 60
             except Exception:
-                self.totals.weekly_minutes = 38 * 60
+                self.weekly_minutes = 38 * 60
             # Configure work days from saved config
             try:
-                self.totals.work_days = getattr(conf, "work_days", [0, 1, 2, 3, 4])
+                self.work_days = getattr(conf, "work_days", [0, 1, 2, 3, 4])
             except Exception:
-                self.totals.work_days = [0, 1, 2, 3, 4]
+                self.work_days = [0, 1, 2, 3, 4]
+            self._week_totals: WeekTotals | None = None
+            self._next_totals_change: datetime | None = None
             self.list = VerticalScroll(id="daylist")
+            self.footer = CustomFooter(id="footer")
+            self.trace_overlay = TraceOverlay(id="trace")
+            self._trace_timer = None
+            # Clock: 10 Hz pulse only while a punch is open and the terminal
+            # has focus; otherwise one wake-up per visible change
+            self._pulse_timer = None
+            self._clock_timer = None
+            self._suspended = False
+            self._refresh_worker: Worker | None = None
+            # (payload, Week) of the last parse, reused for "not modified" answers
+            self._parsed: tuple = (None, EMPTY_WEEK)
+            self._poll_timer = None
+            # date_key -> mounted DayItem, in display order
+            self._items: Dict[str, DayItem] = {}
+            self._last_fingerprint = None
+            # 0 = current week (live), -1 = last week (read from history)...
+            self.week_offset = 0
+            self.poller = PollScheduler(conf.poll_interval, conf.work_days) if conf.poll_interval > 0 else None
 
         def compose(self) -> ComposeResult:
             yield Center(self.totals)
             yield Center(self.list)
-            yield CustomFooter(id="footer")
+            yield self.footer
+            yield self.trace_overlay
 
         def on_mount(self) -> None:
-            self.refresh_data()
+            self.refresh_data(force=False)
             try:
-                self.set_interval(1.0, self._tick_update)
-                self.set_interval(0.10, self._tick_visual)
+                self.app_suspend_signal.subscribe(self, self._on_suspend)
+                self.app_resume_signal.subscribe(self, self._on_resume)
             except Exception:
                 pass
+            self._schedule_ticks()
+
+        def watch_app_focus(self, focused: bool) -> None:
+            # Terminals without focus reporting always count as focused
+            self._schedule_ticks()
+
+        def _on_suspend(self, _app) -> None:
+            self._suspended = True
+            self._schedule_ticks()
+
+        def _on_resume(self, _app) -> None:
+            self._suspended = False
+            self._last_fingerprint = None  # the day may have changed meanwhile
+            self._show_offset()
 
         def action_refresh(self) -> None:
             self.refresh_data()
 
+        def action_previous_week(self) -> None:
+            self.week_offset -= 1
+            self._show_offset()
+
+        def action_next_week(self) -> None:
+            if self.week_offset < 0:
+                self.week_offset += 1
+                self._show_offset()
+
+        def _show_offset(self) -> None:
+            if self.week_offset == 0:
+                self._show(State.week)
+                return
+            reference = date.today() + timedelta(weeks=self.week_offset)
+            self._show(history.week(conf.account, reference), reference)
+
+        def action_toggle_trace(self) -> None:
+            # Histograms are cheap: collect them from now on even without --trace
+            TRACER.histograms_enabled = True
+            shown = not self.trace_overlay.display
+            self.trace_overlay.display = shown
+            if shown:
+                self._trace_timer = self.set_interval(0.5, self.trace_overlay.refresh)
+            elif self._trace_timer is not None:
+                self._trace_timer.stop()
+                self._trace_timer = None
+
         def action_quit(self) -> None:
             self.exit()
 
         def action_logout(self) -> None:
             # Delete credentials + config and exit
-            try:
-                keyring.delete_password(KEYRING_SERVICE, f"{conf.username}@{conf.api_url}")
-            except Exception:
-                pass
+            forget_password(conf.account)
             try:
                 os.remove(CONFIG_PATH)
             except Exception:
                 pass
+            clear_cache()
             self.exit(message="Déconnecté. Relancez `setup`.\n")
 
-        def refresh_data(self) -> None:
-            try:
-                data = api.fetch()
-            except Exception as e:
+        def refresh_data(self, force: bool = True, stale_ok: bool = True, name: str = "refresh") -> None:
+            # Fetch in a thread worker so the UI keeps handling keys and
+            # animating; `exclusive` cancels any refresh still in flight.
+            self.footer.busy = True
+            def fetch() -> Week:
+                with span("dashboard.fetch", worker=name, force=force):
+                    data = api.fetch(force=force, stale_ok=stale_ok)
+                # A "not modified" answer is the very payload parsed last time
+                if data is self._parsed[0]:
+                    return self._parsed[1]
+                with span("dashboard.parse"):
+                    week = parse_week(data)
+                self._parsed = (data, week)
+                return week
+
+            self._refresh_worker = self.run_worker(
+                fetch,
+                name=name,
+                group="refresh",
+                exclusive=True,
+                thread=True,
+                exit_on_error=False,
+            )
+
+        def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+            # Runs on the UI thread; results of superseded workers are dropped
+            if event.worker is not self._refresh_worker:
+                return
+            if event.state == WorkerState.SUCCESS:
+                self.footer.busy = False
+                if getattr(api, "offline", False) and event.worker.name != "poll":
+                    self.notify("API indisponible: données en cache.", severity="warning")
+                self.apply_data(event.worker.result)
+                if self.poller is not None:
+                    self.poller.record_success()
+                self._schedule_poll()
+            elif event.state == WorkerState.ERROR:
+                self.footer.busy = False
+                if self.poller is not None:
+                    self.poller.record_error()
+                self._schedule_poll()
+                # A failed background poll keeps showing the last good data
+                if event.worker.name == "poll" and len(State.week):
+                    return
                 self.bell()
-                self.totals.update(f"Erreur de chargement: {e}")
+                self.totals.update(f"Erreur de chargement: {event.worker.error}")
+
+        def _schedule_poll(self) -> None:
+            if self.poller is None:
                 return
+            if self._poll_timer is not None:
+                self._poll_timer.stop()
+            delay = self.poller.next_delay(State.week)
+            self._poll_timer = self.set_timer(delay, self._poll)
+
+        def _poll(self) -> None:
+            # Accept a response another dashboard fetched within the cache TTL,
+            # so N open dashboards still cost one upstream call per TTL.
+            self._poll_timer = None
+            self.refresh_data(force=False, stale_ok=False, name="poll")
+
+        def apply_data(self, week: Week) -> None:
+            State.week = week
+            State.total_effective = week.total_effective or "--:--"
+            State.total_paid = week.total_paid or "--:--"
+            # Browsing a past week: keep it on screen, data is kept for later
+            if self.week_offset == 0:
+                self._show(week)
+
+        def _show(self, week: Week, reference: date | None = None) -> None:
+            """Display `week`: the current one, or the one containing `reference`."""
+            # Identical payload on the same day: nothing to recompute or repaint
+            fingerprint = (week.digest, datetime.now().date(), reference)
+            if fingerprint == self._last_fingerprint:
+                return
+            self._last_fingerprint = fingerprint
+            with span("dashboard.apply", past=reference is not None) as sp:
+                sp.set(rebuilt=self._apply(week, reference))
+            self._schedule_ticks()
 
-            State.hours = data.get("hours", {})
-            State.total_effective = data.get("total_effective", "--:--")
-            State.total_paid = data.get("total_paid", "--:--")
+        def _apply(self, week: Week, reference: date | None) -> bool:
+            """Update totals and cards; return True if the list was rebuilt."""
 
-            # Instant dynamic calculation after first load
+            # Freeze closed days once; ticks only add today's live part
+            self._week_totals = WeekTotals(week, self.weekly_minutes, self.work_days, reference=reference)
+            self._next_totals_change = None
             self._update_totals_dynamic()
-
-            # Rebuild list
+            if reference is None:
+                self.totals.title = "Ma semaine"
+            else:
+                monday = reference - timedelta(days=reference.weekday())
+                self.totals.title = f"Semaine du {monday:%d/%m/%Y}"
+
+            dates = current_week_dates(reference)
+            if [key for key, _wd, _dt in dates] == list(self._items):
+                # Same week: update existing cards in place, keyed by date
+                for key, _wd, dt in dates:
+                    points = week.minutes(key)
+                    is_today = dt.date() == datetime.now().date()
+                    self._items[key].update_day(points, minutes_to_hhmm(day_total_from_points(points)), is_today)
+                return False
+
+            # First load or new week: rebuild list
             try:
                 self.list.remove_children()
             except Exception:
@@ -436,9 +472,10 @@ def run() -> None:
                             pass
                 except Exception:
                     pass
+            self._items = {}
             widgets: list[DayItem] = []
-            for key, wd, dt in current_week_dates():
-                points = [p.strip() for p in State.hours.get(key, [])]
+            for key, wd, dt in dates:
+                points = week.minutes(key)
                 minutes_ = day_total_from_points(points)
                 title = f"{wd.capitalize()} {dt.strftime('%d/%m/%Y')}"
                 total_str = minutes_to_hhmm(minutes_)
@@ -448,70 +485,73 @@ def run() -> None:
                 if len(points) == 0:
                     w.add_class("empty-day")
                 widgets.append(w)
+                self._items[key] = w
             if widgets:
                 self.list.mount(*widgets)
                 self.list.mount(BreakLine(total_spaces=5))
-
-        def _week_minutes_pair(self) -> tuple[int, int]:
-            """Return (effective_minutes, paid_minutes) for the current week.
-            Effective uses dynamic minutes for today and static for past days.
-            Paid = effective + break bonuses (7' at 10:30, 7' at 15:30 when applicable).
-            """
-            eff_total = 0
-            paid_total = 0
-            now = datetime.now()
-            for key, _wd, dt in current_week_dates():
-                points = [p.strip() for p in State.hours.get(key, [])]
-                if dt.date() == now.date():
-                    eff_day = day_total_from_points_dynamic(points, now.hour * 60 + now.minute)
-                else:
-                    eff_day = day_total_from_points(points)
-                bonus = _day_paid_bonus(points, dt, now)
-                eff_total += eff_day
-                paid_total += eff_day + bonus
-            return eff_total, paid_total
+            return True
 
         def _update_totals_dynamic(self) -> None:
-            # Always compute current effective/paid with bonuses to match API
-            eff_min, paid_min = self._week_minutes_pair()
+            # Always compute current effective/paid with bonuses to match API.
+            # Figures only move at minute boundaries published by WeekTotals;
+            # the reactive attributes repaint Totals when the text changes.
+            if self._week_totals is None:
+                return
+            now = datetime.now()
+            if self._next_totals_change is not None and now < self._next_totals_change:
+                return
+            eff_min, paid_min, remaining = self._week_totals.at(now)
             self.totals.total_effective = minutes_to_hhmm(eff_min)
             self.totals.total_paid = minutes_to_hhmm(paid_min)
-            # Update hours data for missing days calculation
-            self.totals.hours_data = State.hours
-            # If anything is open or today progresses, refresh visuals
-            try:
-                for child in list(self.list.children):
-                    try:
-                        if hasattr(child, "refresh"):
-                            child.refresh()
-                    except Exception:
-                        pass
-                self.list.refresh(layout=True)
-            except Exception:
-                pass
+            self.totals.remaining = minutes_to_hhmm(remaining)
+            self._next_totals_change = self._week_totals.next_change(now)
+
+        def _live_items(self) -> list:
+            return [item for item in self._items.values() if item.time_dependent]
+
+        def _schedule_ticks(self) -> None:
+            """Arm the clock for the current state; nothing runs while suspended."""
+            if self._clock_timer is not None:
+                self._clock_timer.stop()
+                self._clock_timer = None
+            live = bool(self._live_items())
+            # `app_focus` only exists in recent Textual versions
+            pulse = live and getattr(self, "app_focus", True) and not self._suspended
+            if pulse and self._pulse_timer is None:
+                self._pulse_timer = self.set_interval(0.10, self._tick_visual)
+            elif not pulse and self._pulse_timer is not None:
+                self._pulse_timer.stop()
+                self._pulse_timer = None
+            if self._suspended:
+                return
+            # Sleep until the totals or the date change (a minute while a
+            # punch is open, else the next paid bonus or midnight)
+            now = datetime.now()
+            wake = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            if self._week_totals is not None:
+                wake = min(wake, self._week_totals.next_change(now))
+            if live:
+                wake = min(wake, now.replace(second=0, microsecond=0) + timedelta(minutes=1))
+            self._clock_timer = self.set_timer(max(0.05, (wake - now).total_seconds()), self._tick_update)
 
         def _tick_update(self) -> None:
-            self._update_totals_dynamic()
-            try:
-                for child in list(self.list.children):
-                    try:
-                        if hasattr(child, "refresh"):
-                            child.refresh()
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            self._clock_timer = None
+            with timed("tick.update"):
+                # Past midnight "today" moved: reconcile cards against the same data
+                if self._last_fingerprint is not None and self._last_fingerprint[1] != datetime.now().date():
+                    self._show_offset()
+                self._update_totals_dynamic()
+                if self._pulse_timer is None:
+                    # Unfocused: open timelines still grow once a minute
+                    for item in self._live_items():
+                        item.refresh()
+            self._schedule_ticks()
 
         def _tick_visual(self) -> None:
-            try:
-                for child in list(self.list.children):
-                    try:
-                        if hasattr(child, "refresh"):
-                            child.refresh()
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            with timed("tick.visual"):
+                # Only today's open punch changes between two data refreshes
+                for item in self._live_items():
+                    item.refresh()
 
     app = QuelioCLI()
     app.run()
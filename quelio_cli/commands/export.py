@@ -0,0 +1,121 @@
+"""`export` command: stream fetched punches as CSV, JSON Lines or Parquet."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import date, datetime
+from typing import Iterator, List, Tuple
+
+from ..api import ApiError, BadgeApi, WeekNotSupported
+from ..backfill import DEFAULT_JOBS, DEFAULT_RETRIES, backfill, mondays_between
+from ..config import Config
+from ..credentials import resolve_password
+from ..export import FORMATS, WRITERS, Row, check_format, day_rows, format_for, in_order
+from ..model import parse_date_key
+
+
+def _parse_args(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="quelio export",
+        description="Exporte les pointages de l'API, un jour par ligne, avec les minutes effectives et payées.",
+    )
+    parser.add_argument("--from", dest="start", required=True, metavar="JJ-MM-AAAA", help="premier jour")
+    parser.add_argument("--to", dest="end", metavar="JJ-MM-AAAA", help="dernier jour (aujourd'hui par défaut)")
+    parser.add_argument(
+        "--format", choices=FORMATS, help="format de sortie (défaut: d'après l'extension de --output, sinon csv)"
+    )
+    parser.add_argument("-o", "--output", default="-", metavar="FICHIER", help="fichier de sortie (défaut: sortie standard)")
+    parser.add_argument("--team", action="store_true", help="chaque profil d'équipe au lieu de votre compte")
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, help=f"requêtes simultanées au maximum ({DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=DEFAULT_RETRIES, help=f"nouvelles tentatives par semaine ({DEFAULT_RETRIES})"
+    )
+    return parser.parse_args(args)
+
+
+def run(args: List[str] | None = None) -> None:
+    opts = _parse_args(args or [])
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup", file=sys.stderr)
+        sys.exit(1)
+
+    today = date.today()
+    try:
+        start = parse_date_key(opts.start)
+        end = min(parse_date_key(opts.end), today) if opts.end else today
+    except ApiError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    if start > end:
+        print("Période vide: --from doit précéder --to.", file=sys.stderr)
+        sys.exit(1)
+
+    fmt = format_for(opts.output, opts.format)
+    if fmt == "parquet" and opts.output == "-":
+        print("L'export Parquet s'écrit dans un fichier: précisez --output.", file=sys.stderr)
+        sys.exit(1)
+    try:
+        check_format(fmt)  # before asking for passwords and fetching anything
+    except ApiError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    # (name shown in the rows, username, API URL, keyring account, password)
+    accounts: List[Tuple[str, str, str, str, str]]
+    if opts.team:
+        if not conf.team:
+            print("Aucun profil d'équipe. Ajoutez-en avec: quelio team add NOM IDENTIFIANT", file=sys.stderr)
+            sys.exit(1)
+        from .team import profile_passwords
+
+        passwords = profile_passwords(conf.team, conf.session_cache_ttl)
+        accounts = [(p.name, p.username, p.api_url, p.account, passwords[p.account]) for p in conf.team]
+    else:
+        pwd = resolve_password(conf.account, conf.session_cache_ttl)
+        accounts = [(conf.username, conf.username, conf.api_url, conf.account, pwd)]
+
+    mondays = mondays_between(start, end)
+    now = datetime.now()
+    failed = 0
+
+    def batches() -> Iterator[List[Row]]:
+        nonlocal failed
+        for name, username, api_url, account, pwd in accounts:
+            results = backfill(
+                lambda: BadgeApi(api_url, username, pwd, deadline=conf.request_deadline, account=account),
+                mondays,
+                jobs=opts.jobs,
+                retries=max(0, opts.retries),
+                ordered=True,
+            )
+            for monday, week, error in in_order(results, mondays):
+                if error is not None:
+                    failed += 1
+                    print(f"{name}: semaine du {monday:%d/%m/%Y} : échec ({error})", file=sys.stderr)
+                    continue
+                yield day_rows(name, week, start, end, now)
+
+    try:
+        count = WRITERS[fmt](batches(), opts.output)
+    except WeekNotSupported as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        sys.exit(2)
+    except BrokenPipeError:
+        # The reader went away (`| head`): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except OSError as e:
+        print(f"Écriture impossible: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nInterrompu.", file=sys.stderr)
+        sys.exit(130)
+    print(f"{count} jour(s) exporté(s), {len(mondays)} semaine(s) × {len(accounts)} compte(s).", file=sys.stderr)
+    if failed:
+        print(f"{failed} semaine(s) en échec, absentes de l'export.", file=sys.stderr)
+        sys.exit(2)
@@ -1,26 +1,29 @@
-"""`logout` command: delete stored credentials and config."""
+"""`logout` command: delete stored credentials, config and punch history."""
 
 from __future__ import annotations
 
 import os
 
 
+from ..cache import clear_cache
 from ..config import Config
-from ..constants import CONFIG_PATH, KEYRING_SERVICE
+from ..constants import CONFIG_PATH
+from ..credentials import forget_password
+from ..store import HistoryStore
 
 
 def run() -> None:
     conf = Config.load()
     if conf:
-        try:
-            import keyring
-            keyring.delete_password(KEYRING_SERVICE, f"{conf.username}@{conf.api_url}")
-        except Exception:
-            pass
+        forget_password(conf.account)
         try:
             os.remove(CONFIG_PATH)
         except FileNotFoundError:
             pass
-        print("Déconnecté et configuration supprimée.")
+        clear_cache()
+        history = HistoryStore()
+        for account in {conf.account, *(p.account for p in conf.team)}:
+            history.forget(account)
+        print("Déconnecté, configuration et historique supprimés.")
     else:
         print("Aucune configuration trouvée.")
@@ -9,7 +9,14 @@ import sys
 
 from ..api import BadgeApi
 from ..config import Config, normalize_url
-from ..constants import CONFIG_PATH, KEYRING_SERVICE, DEFAULT_API_URL
+from ..constants import (
+    CONFIG_PATH,
+    DEFAULT_API_URL,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REQUEST_DEADLINE,
+)
+from ..credentials import store_password
 
 
 def _parse_work_days(user_input: str) -> list[int]:
@@ -85,11 +92,21 @@ def run() -> None:
     print("✅")
 
     # Save config and password in keychain if available
-    conf = Config(api_url=normalize_url(api_url), username=username, weekly_hours=weekly_hours, work_days=work_days)
+    conf = Config(
+        api_url=normalize_url(api_url),
+        username=username,
+        weekly_hours=weekly_hours,
+        work_days=work_days,
+        cache_ttl=existing.cache_ttl if existing else DEFAULT_CACHE_TTL,
+        poll_interval=existing.poll_interval if existing else DEFAULT_POLL_INTERVAL,
+        team=existing.team if existing else [],
+        request_deadline=existing.request_deadline if existing else DEFAULT_REQUEST_DEADLINE,
+        hedge_requests=existing.hedge_requests if existing else False,
+        session_cache_ttl=existing.session_cache_ttl if existing else 0,
+    )
     conf.save()
     try:
-        import keyring
-        keyring.set_password(KEYRING_SERVICE, f"{username}@{api_url}", password)
+        store_password(conf.account, password)
         print("Identifiants enregistrés (mot de passe dans le trousseau macOS).")
     except Exception as e:
         print("Avertissement: impossible d'enregistrer le mot de passe dans le trousseau.")
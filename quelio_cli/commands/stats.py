@@ -0,0 +1,72 @@
+"""`stats` command: analytics over the local punch history."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from typing import List
+
+from ..api import ApiError
+from ..config import Config
+from ..model import parse_date_key
+from ..store import HistoryStore
+
+
+def _parse_args(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="quelio stats", description="Statistiques sur l'historique local (voir `quelio backfill`)."
+    )
+    parser.add_argument("--from", dest="start", metavar="JJ-MM-AAAA", help="premier jour (défaut: il y a --weeks semaines)")
+    parser.add_argument("--to", dest="end", metavar="JJ-MM-AAAA", help="dernier jour (défaut: hier)")
+    parser.add_argument("--weeks", type=int, default=52, help="période par défaut, en semaines (52)")
+    parser.add_argument("--team", action="store_true", help="chaque profil d'équipe, puis l'équipe entière")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="format de sortie")
+    return parser.parse_args(args)
+
+
+def run(args: List[str] | None = None) -> None:
+    opts = _parse_args(args or [])
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup")
+        sys.exit(1)
+
+    # Today is still in progress: it would drag every average down
+    yesterday = date.today() - timedelta(days=1)
+    try:
+        end = min(parse_date_key(opts.end), yesterday) if opts.end else yesterday
+        start = parse_date_key(opts.start) if opts.start else end - timedelta(weeks=max(1, opts.weeks)) + timedelta(days=1)
+    except ApiError as e:
+        print(e)
+        sys.exit(1)
+
+    if opts.team:
+        if not conf.team:
+            print("Aucun profil d'équipe. Ajoutez-en avec: quelio team add NOM IDENTIFIANT")
+            sys.exit(1)
+        accounts = [(p.name, p.account) for p in conf.team]
+    else:
+        accounts = [(conf.username, conf.account)]
+
+    try:
+        from ..stats import PunchColumns, compute, format_text
+
+        store = HistoryStore()
+        daily_target = int(conf.weekly_hours) * 60 / len(conf.work_days or [0, 1, 2, 3, 4])
+        columns = [PunchColumns(store.raw_days(account, start, end)) for _name, account in accounts]
+        reports = [(name, compute(cols, daily_target, conf.work_days)) for (name, _), cols in zip(accounts, columns)]
+        if opts.team:
+            reports.append(("Équipe", compute(PunchColumns.concat(columns), daily_target, conf.work_days, streak=False)))
+    except ApiError as e:
+        print(e)
+        sys.exit(2)
+
+    if opts.format == "json":
+        print(json.dumps([{"name": name, **result} for name, result in reports], ensure_ascii=False, indent=2))
+        return
+    for name, result in reports:
+        print()
+        print("\n".join(format_text(name, result)))
+    print()
@@ -1,57 +1,244 @@
-"""`status` command: non-interactive weekly recap in plain text."""
+"""`status` command: non-interactive weekly recap in plain text or JSON lines."""
 
 from __future__ import annotations
 
-import getpass
-import os
+import argparse
+import json
 import sys
+import time
+from datetime import date, datetime, timedelta
 from typing import Dict, List
 
-from ..api import BadgeApi
+from ..api import ApiError, BadgeApi
+from ..cache import CachedApi
 from ..config import Config
-from ..constants import KEYRING_SERVICE
-from ..utils_time import format_week_summary, minutes_to_hhmm
+from ..credentials import resolve_password
+from ..daemon import DaemonClient
+from ..model import Week, parse_date_key, parse_week
+from ..store import HistoryStore
+from ..trace import span
+from ..utils_time import day_total_from_points, format_week_summary, minutes_to_hhmm
 
 
-def _resolve_password(username: str, api_url: str) -> str:
-    """Resolve password from keychain, env vars, or prompt interactively."""
-    import keyring
-    key = f"{username}@{api_url}"
-    pwd = None
+def _print_snapshot(week: Week, title: str = "Ma semaine") -> None:
+    total_eff = week.total_effective or "?"
+    total_paid = week.total_paid or "?"
+
+    print(f"\n{title}")
+    print(f"  Total effectif : {total_eff}")
+    print(f"  Total payé     : {total_paid}")
+    print()
+    for d, wd, minutes_ in format_week_summary(week):
+        print(f"- {wd} {d} : {minutes_to_hhmm(minutes_)}")
+    print()
+
+
+def _records(week: Week) -> Dict[str, Dict]:
+    """Comparable records for each output line, keyed by `totals` or date."""
+    records: Dict[str, Dict] = {
+        "totals": {
+            "type": "totals",
+            "total_effective": week.total_effective,
+            "total_paid": week.total_paid,
+        }
+    }
+    for d, wd, minutes_ in format_week_summary(week):
+        records[d] = {
+            "type": "day",
+            "date": d,
+            "weekday": wd,
+            "minutes": minutes_,
+            "total": minutes_to_hhmm(minutes_),
+            "punches": [minutes_to_hhmm(m) for m in week.minutes(d)],
+        }
+    return records
+
+
+def _emit(record: Dict, fmt: str) -> None:
+    stamp = datetime.now()
+    if fmt == "jsonl":
+        print(json.dumps({"time": stamp.isoformat(timespec="seconds"), **record}, ensure_ascii=False))
+    elif record["type"] == "totals":
+        print(
+            f"[{stamp:%H:%M:%S}] Total effectif : {record['total_effective'] or '?'}"
+            f"  Total payé : {record['total_paid'] or '?'}"
+        )
+    elif record["type"] == "day":
+        print(f"[{stamp:%H:%M:%S}] - {record['weekday']} {record['date']} : {record['total']}")
+    elif record["type"] == "removed":
+        print(f"[{stamp:%H:%M:%S}] - {record['date']} : retiré")
+    else:
+        print(f"[{stamp:%H:%M:%S}] Erreur de chargement: {record['message']}", file=sys.stderr)
+    sys.stdout.flush()
+
+
+def _watch(api, interval: float, fmt: str) -> None:
+    """Refetch every `interval` seconds and print only what changed."""
+    previous: Dict[str, Dict] = {}
+    first = True
+    while True:
+        try:
+            week = parse_week(api.fetch(stale_ok=False))
+        except Exception as e:
+            _emit({"type": "error", "message": str(e)}, fmt)
+        else:
+            if first and fmt == "text":
+                _print_snapshot(week)
+                sys.stdout.flush()
+                previous = _records(week)
+            else:
+                current = _records(week)
+                for key, record in current.items():
+                    if previous.get(key) != record:
+                        _emit(record, fmt)
+                for key in previous.keys() - current.keys():
+                    _emit({"type": "removed", "date": key}, fmt)
+                previous = current
+            first = False
+        time.sleep(interval)
+
+
+def _parse_args(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="quelio status", description="Résumé non-interactif de la semaine.")
+    parser.add_argument("--watch", action="store_true", help="rester actif et n'afficher que les changements")
+    parser.add_argument(
+        "--interval", type=float, default=60.0, help="secondes entre deux rafraîchissements en mode --watch (60)"
+    )
+    parser.add_argument("--format", choices=("text", "jsonl"), default="text", help="format de sortie")
+    parser.add_argument("--team", action="store_true", help="une ligne par profil d'équipe (quelio team add)")
+    past = parser.add_mutually_exclusive_group()
+    past.add_argument("--week", metavar="JJ-MM-AAAA", help="afficher la semaine contenant ce jour (historique local)")
+    past.add_argument("--weeks-ago", type=int, metavar="N", help="afficher la semaine d'il y a N semaines (historique local)")
+    past.add_argument("--history", type=int, metavar="N", help="totaux des N dernières semaines (historique local)")
+    return parser.parse_args(args)
+
+
+def _show_history(conf: Config, opts: argparse.Namespace) -> None:
+    """Answer from the local history only: no daemon, keyring or HTTP."""
+    store = HistoryStore()
+    today = date.today()
+    if opts.history is not None:
+        days = store.last_weeks(conf.account, max(1, opts.history), today)
+        by_monday: Dict[date, int] = {}
+        for d in days:
+            monday = d.date - timedelta(days=d.date.weekday())
+            by_monday[monday] = by_monday.get(monday, 0) + day_total_from_points(d.minutes)
+        for monday in sorted(by_monday, reverse=True):
+            if opts.format == "jsonl":
+                _emit({"type": "week", "monday": monday.isoformat(), "minutes": by_monday[monday]}, "jsonl")
+            else:
+                print(f"- semaine du {monday:%d/%m/%Y} : {minutes_to_hhmm(by_monday[monday])}")
+        return
+    if opts.week is not None:
+        try:
+            ref = parse_date_key(opts.week)
+        except ApiError as e:
+            print(e)
+            sys.exit(1)
+    else:
+        ref = today - timedelta(weeks=max(0, opts.weeks_ago))
+    week = store.week(conf.account, ref)
+    if opts.format == "jsonl":
+        for record in _records(week).values():
+            _emit(record, "jsonl")
+    else:
+        monday = ref - timedelta(days=ref.weekday())
+        _print_snapshot(week, f"Semaine du {monday:%d/%m/%Y} (historique local)")
+
+
+def _show_team(conf: Config, fmt: str) -> None:
+    """One line per teammate, printed as soon as its response arrives."""
+    from ..team import TeamFetcher, summarize
+    from .team import member_line, profile_passwords
+
+    if not conf.team:
+        print("Aucun profil d'équipe. Ajoutez-en avec: quelio team add NOM IDENTIFIANT")
+        sys.exit(1)
+    fetcher = TeamFetcher(conf.team, profile_passwords(conf.team, conf.session_cache_ttl), ttl=conf.cache_ttl, history=HistoryStore())
+    width = max(len(p.name) for p in conf.team)
+    failed = 0
+    if fmt == "text":
+        print(f"\nÉquipe ({len(conf.team)})")
     try:
-        pwd = keyring.get_password(KEYRING_SERVICE, key)
-    except Exception:
-        pwd = None
-    if not pwd:
-        pwd = os.environ.get("BADGECLI_PASSWORD") or os.environ.get("BADGECLI_PWD")
-    if not pwd:
-        print("Mot de passe introuvable (keychain/env). Saisissez-le (non stocké):", file=sys.stderr)
-        pwd = getpass.getpass("Mot de passe: ")
-    return pwd
-
-
-def run() -> None:
+        for profile, week, error in fetcher.fetch_all():
+            if error is not None:
+                failed += 1
+                if fmt == "jsonl":
+                    _emit({"type": "error", "name": profile.name, "message": str(error)}, fmt)
+                else:
+                    print(f"  {profile.name:<{width}} ✗ {error}")
+            elif fmt == "jsonl":
+                s = summarize(week, int(conf.weekly_hours) * 60, conf.work_days)
+                _emit(
+                    {
+                        "type": "member",
+                        "name": profile.name,
+                        "present": s["present"],
+                        "since": minutes_to_hhmm(s["since"]) if s["since"] is not None else None,
+                        "today": minutes_to_hhmm(s["today"]),
+                        "week": minutes_to_hhmm(s["week"]),
+                    },
+                    fmt,
+                )
+            else:
+                print(f"  {member_line(profile.name, week, conf, width)}")
+            sys.stdout.flush()
+    finally:
+        fetcher.close()
+    if failed:
+        sys.exit(2)
+
+
+def run(args: List[str] | None = None) -> None:
+    opts = _parse_args(args or [])
     conf = Config.load()
     if not conf:
         print("Pas encore configuré. Lancez: quelio setup")
         sys.exit(1)
 
-    pwd = _resolve_password(conf.username, conf.api_url)
+    if opts.week is not None or opts.weeks_ago is not None or opts.history is not None:
+        _show_history(conf, opts)
+        return
+
+    if opts.team:
+        _show_team(conf, opts.format)
+        return
+
+    # A running daemon answers from memory, without keyring or HTTP
+    with span("daemon.connect") as sp:
+        api = DaemonClient.connect(conf)
+        sp.set(found=api is not None)
+    if api is None:
+        pwd = resolve_password(conf.account, conf.session_cache_ttl)
+        api = CachedApi(
+            BadgeApi(conf.api_url, conf.username, pwd, deadline=conf.request_deadline, account=conf.account),
+            ttl=conf.cache_ttl,
+            history=HistoryStore(),
+        )
+
+    if opts.watch:
+        try:
+            _watch(api, max(1.0, opts.interval), opts.format)
+        except KeyboardInterrupt:
+            pass
+        return
 
-    api = BadgeApi(conf.api_url, conf.username, pwd)
     try:
-        data = api.fetch()
+        with span("status.fetch"):
+            data = api.fetch()
+        with span("status.parse"):
+            week = parse_week(data)
     except Exception as e:
         print(f"Erreur de chargement: {e}")
         sys.exit(2)
-    hours: Dict[str, List[str]] = data.get("hours", {})
-    total_eff = data.get("total_effective") or "?"
-    total_paid = data.get("total_paid") or "?"
-
-    print("\nMa semaine")
-    print(f"  Total effectif : {total_eff}")
-    print(f"  Total payé     : {total_paid}")
-    print()
-    for d, wd, minutes_ in format_week_summary(hours):
-        print(f"- {wd} {d} : {minutes_to_hhmm(minutes_)}")
-    print()
+    if getattr(api, "offline", False):
+        print("API indisponible: données en cache.", file=sys.stderr)
+    with span("status.output"):
+        if opts.format == "jsonl":
+            for record in _records(week).values():
+                _emit(record, "jsonl")
+        else:
+            _print_snapshot(week)
+        sys.stdout.flush()
+    # Let a stale-while-revalidate refresh land in the cache before exiting
+    api.wait()
@@ -0,0 +1,191 @@
+"""`team` command: manage teammate profiles and show the team grid (TUI)."""
+
+from __future__ import annotations
+
+import getpass
+import sys
+from typing import Dict, List
+
+from ..config import Config, Profile, normalize_url
+from ..constants import DEFAULT_POLL_INTERVAL
+from ..credentials import forget_password, resolve_password, store_password
+from ..model import Week
+from ..store import HistoryStore
+from ..team import TeamFetcher, summarize
+from ..utils_time import minutes_to_hhmm
+
+
+def profile_passwords(profiles: List[Profile], cache_ttl: float = 0) -> Dict[str, str]:
+    """Passwords keyed by account, from the keychain or asked once each."""
+    return {
+        p.account: resolve_password(p.account, cache_ttl, prompt=f"Mot de passe de {p.username}: ", env=False)
+        for p in profiles
+    }
+
+
+def member_line(name: str, week: Week, conf: Config, width: int = 12) -> str:
+    s = summarize(week, int(conf.weekly_hours) * 60, conf.work_days)
+    if s["present"]:
+        state = f"● en poste depuis {minutes_to_hhmm(s['since'])}"
+    else:
+        state = "○ hors poste"
+    return (
+        f"{name:<{width}} {state:<26} jour {minutes_to_hhmm(s['today'])}"
+        f"   semaine {minutes_to_hhmm(s['week'])}"
+    )
+
+
+def _add(conf: Config, args: List[str]) -> None:
+    if len(args) < 2:
+        print("Usage: quelio team add NOM IDENTIFIANT [URL_API]")
+        sys.exit(1)
+    name, username = args[0], args[1]
+    api_url = normalize_url(args[2]) if len(args) > 2 else conf.api_url
+    if any(p.name == name for p in conf.team):
+        print(f"Le profil « {name} » existe déjà.")
+        sys.exit(1)
+    profile = Profile(name=name, username=username, api_url=api_url)
+    password = getpass.getpass(f"Mot de passe de {username}: ")
+    try:
+        store_password(profile.account, password)
+    except Exception as e:
+        print("Avertissement: impossible d'enregistrer le mot de passe dans le trousseau.")
+        print(f"Détail: {e}")
+    conf.team.append(profile)
+    conf.save()
+    print(f"Profil « {name} » ajouté.")
+
+
+def _remove(conf: Config, args: List[str]) -> None:
+    if not args:
+        print("Usage: quelio team remove NOM")
+        sys.exit(1)
+    profile = next((p for p in conf.team if p.name == args[0]), None)
+    if profile is None:
+        print(f"Aucun profil « {args[0]} ».")
+        sys.exit(1)
+    conf.team.remove(profile)
+    conf.save()
+    # The keychain entry and the history may still serve the main account
+    # or another profile
+    if profile.account not in {conf.account, *(p.account for p in conf.team)}:
+        forget_password(profile.account)
+        HistoryStore().forget(profile.account)
+    print(f"Profil « {profile.name} » supprimé.")
+
+
+def run(args: List[str] | None = None) -> None:
+    args = args or []
+    conf = Config.load()
+    if not conf:
+        print("Pas encore configuré. Lancez: quelio setup")
+        sys.exit(1)
+
+    action = args[0].lower() if args else "show"
+    if action == "add":
+        _add(conf, args[1:])
+    elif action == "remove":
+        _remove(conf, args[1:])
+    elif action == "list":
+        if not conf.team:
+            print("Aucun profil d'équipe.")
+        for p in conf.team:
+            print(f"- {p.name} : {p.username} ({p.api_url})")
+    elif action == "show":
+        if not conf.team:
+            print("Aucun profil d'équipe. Ajoutez-en avec: quelio team add NOM IDENTIFIANT")
+            sys.exit(1)
+        _run_grid(conf)
+    else:
+        print("Usage: quelio team [add NOM IDENTIFIANT [URL_API] | remove NOM | list]")
+        sys.exit(1)
+
+
+def _run_grid(conf: Config) -> None:
+    # Lazy imports to avoid requiring Rich/Textual for non-TUI commands
+    from rich.panel import Panel
+    from rich.text import Text
+    from textual.app import App, ComposeResult
+    from textual.containers import Grid
+    from textual.widgets import Static
+
+    fetcher = TeamFetcher(
+        conf.team, profile_passwords(conf.team, conf.session_cache_ttl), ttl=conf.cache_ttl, history=HistoryStore()
+    )
+
+    class MemberCard(Static):
+        def __init__(self, profile: Profile) -> None:
+            super().__init__(classes="member")
+            self.profile = profile
+            self.week: Week | None = None
+            self.error: str | None = None
+
+        def set_result(self, week: Week | None, error: str | None) -> None:
+            if week is not None:
+                self.week = week
+            self.error = error
+            self.refresh()
+
+        def render(self):
+            body = Text()
+            if self.week is None and self.error is None:
+                body.append("…", style="#9CA3AF")
+            elif self.week is None:
+                body.append(f"Erreur: {self.error}", style="#F87171")
+            else:
+                s = summarize(self.week, int(conf.weekly_hours) * 60, conf.work_days)
+                if s["present"]:
+                    body.append(f"● en poste depuis {minutes_to_hhmm(s['since'])}\n", style="bold #34D399")
+                else:
+                    body.append("○ hors poste\n", style="#9CA3AF")
+                body.append(f"Jour     {minutes_to_hhmm(s['today'])}\n")
+                body.append(f"Semaine  {minutes_to_hhmm(s['week'])}")
+                if self.error:
+                    body.append("\n⚠ données anciennes", style="#FBBF24")
+            return Panel(body, title=self.profile.name, border_style="#4B5563", title_align="left")
+
+    class TeamGrid(App):
+        CSS = """
+        Screen { background: #111827; color: #E5E7EB; }
+        #grid { grid-size: 3; grid-gutter: 0 1; padding: 1 2; height: auto; }
+        .member { height: 7; }
+        #footer { dock: bottom; padding: 1 2; color: #9CA3AF; }
+        """
+
+        BINDINGS = [
+            ("q", "quit", "Quitter"),
+            ("r", "refresh", "Rafraîchir"),
+            ("ctrl+q", "quit"),
+            ("ctrl+c", "quit"),
+        ]
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.cards = {p.account: MemberCard(p) for p in conf.team}
+            self.footer = Static(id="footer")
+
+        def compose(self) -> ComposeResult:
+            yield Grid(*self.cards.values(), id="grid")
+            yield self.footer
+
+        def on_mount(self) -> None:
+            self.action_refresh(force=False)
+            self.set_interval(conf.poll_interval or DEFAULT_POLL_INTERVAL, lambda: self.action_refresh(force=False))
+            # Open intervals grow every minute
+            self.set_interval(60, lambda: [card.refresh() for card in self.cards.values()])
+
+        def action_refresh(self, force: bool = True) -> None:
+            self.footer.update("⟳ Actualisation…")
+            self.run_worker(lambda: self._fetch(force), group="team", exclusive=True, thread=True, exit_on_error=False)
+
+        def _fetch(self, force: bool) -> None:
+            # Each card is updated as soon as its own response arrives
+            for profile, week, error in fetcher.fetch_all(force=force):
+                card = self.cards[profile.account]
+                self.call_from_thread(card.set_result, week, str(error) if error else None)
+            self.call_from_thread(self.footer.update, " q Quitter   r Rafraîchir")
+
+    try:
+        TeamGrid().run()
+    finally:
+        fetcher.close()
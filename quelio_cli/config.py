@@ -4,10 +4,17 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-from .constants import CONFIG_DIR, CONFIG_PATH, DEFAULT_API_URL
+from .constants import (
+    CONFIG_DIR,
+    CONFIG_PATH,
+    DEFAULT_API_URL,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REQUEST_DEADLINE,
+)
 
 
 def normalize_url(u: str) -> str:
@@ -18,18 +25,42 @@ def normalize_url(u: str) -> str:
     return u
 
 
+@dataclass
+class Profile:
+    """A teammate followed in team mode."""
+
+    name: str
+    username: str
+    api_url: str
+
+    @property
+    def account(self) -> str:
+        return f"{self.username}@{self.api_url}"
+
+
 @dataclass
 class Config:
     api_url: str
     username: str
     weekly_hours: int = 38
     work_days: list[int] = None  # 0=lundi, 1=mardi, ..., 6=dimanche
+    cache_ttl: int = DEFAULT_CACHE_TTL  # seconds, 0 always fetches (the cache then only serves while the API is down)
+    poll_interval: int = DEFAULT_POLL_INTERVAL  # seconds, 0 disables background polling
+    team: List[Profile] = field(default_factory=list)  # named profiles for team mode
+    request_deadline: int = DEFAULT_REQUEST_DEADLINE  # seconds for one fetch, retries included
+    hedge_requests: bool = False  # resend requests slower than their p95 (dashboard, daemon)
+    session_cache_ttl: int = 0  # seconds a password is cached outside the keyring, 0 disables
 
     def __post_init__(self):
         # Default work days: Monday to Friday (0-4)
         if self.work_days is None:
             self.work_days = [0, 1, 2, 3, 4]
 
+    @property
+    def account(self) -> str:
+        """Key identifying this account (keyring, cache and history)."""
+        return f"{self.username}@{self.api_url}"
+
     @staticmethod
     def load() -> Optional["Config"]:
         """Load configuration from disk, return None if missing/invalid."""
@@ -43,6 +74,19 @@ class Config:
                 username=data["username"],
                 weekly_hours=int(data.get("weekly_hours", 38)),
                 work_days=data.get("work_days", [0, 1, 2, 3, 4]),
+                cache_ttl=int(data.get("cache_ttl", DEFAULT_CACHE_TTL)),
+                poll_interval=int(data.get("poll_interval", DEFAULT_POLL_INTERVAL)),
+                team=[
+                    Profile(
+                        name=p["name"],
+                        username=p["username"],
+                        api_url=normalize_url(p.get("api_url") or data.get("api_url", DEFAULT_API_URL)),
+                    )
+                    for p in data.get("team", [])
+                ],
+                request_deadline=int(data.get("request_deadline", DEFAULT_REQUEST_DEADLINE)),
+                hedge_requests=bool(data.get("hedge_requests", False)),
+                session_cache_ttl=int(data.get("session_cache_ttl", 0)),
             )
         except Exception:
             return None
@@ -57,6 +101,12 @@ class Config:
                     "username": self.username,
                     "weekly_hours": int(self.weekly_hours),
                     "work_days": self.work_days if self.work_days else [0, 1, 2, 3, 4],
+                    "cache_ttl": int(self.cache_ttl),
+                    "poll_interval": int(self.poll_interval),
+                    "team": [{"name": p.name, "username": p.username, "api_url": p.api_url} for p in self.team],
+                    "request_deadline": int(self.request_deadline),
+                    "hedge_requests": bool(self.hedge_requests),
+                    "session_cache_ttl": int(self.session_cache_ttl),
                 },
                 f,
                 indent=2,
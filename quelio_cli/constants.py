@@ -8,6 +8,9 @@ import os
 # Configuration paths
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".badgecli")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+CACHE_DIR = os.path.join(CONFIG_DIR, "cache")
+DAEMON_SOCKET = os.path.join(CONFIG_DIR, "daemon.sock")
+HISTORY_PATH = os.path.join(CONFIG_DIR, "history.sqlite3")
 KEYRING_SERVICE = "badgecli"
 
 # API defaults
@@ -16,6 +19,22 @@ DEFAULT_API_URL = (
 )
 DEFAULT_COOKIES = {}
 
+# Seconds during which a cached API response is served without revalidation
+DEFAULT_CACHE_TTL = 60
+# Base interval between background polls of the dashboard (seconds)
+DEFAULT_POLL_INTERVAL = 120
+
+# Network timeouts (seconds): TCP/TLS connection, wait for each read, and
+# overall budget of one fetch, retries included
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+DEFAULT_REQUEST_DEADLINE = 15
+# Circuit breaker: consecutive failed fetches before the API is considered
+# down, then seconds before trying it again (doubled on each new failure)
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30
+BREAKER_MAX_COOLDOWN = 300
+
 # Weekday labels (French) for user-facing output
 WEEKDAY_FR = [
     "lundi",
@@ -0,0 +1,174 @@
+"""Password lookup shared by every command.
+
+Order: this process's memo, the opt-in session cache, the system keyring,
+the `BADGECLI_PASSWORD` environment variable, then an interactive prompt.
+
+`keyring` is imported, and its backend discovered (SecretService over
+D-Bus, macOS Keychain…), only when a lookup actually reaches it, at most
+once per process and with a timeout so a hung backend falls through to
+the next source instead of blocking the command.
+
+The session cache is off unless `session_cache_ttl` (seconds) is set in
+the configuration. Each password is then kept in a file readable by its
+owner only (0600, in a 0700 directory under `$XDG_RUNTIME_DIR` when
+available, a per-user tmpfs cleared at logout, else `~/.badgecli`) until
+it expires, so repeated `status` calls skip the keyring backend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from .constants import CONFIG_DIR, KEYRING_SERVICE
+from .trace import span
+
+SESSION_DIR = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or CONFIG_DIR, "quelio-session")
+# Seconds to wait for the keyring backend before falling back
+KEYRING_TIMEOUT = 5.0
+ENV_VARS = ("BADGECLI_PASSWORD", "BADGECLI_PWD")
+
+_memo: Dict[str, str] = {}
+_keyring_failed = False
+
+
+def _session_path(account: str) -> str:
+    digest = hashlib.sha256(account.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSION_DIR, digest)
+
+
+def _read_session(account: str) -> Optional[str]:
+    path = _session_path(account)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    try:
+        st = os.fstat(fd)
+        # Only trust a file that nobody else could have written or read
+        if st.st_uid != os.getuid() or st.st_mode & 0o077:
+            return None
+        with os.fdopen(fd, "r", encoding="utf-8") as f:
+            fd = -1
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    finally:
+        if fd != -1:
+            os.close(fd)
+    if not isinstance(entry, dict) or entry.get("account") != account:
+        return None
+    if not isinstance(entry.get("expires"), (int, float)) or entry["expires"] <= time.time():
+        _drop_session(account)
+        return None
+    password = entry.get("password")
+    return password if isinstance(password, str) and password else None
+
+
+def _write_session(account: str, password: str, ttl: float) -> None:
+    try:
+        os.makedirs(SESSION_DIR, mode=0o700, exist_ok=True)
+        path = _session_path(account)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"account": account, "expires": time.time() + ttl, "password": password}, f)
+        os.replace(tmp, path)
+    except OSError:
+        # The cache is a convenience: the next command asks the keyring again
+        pass
+
+
+def _drop_session(account: str) -> None:
+    try:
+        os.remove(_session_path(account))
+    except OSError:
+        pass
+
+
+def _keyring_call(method: str, *args):
+    """Call `keyring.<method>(KEYRING_SERVICE, *args)`, bounded by KEYRING_TIMEOUT.
+
+    Returns None when the keyring is missing, fails or does not answer in
+    time; a backend that hung is not asked again by this process.
+    """
+    global _keyring_failed
+    if _keyring_failed:
+        return None
+    result: Dict[str, object] = {}
+
+    def call() -> None:
+        try:
+            import keyring
+
+            result["value"] = getattr(keyring, method)(KEYRING_SERVICE, *args)
+        except Exception as e:
+            result["error"] = e
+
+    with span("keyring", method=method):
+        worker = threading.Thread(target=call, name="quelio-keyring", daemon=True)
+        worker.start()
+        worker.join(KEYRING_TIMEOUT)
+    if worker.is_alive():
+        _keyring_failed = True
+        print("Trousseau injoignable (pas de réponse), il est ignoré.", file=sys.stderr)
+        return None
+    if isinstance(result.get("error"), ImportError):
+        _keyring_failed = True
+    return result.get("value")
+
+
+def resolve_password(account: str, cache_ttl: float = 0, prompt: str = "Mot de passe: ", env: bool = True) -> str:
+    """Password of `account` (`username@api_url`), asking interactively last.
+
+    `cache_ttl` > 0 enables the session cache for that many seconds.
+    `env=False` skips the environment variables, which belong to the main
+    account (team profiles).
+    """
+    pwd = _memo.get(account)
+    if pwd:
+        return pwd
+    if cache_ttl > 0:
+        pwd = _read_session(account)
+        if pwd:
+            _memo[account] = pwd
+            return pwd
+    pwd = _keyring_call("get_password", account)
+    if not pwd and env:
+        pwd = next((os.environ[v] for v in ENV_VARS if os.environ.get(v)), None)
+    if not pwd:
+        import getpass
+
+        kept = f"gardé {cache_ttl:g} s pour cette session" if cache_ttl > 0 else "non stocké"
+        print(f"Mot de passe introuvable pour {account} (trousseau/env). Saisissez-le ({kept}):", file=sys.stderr)
+        pwd = getpass.getpass(prompt)
+    _memo[account] = pwd
+    if cache_ttl > 0 and pwd:
+        _write_session(account, pwd, cache_ttl)
+    return pwd
+
+
+def store_password(account: str, password: str) -> None:
+    """Save `password` in the keyring; raises if the keyring refuses it."""
+    import keyring
+
+    keyring.set_password(KEYRING_SERVICE, account, password)
+    _memo[account] = password
+    _drop_session(account)
+
+
+def invalidate(account: str) -> None:
+    """Forget cached copies (memo, session file), e.g. after a refused login."""
+    _memo.pop(account, None)
+    _drop_session(account)
+
+
+def forget_password(account: str) -> None:
+    """Remove `account` from the keyring and every cache (logout)."""
+    invalidate(account)
+    _keyring_call("delete_password", account)
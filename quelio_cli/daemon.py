@@ -0,0 +1,244 @@
+"""Resident fetcher serving the current week over a Unix socket.
+
+Protocol: one JSON object per line in each direction, one request per
+connection.
+
+    → {"op": "week", "account": "user@url", "force": false}
+    ← {"ok": true, "data": {...API payload...}, "fetched_at": 1700000000.0}
+
+Operations: `ping` (`ready` tells whether data is available), `week`
+(`force: true` refetches upstream first) and `shutdown`. Errors are reported as `{"ok": false, "error": "..."}`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, Optional
+
+from .api import ApiError, BadgeApi
+from .cache import CachedApi
+from .config import Config
+from .constants import DAEMON_SOCKET, DEFAULT_CACHE_TTL, DEFAULT_POLL_INTERVAL, DEFAULT_REQUEST_DEADLINE
+from .model import EMPTY_WEEK, parse_week
+from .polling import PollScheduler
+from .store import HistoryStore
+
+# Requests larger than this are rejected (they are a few dozen bytes)
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class DaemonUnavailable(ApiError):
+    """No daemon is listening, or it serves another account."""
+
+
+class DaemonClient:
+    """Fetch data from a running daemon; same `fetch()` contract as `CachedApi`.
+
+    `timeout` bounds requests answered from memory; a forced refresh makes
+    the daemon fetch upstream, so it waits up to `deadline` more. `ttl` is
+    the age above which `stale_ok=False` asks for such a refresh.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_url: str,
+        path: str = DAEMON_SOCKET,
+        timeout: float = 2.0,
+        deadline: float = DEFAULT_REQUEST_DEADLINE,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.account = f"{username}@{api_url}"
+        self.path = path
+        self.timeout = timeout
+        self.deadline = deadline
+        self.ttl = ttl
+
+    @classmethod
+    def connect(cls, conf: Config, path: str = DAEMON_SOCKET) -> Optional["DaemonClient"]:
+        """Return a client if a daemon for this account answers with data, else None."""
+        if not os.path.exists(path):
+            return None
+        client = cls(conf.username, conf.api_url, path, deadline=conf.request_deadline, ttl=conf.cache_ttl)
+        try:
+            ready = client.request("ping").get("ready")
+        except DaemonUnavailable:
+            return None
+        # A daemon still waiting for its first fetch has nothing to serve yet
+        return client if ready else None
+
+    def request(self, op: str, timeout: float | None = None, **fields) -> Dict:
+        payload = json.dumps({"op": op, "account": self.account, **fields}).encode("utf-8") + b"\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout or self.timeout)
+                sock.connect(self.path)
+                sock.sendall(payload)
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except OSError as e:
+            raise DaemonUnavailable(f"Démon injoignable: {e}")
+        try:
+            resp = json.loads(line)
+        except ValueError:
+            raise DaemonUnavailable("Réponse invalide du démon")
+        if not resp.get("ok"):
+            raise DaemonUnavailable(resp.get("error") or "Erreur du démon")
+        return resp
+
+    def fetch(self, force: bool = False, stale_ok: bool = True) -> Dict:
+        resp = self._week(force)
+        if not force and not stale_ok and time.time() - (resp.get("fetched_at") or 0) >= self.ttl:
+            resp = self._week(True)
+        data = resp.get("data")
+        if not isinstance(data, dict):
+            raise DaemonUnavailable("Aucune donnée disponible dans le démon")
+        return data
+
+    def _week(self, force: bool) -> Dict:
+        if force:
+            return self.request("week", timeout=self.deadline + self.timeout, force=True)
+        return self.request("week", force=False)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Nothing runs in the background on the client side."""
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError
+        except ValueError:
+            return self._reply({"ok": False, "error": "Requête invalide"})
+        self._reply(self.server.owner.handle(req))
+
+    def _reply(self, resp: Dict) -> None:
+        self.wfile.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, owner: "Daemon") -> None:
+        self.owner = owner
+        super().__init__(path, _Handler)
+
+
+class Daemon:
+    """Hold credentials and a warm API session, poll, and serve the result."""
+
+    def __init__(self, conf: Config, password: str, path: str = DAEMON_SOCKET) -> None:
+        self.conf = conf
+        self.account = f"{conf.username}@{conf.api_url}"
+        self.path = path
+        self.api = CachedApi(
+            BadgeApi(
+                conf.api_url,
+                conf.username,
+                password,
+                deadline=conf.request_deadline,
+                hedge=conf.hedge_requests,
+                account=conf.account,
+            ),
+            ttl=conf.cache_ttl,
+            history=HistoryStore(),
+        )
+        self.scheduler = PollScheduler(conf.poll_interval or DEFAULT_POLL_INTERVAL, conf.work_days)
+        self.data: Optional[Dict] = None
+        self.fetched_at = 0.0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server: Optional[_UnixServer] = None
+
+    def refresh(self, force: bool = False) -> None:
+        data = self.api.fetch(force=force, stale_ok=False)
+        if data is not self.data:  # "not modified" hands back the same object
+            parse_week(data)  # refuse to serve a payload clients cannot parse
+        with self._lock:
+            self.data = data
+            self.fetched_at = time.time()
+            self.last_error = None
+
+    def handle(self, req: Dict) -> Dict:
+        if req.get("account") != self.account:
+            return {"ok": False, "error": "Le démon sert un autre compte"}
+        op = req.get("op")
+        if op == "ping":
+            with self._lock:
+                ready = self.data is not None
+            return {"ok": True, "pid": os.getpid(), "ready": ready}
+        if op == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"ok": True}
+        if op == "week":
+            if req.get("force"):
+                try:
+                    self.refresh(force=True)
+                except Exception as e:
+                    with self._lock:
+                        self.last_error = str(e)
+            with self._lock:
+                if self.data is None:
+                    return {"ok": False, "error": self.last_error or "Pas encore de données"}
+                return {"ok": True, "data": self.data, "fetched_at": self.fetched_at}
+        return {"ok": False, "error": f"Opération inconnue: {op!r}"}
+
+    def _poll_loop(self) -> None:
+        delay = 0.0
+        while not self._stop.wait(delay):
+            try:
+                self.refresh()
+                self.scheduler.record_success()
+            except Exception as e:
+                with self._lock:
+                    self.last_error = str(e)
+                self.scheduler.record_error()
+            with self._lock:
+                week = parse_week(self.data) if self.data is not None else EMPTY_WEEK
+            delay = self.scheduler.next_delay(week)
+
+    def serve_forever(self) -> None:
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)  # socket is only reachable by its owner
+        try:
+            self._server = _UnixServer(self.path, self)
+        finally:
+            os.umask(old_umask)
+        poller = threading.Thread(target=self._poll_loop, name="quelio-daemon-poll", daemon=True)
+        poller.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop.set()
+            self._server.server_close()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.path)
+            except OSError:
+                os.remove(self.path)
+                return
+        raise ApiError(f"Un démon est déjà actif ({self.path})")
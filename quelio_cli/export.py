@@ -0,0 +1,185 @@
+"""Streaming export of punches for `quelio export` (CSV, JSON Lines, Parquet).
+
+The export is a chain of generators: weeks come out of `backfill()` as
+they land, within a window of `jobs` weeks, `in_order` restores their
+chronological order, `day_rows` turns each week into one row per day with
+its effective and paid minutes, and a writer consumes the rows one week at
+a time. Memory is bounded by that window whatever the range, a slow week
+or the size of the team, and the first rows are written while later weeks
+are still being fetched.
+
+Parquet needs pyarrow, an optional dependency imported lazily.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .api import ApiError
+from .constants import WEEKDAY_FR
+from .model import Week
+from .utils_time import day_paid_bonus, day_total_from_points, day_total_from_points_dynamic, minutes_to_hhmm
+
+FORMATS = ("csv", "jsonl", "parquet")
+COLUMNS = ("name", "date", "weekday", "punches", "effective_minutes", "paid_minutes", "open")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet", ".pq": "parquet"}
+# Rows per Parquet row group: a few years of one account
+ROW_GROUP = 1024
+
+Row = Dict[str, object]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ApiError("L'export Parquet nécessite pyarrow: .venv/bin/python -m pip install pyarrow")
+    return pyarrow
+
+
+def check_format(fmt: str) -> None:
+    """Raise ApiError when `fmt` needs an optional dependency that is missing."""
+    if fmt == "parquet":
+        _pyarrow()
+
+
+def format_for(path: str, fmt: Optional[str] = None) -> str:
+    """`fmt` when given, else guessed from the extension of `path` (CSV by default)."""
+    if fmt:
+        return fmt
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def in_order(
+    results: Iterable[Tuple[date, Optional[Week], Optional[ApiError]]], mondays: List[date]
+) -> Iterator[Tuple[date, Optional[Week], Optional[ApiError]]]:
+    """Re-emit `backfill()` results (completion order) oldest week first.
+
+    A week that lands early waits until the ones before it arrive. Run
+    `backfill()` with `ordered=True` so that is fewer than `jobs` weeks,
+    however long an early week takes.
+    """
+    expected = iter(mondays)
+    wanted = next(expected, None)
+    waiting: Dict[date, Tuple[date, Optional[Week], Optional[ApiError]]] = {}
+    for result in results:
+        waiting[result[0]] = result
+        while wanted in waiting:
+            yield waiting.pop(wanted)
+            wanted = next(expected, None)
+
+
+def day_rows(name: str, week: Week, start: date, end: date, now: datetime) -> List[Row]:
+    """One row per day of `week` within [start, end], in date order.
+
+    Same rules as the dashboard: an open punch counts until `now` today
+    only (a forgotten exit on a past day is ignored), and paid minutes add
+    the paid break bonuses of `day_paid_bonus`.
+    """
+    rows = []
+    for day in sorted(week, key=lambda d: d.date):
+        if not start <= day.date <= end:
+            continue
+        points = day.minutes
+        if day.date == now.date():
+            effective = day_total_from_points_dynamic(points, now.hour * 60 + now.minute)
+        else:
+            effective = day_total_from_points(points)
+        rows.append(
+            {
+                "name": name,
+                "date": day.date,
+                "weekday": WEEKDAY_FR[day.date.weekday()],
+                "punches": [minutes_to_hhmm(m) for m in points],
+                "effective_minutes": effective,
+                "paid_minutes": effective + day_paid_bonus(points, day.date, now),
+                "open": day.is_open and day.date == now.date(),
+            }
+        )
+    return rows
+
+
+@contextmanager
+def _text_output(path: str) -> Iterator[IO[str]]:
+    if path == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        yield f
+
+
+def write_csv(batches: Iterable[List[Row]], path: str) -> int:
+    """Write rows as CSV (punches separated by spaces); return the row count."""
+    count = 0
+    with _text_output(path) as out:
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        for rows in batches:
+            for row in rows:
+                writer.writerow(
+                    (
+                        row["name"],
+                        row["date"].isoformat(),
+                        row["weekday"],
+                        " ".join(row["punches"]),
+                        row["effective_minutes"],
+                        row["paid_minutes"],
+                        int(row["open"]),
+                    )
+                )
+            count += len(rows)
+            # Readers of a pipe get each week as soon as it is fetched
+            out.flush()
+    return count
+
+
+def write_jsonl(batches: Iterable[List[Row]], path: str) -> int:
+    """Write one JSON object per line; return the row count."""
+    count = 0
+    with _text_output(path) as out:
+        for rows in batches:
+            for row in rows:
+                out.write(json.dumps({**row, "date": row["date"].isoformat()}, ensure_ascii=False) + "\n")
+            count += len(rows)
+            out.flush()
+    return count
+
+
+def write_parquet(batches: Iterable[List[Row]], path: str) -> int:
+    """Write a Parquet file, one row group per ROW_GROUP rows; return the row count."""
+    pa = _pyarrow()
+    schema = pa.schema(
+        [
+            ("name", pa.string()),
+            ("date", pa.date32()),
+            ("weekday", pa.string()),
+            ("punches", pa.list_(pa.string())),
+            ("effective_minutes", pa.int32()),
+            ("paid_minutes", pa.int32()),
+            ("open", pa.bool_()),
+        ]
+    )
+    count = 0
+    pending: List[Row] = []
+    # Closed in any case so an interrupted export still leaves a readable file
+    with pa.parquet.ParquetWriter(path, schema) as writer:
+        for rows in batches:
+            pending.extend(rows)
+            count += len(rows)
+            if len(pending) >= ROW_GROUP:
+                writer.write_table(pa.Table.from_pylist(pending, schema=schema))
+                pending = []
+        if pending:
+            writer.write_table(pa.Table.from_pylist(pending, schema=schema))
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "parquet": write_parquet}
@@ -0,0 +1,538 @@
+"""Lightweight ANSI dashboard: `quelio dashboard --lite`.
+
+Draws the same week view as the Textual dashboard with plain escape
+sequences, for slow links (SSH, mosh) and fast startup: neither Textual
+nor Rich is imported. Each frame is rasterized into a grid of
+(character, SGR) cells and only the cells that differ from the previous
+frame are sent. Frames are drawn only when something changed, at most
+`fps` times per second. The default 256-color palette has no animation;
+`--colors truecolor` restores the pulsing live segment.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import select
+import shutil
+import signal
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .aggregate import WeekTotals
+from .config import Config
+from .model import EMPTY_WEEK, Week, parse_week
+from .polling import PollScheduler
+from .store import HistoryStore
+from .timeline import (
+    CARD_BACKGROUND,
+    EMPTY_STYLE,
+    FILL_STYLE,
+    Run,
+    fit_window,
+    merge_intervals,
+    pulse_style,
+    ruler,
+    timeline_runs,
+    timeline_width,
+)
+from .trace import span
+from .utils_time import current_week_dates, day_total_from_points_dynamic, minutes_to_hhmm
+
+DEFAULT_FPS = 4
+MAX_FPS = 10
+# Same width as the Textual dashboard column
+VIEW_WIDTH = 51
+# Unchanged cells between two changes are rewritten rather than skipped
+# when that is cheaper than a cursor move (~8 bytes)
+DIFF_GAP = 6
+
+TEXT = "#E5E7EB"
+MUTED = "#9CA3AF"
+GREEN = "#22C55E"
+CYAN = "#06B6D4"
+RED = "#EF4444"
+
+# Timeline layouts of the last frames, by (punches, minute, width): a frame
+# only recolors them. Cleared when full (a new week or terminal size).
+MAX_LAYOUTS = 32
+_layouts: Dict[Tuple, Tuple[List[Run], str]] = {}
+
+# (text, foreground, background, bold); None means the terminal default
+Segment = Tuple[str, Optional[str], Optional[str], bool]
+Cell = Tuple[str, str]
+
+_CUBE = (0, 95, 135, 175, 215, 255)
+
+
+def _rgb(color: str) -> Tuple[int, int, int]:
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def xterm_256(color: str) -> int:
+    """Nearest xterm-256 index (6x6x6 cube or gray ramp) of a #RRGGBB color."""
+    r, g, b = _rgb(color)
+    ri, gi, bi = (min(range(6), key=lambda i: abs(_CUBE[i] - v)) for v in (r, g, b))
+    cube_err = (_CUBE[ri] - r) ** 2 + (_CUBE[gi] - g) ** 2 + (_CUBE[bi] - b) ** 2
+    gray = max(0, min(23, round(((r + g + b) / 3 - 8) / 10)))
+    level = 8 + 10 * gray
+    gray_err = (level - r) ** 2 + (level - g) ** 2 + (level - b) ** 2
+    return 16 + 36 * ri + 6 * gi + bi if cube_err <= gray_err else 232 + gray
+
+
+class Palette:
+    """SGR sequences for (foreground, background, bold), memoized."""
+
+    def __init__(self, colors: str = "256") -> None:
+        self.truecolor = colors == "truecolor"
+        self._sgr: Dict[Tuple, str] = {}
+
+    def sgr(self, fg: Optional[str], bg: Optional[str], bold: bool) -> str:
+        key = (fg, bg, bold)
+        code = self._sgr.get(key)
+        if code is None:
+            parts = ["0"]
+            if bold:
+                parts.append("1")
+            if fg:
+                parts.append(self._color(fg, 38))
+            if bg:
+                parts.append(self._color(bg, 48))
+            code = self._sgr[key] = f"\x1b[{';'.join(parts)}m"
+        return code
+
+    def _color(self, color: str, base: int) -> str:
+        if self.truecolor:
+            r, g, b = _rgb(color)
+            return f"{base};2;{r};{g};{b}"
+        return f"{base};5;{xterm_256(color)}"
+
+
+class Screen:
+    """The cells of the last frame; `draw()` returns only what changed."""
+
+    def __init__(self, palette: Palette) -> None:
+        self.palette = palette
+        self._grid: Optional[List[List[Cell]]] = None
+        self._size = (0, 0)
+
+    def invalidate(self) -> None:
+        """Force a full repaint (resize, terminal given back after suspend)."""
+        self._grid = None
+
+    def rasterize(self, lines: Sequence[Sequence[Segment]], width: int, height: int) -> List[List[Cell]]:
+        sgr = self.palette.sgr
+        blank = (" ", sgr(None, None, False))
+        grid = []
+        for segments in lines[:height]:
+            row: List[Cell] = []
+            for text, fg, bg, bold in segments:
+                code = sgr(fg, bg, bold)
+                row.extend((ch, code) for ch in text)
+            del row[width:]
+            row.extend([blank] * (width - len(row)))
+            grid.append(row)
+        grid.extend([blank] * width for _ in range(height - len(grid)))
+        return grid
+
+    def draw(self, lines: Sequence[Sequence[Segment]], width: int, height: int) -> str:
+        """Escape sequences turning the previous frame into this one."""
+        grid = self.rasterize(lines, width, height)
+        old = self._grid if self._size == (width, height) else None
+        out = [] if old is not None else ["\x1b[0m\x1b[2J"]
+        pen = None
+        for y, row in enumerate(grid):
+            prev = old[y] if old is not None else None
+            if prev == row:
+                continue
+            x = 0
+            while x < width:
+                if prev is not None and prev[x] == row[x]:
+                    x += 1
+                    continue
+                end = x + 1
+                while end < width:
+                    if prev is None or prev[end] != row[end]:
+                        end += 1
+                        continue
+                    gap = end
+                    while gap < width and gap - end < DIFF_GAP and prev[gap] == row[gap]:
+                        gap += 1
+                    if gap < width and gap - end < DIFF_GAP:
+                        end = gap  # short unchanged stretch: cheaper to rewrite
+                    else:
+                        break
+                out.append(f"\x1b[{y + 1};{x + 1}H")
+                for ch, code in row[x:end]:
+                    if code != pen:
+                        out.append(code)
+                        pen = code
+                    out.append(ch)
+                x = end
+        self._grid = grid
+        self._size = (width, height)
+        return "".join(out)
+
+
+def _pad(segments: List[Segment], width: int, bg: Optional[str]) -> List[Segment]:
+    used = sum(len(s[0]) for s in segments)
+    if used < width:
+        segments.append((" " * (width - used), None, bg, False))
+    return segments
+
+
+def _timeline(points: Sequence[int], now_min: Optional[int], live_color: Optional[str], width: int) -> Tuple[List[Segment], str]:
+    """Timeline glyphs in color runs (the open punch in `live_color`) and its ruler."""
+    key = (tuple(points), now_min, width)
+    layout = _layouts.get(key)
+    if layout is None:
+        if len(_layouts) >= MAX_LAYOUTS:
+            _layouts.clear()
+        intervals, open_punch = merge_intervals(points, now_min)
+        window = fit_window(intervals + [open_punch] if open_punch else intervals)
+        layout = _layouts[key] = (timeline_runs(intervals, open_punch, width, window), ruler(width, window))
+    runs, ticks = layout
+    segments: List[Segment] = []
+    for glyphs, kind, reverse in runs:
+        color = EMPTY_STYLE if kind == "empty" else FILL_STYLE
+        if kind == "live" and live_color:
+            color = live_color
+        if reverse:
+            segments.append((glyphs, CARD_BACKGROUND, color, False))
+        else:
+            segments.append((glyphs, color, CARD_BACKGROUND, False))
+    return segments, ticks
+
+
+def build_view(
+    title: str,
+    totals: Tuple[str, str, str],
+    days: Sequence[Tuple[str, Sequence[int], bool]],
+    now: datetime,
+    width: int,
+    height: int,
+    footer: List[Segment],
+    pulse: bool = False,
+) -> List[List[Segment]]:
+    """Screen lines of the week view: totals, one card per day, footer.
+
+    `days` holds (label, punches, is_today). With `pulse`, the open punch
+    of today is colored from the pulse palette for `now`.
+    """
+    view = min(VIEW_WIDTH, width)
+    # Two more columns of indent than a Textual card, and two on the right
+    columns = timeline_width(view - 4)
+    margin = [(" " * max(0, (width - view) // 2), None, None, False)]
+    bg = CARD_BACKGROUND
+    eff, paid, remaining = totals
+    lines: List[List[Segment]] = [[]]
+    lines.append(margin + _pad([(f" {title}", TEXT, bg, True)], view, bg))
+    for label, value, color in (
+        ("Total effectif", eff, GREEN),
+        ("Total payé", paid, CYAN),
+        ("Temps restant", remaining, RED),
+    ):
+        lines.append(margin + _pad([(f" {label}: ", TEXT, bg, True), (value, color, bg, False)], view, bg))
+    lines.append([])
+    for label, points, is_today in days:
+        now_min = now.hour * 60 + now.minute if len(points) % 2 == 1 else None
+        total = minutes_to_hhmm(day_total_from_points_dynamic(points, now_min))
+        name, _, date_str = label.partition(" ")
+        if not points:
+            lines.append(margin + [(f"   {name} {date_str}  {total}", EMPTY_STYLE, None, False)])
+            lines.append([])
+            continue
+        live_color = None
+        if is_today:
+            live_color = pulse_style(now.timestamp()) if pulse else FILL_STYLE
+        lines.append(
+            margin
+            + _pad(
+                [(f"   {name}", TEXT, bg, True), (f" {date_str}", MUTED, bg, False), (f"  {total}", MUTED, bg, False)],
+                view,
+                bg,
+            )
+        )
+        glyphs, ticks = _timeline(points, now_min, live_color, columns)
+        lines.append(margin + _pad([("   ", None, bg, False)] + glyphs, view, bg))
+        lines.append(margin + _pad([(f"   {ticks}", MUTED, bg, False)], view, bg))
+        lines.append([])
+    lines = lines[: max(0, height - 1)]
+    lines.extend([] for _ in range(height - 1 - len(lines)))
+    lines.append(margin + footer)
+    return lines
+
+
+class LiteDashboard:
+    """Event loop of the ANSI dashboard: keys, fetch results, clock, frames.
+
+    Everything runs on the main thread except fetches, whose results come
+    back through `call_from_thread` (same contract as a Textual app) and a
+    self-pipe that wakes up `select()`. Between two events the process
+    sleeps until the next visible change: a frame while the pulse is
+    animated, else the next minute while a punch is open, a paid bonus or
+    midnight, and the next background poll.
+    """
+
+    def __init__(
+        self, conf: Config, api, history: HistoryStore, colors: str = "256", fps: float = DEFAULT_FPS
+    ) -> None:
+        self.conf = conf
+        self.api = api
+        self.history = history
+        self.screen = Screen(Palette(colors))
+        self.animate = colors == "truecolor"
+        self.frame_interval = 1.0 / max(1.0, min(float(MAX_FPS), fps))
+        self.poller = PollScheduler(conf.poll_interval, conf.work_days) if conf.poll_interval > 0 else None
+        self.weekly_minutes = int(conf.weekly_hours) * 60
+        self.week: Week = EMPTY_WEEK
+        self.week_offset = 0
+        self.focused = True
+        self.busy = False
+        self.message = ""
+        self._shown: Week = EMPTY_WEEK
+        self._reference: Optional[date] = None
+        self._totals: Optional[WeekTotals] = None
+        self._day = date.today()
+        self._calls: "queue.Queue[Tuple[Callable, tuple]]" = queue.Queue()
+        self._wake_r, self._wake_w = os.pipe()
+        self._fetching = False
+        self._dirty = True
+        self._last_frame = 0.0
+        self._next_clock = 0.0
+        self._next_poll: Optional[float] = None
+        self._saved_tty = None
+        self._show()
+
+    # --- threads ------------------------------------------------------------
+
+    def call_from_thread(self, fn: Callable, *args) -> None:
+        """Run `fn(*args)` on the event loop (safe from any thread)."""
+        self._calls.put((fn, args))
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def refresh_data(self, force: bool = True, stale_ok: bool = True) -> None:
+        if self._fetching:
+            return
+        self._fetching = True
+        self.busy = True
+        self._dirty = True
+
+        def worker() -> None:
+            try:
+                week = parse_week(self.api.fetch(force=force, stale_ok=stale_ok))
+            except Exception as e:
+                self.call_from_thread(self._fetch_failed, e)
+                return
+            self.call_from_thread(self._fetched, week, force)
+
+        threading.Thread(target=worker, name="quelio-lite-fetch", daemon=True).start()
+
+    def _fetched(self, week: Week, manual: bool) -> None:
+        self._fetching = False
+        self.busy = False
+        self.message = "API indisponible: données en cache." if manual and getattr(self.api, "offline", False) else ""
+        if self.poller is not None:
+            self.poller.record_success()
+        self.apply_data(week)
+        self._schedule_poll()
+
+    def _fetch_failed(self, error: Exception) -> None:
+        self._fetching = False
+        self.busy = False
+        self.message = f"Erreur de chargement: {error}"
+        self._dirty = True
+        if self.poller is not None:
+            self.poller.record_error()
+        self._schedule_poll()
+
+    def _schedule_poll(self) -> None:
+        if self.poller is not None:
+            self._next_poll = time.monotonic() + self.poller.next_delay(self.week)
+
+    # --- state --------------------------------------------------------------
+
+    def apply_data(self, week: Week) -> None:
+        self.week = week
+        if self.week_offset == 0:
+            self._show()
+
+    def _show(self) -> None:
+        if self.week_offset == 0:
+            self._shown, self._reference = self.week, None
+        else:
+            self._reference = date.today() + timedelta(weeks=self.week_offset)
+            self._shown = self.history.week(self.conf.account, self._reference)
+        self._totals = WeekTotals(self._shown, self.weekly_minutes, self.conf.work_days, reference=self._reference)
+        self._day = date.today()
+        self._dirty = True
+
+    def _live(self) -> bool:
+        today = datetime.now().strftime("%d-%m-%Y")
+        return self.week_offset == 0 and len(self._shown.minutes(today)) % 2 == 1
+
+    def _animating(self) -> bool:
+        return self.animate and self.focused and self._live()
+
+    def _lines(self, now: datetime, width: int, height: int) -> List[List[Segment]]:
+        eff, paid, remaining = self._totals.at(now)
+        if self._reference is None:
+            title = "Ma semaine"
+        else:
+            monday = self._reference - timedelta(days=self._reference.weekday())
+            title = f"Semaine du {monday:%d/%m/%Y}"
+        days = [
+            (f"{wd.capitalize()} {dt:%d/%m/%Y}", self._shown.minutes(key), dt.date() == now.date())
+            for key, wd, dt in current_week_dates(self._reference)
+        ]
+        totals = (minutes_to_hhmm(eff), minutes_to_hhmm(paid), minutes_to_hhmm(remaining))
+        return build_view(title, totals, days, now, width, height, self._footer(), pulse=self._animating())
+
+    def _footer(self) -> List[Segment]:
+        footer: List[Segment] = []
+        for key, label in (("q", "Quitter"), ("r", "Rafraîchir"), ("p/n", "Semaines")):
+            footer += [(f" {key} ", "#111827", MUTED, True), (f" {label}  ", MUTED, None, False)]
+        if self.busy:
+            footer.append(("⟳ Actualisation…", FILL_STYLE, None, False))
+        elif self.message:
+            footer.append((self.message, RED, None, False))
+        return footer
+
+    # --- frames -------------------------------------------------------------
+
+    def _draw(self) -> None:
+        if self._day != date.today():
+            # Past midnight "today" moved: same data, new reference
+            self._show()
+        cols, rows = shutil.get_terminal_size()
+        now = datetime.now()
+        with span("lite.frame") as sp:
+            out = self.screen.draw(self._lines(now, cols, rows), cols, rows)
+            if out:
+                self._write(out)
+            sp.set(bytes=len(out.encode("utf-8")))
+        self._dirty = False
+        self._last_frame = time.monotonic()
+        # Next change visible without new data
+        wake = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        if self._totals is not None:
+            wake = min(wake, self._totals.next_change(now))
+        if self._live():
+            wake = min(wake, now.replace(second=0, microsecond=0) + timedelta(minutes=1))
+        self._next_clock = self._last_frame + max(0.05, (wake - now).total_seconds())
+
+    def _timeout(self) -> float:
+        now = time.monotonic()
+        deadlines = [max(self._next_clock, self._last_frame + self.frame_interval)]
+        if self._dirty or self._animating():
+            deadlines.append(self._last_frame + self.frame_interval)
+        if self._next_poll is not None:
+            deadlines.append(self._next_poll)
+        return max(0.0, min(deadlines) - now)
+
+    def _write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        fd = sys.stdout.fileno()
+        while data:
+            data = data[os.write(fd, data) :]
+
+    # --- terminal -----------------------------------------------------------
+
+    def _enter(self) -> None:
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        self._saved_tty = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        # Alternate screen, hidden cursor, focus in/out reports
+        self._write("\x1b[?1049h\x1b[?25l\x1b[?1004h")
+        self.screen.invalidate()
+        self._dirty = True
+
+    def _leave(self) -> None:
+        import termios
+
+        if self._saved_tty is None:
+            return
+        self._write("\x1b[?1004l\x1b[0m\x1b[?25h\x1b[?1049l")
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved_tty)
+        self._saved_tty = None
+
+    def _on_resize(self, *_args) -> None:
+        self._dirty = True
+        self._wake()
+
+    def _on_suspend(self, *_args) -> None:
+        # Give the terminal back, stop for real, and take it again on resume
+        self._leave()
+        signal.signal(signal.SIGTSTP, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTSTP)
+        signal.signal(signal.SIGTSTP, self._on_suspend)
+        self._enter()
+        self._wake()
+
+    def _on_input(self, data: bytes) -> bool:
+        """Handle keys; return False to quit."""
+        if not data:
+            return False  # end of input
+        if b"\x1b[I" in data:
+            self.focused = True
+            self._dirty = True
+        if b"\x1b[O" in data:
+            self.focused = False
+        # What remains may be empty: a focus report alone is not a key
+        data = data.replace(b"\x1b[I", b"").replace(b"\x1b[O", b"")
+        for ch in data.decode("utf-8", errors="ignore"):
+            if ch in "qQ":
+                return False
+            if ch in "rR":
+                self.refresh_data()
+            elif ch == "p":
+                self.week_offset -= 1
+                self._show()
+            elif ch == "n" and self.week_offset < 0:
+                self.week_offset += 1
+                self._show()
+        return True
+
+    def run(self) -> None:
+        if not (sys.stdin.isatty() and sys.stdout.isatty()):
+            print("`quelio dashboard --lite` nécessite un terminal.", file=sys.stderr)
+            raise SystemExit(1)
+        stdin = sys.stdin.fileno()
+        signal.signal(signal.SIGWINCH, self._on_resize)
+        signal.signal(signal.SIGTSTP, self._on_suspend)
+        self._enter()
+        try:
+            self.refresh_data(force=False)
+            while True:
+                now = time.monotonic()
+                due = self._dirty or self._animating() or now >= self._next_clock
+                if due and now - self._last_frame >= self.frame_interval:
+                    self._draw()
+                ready, _, _ = select.select([stdin, self._wake_r], [], [], self._timeout())
+                if self._wake_r in ready:
+                    os.read(self._wake_r, 4096)
+                if stdin in ready and not self._on_input(os.read(stdin, 64)):
+                    break
+                while not self._calls.empty():
+                    fn, args = self._calls.get_nowait()
+                    fn(*args)
+                if self._next_poll is not None and time.monotonic() >= self._next_poll:
+                    self._next_poll = None
+                    # Accept a response another client fetched within the cache TTL
+                    self.refresh_data(force=False, stale_ok=False)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._leave()
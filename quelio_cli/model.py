@@ -0,0 +1,121 @@
+"""Parsed representation of the API payload.
+
+The API returns punches as `{"dd-mm-YYYY": ["HH:MM", ...]}`. They are
+validated and converted once, right after the fetch, so the rest of the
+code works on integer minutes and `date` objects.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+from .api import ApiError
+
+
+class PunchDay:
+    """Punches of one day, as minutes since midnight in chronological order."""
+
+    __slots__ = ("key", "date", "minutes")
+
+    def __init__(self, key: str, day: date, minutes: Tuple[int, ...]) -> None:
+        self.key = key
+        self.date = day
+        self.minutes = minutes
+
+    @property
+    def is_open(self) -> bool:
+        """True when the last punch has no matching exit yet."""
+        return len(self.minutes) % 2 == 1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PunchDay):
+            return NotImplemented
+        return self.date == other.date and self.minutes == other.minutes
+
+    def __repr__(self) -> str:
+        return f"PunchDay({self.key!r}, {self.minutes!r})"
+
+
+class Week:
+    """Parsed API response: punches by day plus the server-side totals."""
+
+    __slots__ = ("days", "total_effective", "total_paid", "digest")
+
+    def __init__(
+        self,
+        days: Dict[str, PunchDay],
+        total_effective: Optional[str] = None,
+        total_paid: Optional[str] = None,
+        digest: str = "",
+    ) -> None:
+        self.days = days
+        self.total_effective = total_effective
+        self.total_paid = total_paid
+        # Hash of the raw payload, to skip work when nothing changed
+        self.digest = digest
+
+    def minutes(self, key: str) -> Tuple[int, ...]:
+        """Punch minutes for a 'dd-mm-YYYY' key (empty when absent)."""
+        day = self.days.get(key)
+        return day.minutes if day is not None else ()
+
+    def __iter__(self) -> Iterator[PunchDay]:
+        return iter(self.days.values())
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+EMPTY_WEEK = Week({})
+
+
+def parse_date_key(key: str) -> date:
+    """Parse a 'dd-mm-YYYY' or 'dd-mm-YY' day key."""
+    for fmt in ("%d-%m-%Y", "%d-%m-%y"):
+        try:
+            return datetime.strptime(key.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ApiError(f"Date invalide dans la réponse: {key!r}")
+
+
+def parse_punch(value: object, key: str) -> int:
+    """Parse one 'HH:MM' punch into minutes since midnight."""
+    if isinstance(value, str):
+        h, sep, m = value.strip().partition(":")
+        if sep and h.isdigit() and m.isdigit() and len(m) == 2:
+            hours, mins = int(h), int(m)
+            if hours < 24 and mins < 60:
+                return hours * 60 + mins
+    raise ApiError(f"Pointage invalide le {key}: {value!r}")
+
+
+def parse_week(data: Dict) -> Week:
+    """Validate an API payload and convert it into a `Week`.
+
+    Punches are sorted, whatever order the server sends them in.
+    Raises `ApiError` with the offending day and value on malformed input.
+    """
+    hours = data.get("hours")
+    if hours is None:
+        hours = {}
+    if not isinstance(hours, dict):
+        raise ApiError("Réponse inattendue de l'API (hours)")
+    days: Dict[str, PunchDay] = {}
+    for raw_key, points in hours.items():
+        day = parse_date_key(str(raw_key))
+        if not isinstance(points, list):
+            raise ApiError(f"Pointages invalides le {raw_key}: {points!r}")
+        key = day.strftime("%d-%m-%Y")
+        # The pairing into intervals relies on chronological order
+        days[key] = PunchDay(key, day, tuple(sorted(parse_punch(p, key) for p in points)))
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+    return Week(
+        days,
+        total_effective=data.get("total_effective"),
+        total_paid=data.get("total_paid"),
+        digest=digest,
+    )
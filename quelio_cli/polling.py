@@ -0,0 +1,95 @@
+"""Adaptive scheduling of background API polls."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from typing import List
+
+from .constants import DEFAULT_POLL_INTERVAL
+from .model import Week
+from .utils_time import current_week_dates
+
+# Never poll more often than this, whatever the configuration says
+MIN_POLL_INTERVAL = 15.0
+# Multiplier applied to the interval when nothing is expected to change
+IDLE_FACTOR = 10
+# Upper bound for idle waits and error backoff (seconds)
+MAX_POLL_INTERVAL = 30 * 60.0
+# Minutes around a usual in/out time during which we poll at full rate
+USUAL_TIME_WINDOW = 20
+# Relative jitter applied to every delay so colleagues don't poll in lockstep
+JITTER = 0.1
+
+
+class PollScheduler:
+    """Compute the delay before the next background fetch.
+
+    - every `interval` seconds while a punch is open today or around the
+      times the user usually badges (taken from the other days of the week);
+    - `IDLE_FACTOR` times less often otherwise, and on days that are not in
+      `work_days`, but waking up in time for the next usual badge time;
+    - exponential backoff with full jitter after consecutive errors.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        work_days: List[int] | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.interval = max(MIN_POLL_INTERVAL, float(interval))
+        self.work_days = work_days if work_days else [0, 1, 2, 3, 4]
+        self.errors = 0
+        self._rng = rng or random.Random()
+
+    def record_success(self) -> None:
+        self.errors = 0
+
+    def record_error(self) -> None:
+        self.errors += 1
+
+    def next_delay(self, week: Week, now: datetime | None = None) -> float:
+        """Return the number of seconds to wait before polling again."""
+        if now is None:
+            now = datetime.now()
+        if self.errors:
+            # Capped exponent: a long outage must not overflow the float
+            ceiling = min(MAX_POLL_INTERVAL, self.interval * (2 ** min(self.errors, 16)))
+            return self._rng.uniform(self.interval, max(self.interval, ceiling))
+
+        idle = min(MAX_POLL_INTERVAL, self.interval * IDLE_FACTOR)
+        if now.weekday() not in self.work_days:
+            return self._jitter(idle)
+
+        today_key = now.strftime("%d-%m-%Y")
+        if len(week.minutes(today_key)) % 2 == 1:
+            return self._jitter(self.interval)
+
+        now_min = now.hour * 60 + now.minute
+        usual = self._usual_minutes(week, today_key)
+        until_next_window = None
+        for m in usual:
+            if abs(now_min - m) <= USUAL_TIME_WINDOW:
+                return self._jitter(self.interval)
+            start = m - USUAL_TIME_WINDOW
+            if start > now_min:
+                delta = (start - now_min) * 60 - now.second
+                if until_next_window is None or delta < until_next_window:
+                    until_next_window = delta
+        if until_next_window is not None:
+            idle = min(idle, max(self.interval, until_next_window))
+        return self._jitter(idle)
+
+    @staticmethod
+    def _usual_minutes(week: Week, today_key: str) -> List[int]:
+        """Punch times (minutes) seen on this week's other days."""
+        seen = set()
+        for key, _wd, _dt in current_week_dates():
+            if key == today_key:
+                continue
+            seen.update(week.minutes(key))
+        return sorted(seen)
+
+    def _jitter(self, delay: float) -> float:
+        return delay * self._rng.uniform(1 - JITTER, 1 + JITTER)
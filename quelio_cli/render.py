@@ -0,0 +1,205 @@
+"""Rich renderables for the dashboard (weekly totals and day cards).
+
+Imported lazily by the dashboard (it requires Rich). Everything that only
+depends on the punches is built once and cached; only the live segment of
+an open punch is recomposed on each animation frame.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from rich.panel import Panel
+from rich.text import Span, Text
+
+from .timeline import (
+    CARD_BACKGROUND,
+    EMPTY_STYLE,
+    FILL_STYLE,
+    TIMELINE_WIDTH,
+    Run,
+    fit_window,
+    merge_intervals,
+    pulse_style,
+    ruler,
+    timeline_runs,
+    timeline_width,
+)
+from .utils_time import day_total_from_points_dynamic, minutes_to_hhmm
+
+# Card border and padding around the body
+PANEL_CHROME = 4
+# Left of the timeline, so that ruler labels straddle their hour
+MARGIN = " "
+
+
+def _style(color: str, reverse: bool) -> str:
+    return f"{CARD_BACKGROUND} on {color}" if reverse else color
+
+
+def _runs_text(runs: Sequence[Run], margin: str = "") -> Text:
+    """Static timeline runs as a Text; the open punch drawn as a closed one."""
+    spans = []
+    pos = len(margin)
+    for glyphs, kind, reverse in runs:
+        end = pos + len(glyphs)
+        spans.append(Span(pos, end, _style(EMPTY_STYLE if kind == "empty" else FILL_STYLE, reverse)))
+        pos = end
+    return Text(margin + "".join(run[0] for run in runs), spans=spans)
+
+
+def timeline_segments(
+    points: Sequence[int], now_min: Optional[int], live: bool, width: int = TIMELINE_WIDTH
+) -> Tuple[Text, List[Tuple[str, bool]], Text, str]:
+    """Split the timeline into (static prefix, live runs, static suffix, ruler).
+
+    The live runs, (glyphs, reverse) pairs, are the columns touched by the
+    open punch (extended to `now_min`); they are empty unless `live` is
+    set, in which case the caller styles them with `pulse_style` on each
+    frame. The day window is fitted to the punches and the ruler matches it.
+    """
+    intervals, open_punch = merge_intervals(points, now_min)
+    window = fit_window(intervals + [open_punch] if open_punch else intervals)
+    runs = timeline_runs(intervals, open_punch, width, window)
+    live_at = [i for i, run in enumerate(runs) if run[1] == "live"]
+    if not live or not live_at:
+        return _runs_text(runs, MARGIN), [], Text(), ruler(width, window)
+    c0, c1 = live_at[0], live_at[-1] + 1
+    prefix = _runs_text(runs[:c0], MARGIN)
+    live_runs = [(glyphs, reverse) for glyphs, _kind, reverse in runs[c0:c1]]
+    return prefix, live_runs, _runs_text(runs[c1:]), ruler(width, window)
+
+
+def _header(title: str, points: Sequence[int], expanded: bool, now_min: Optional[int]) -> Text:
+    """Header line (chevron, day name, date, total)."""
+    empty = len(points) == 0
+    chev = ("▾" if expanded else "▸") if not empty else ""
+    space = title.find(" ")
+    if space != -1:
+        day_name = title[:space]
+        date_str = title[space + 1 :]
+    else:
+        day_name = title
+        date_str = ""
+    head = Text()
+    if chev:
+        head.append(f"{chev} ", style="#E5E7EB")
+    else:
+        head.append("  ")
+    head.append(day_name, style="bold #E5E7EB")
+    if date_str:
+        head.append(f" {date_str}", style="#9CA3AF")
+    head.append("  ")
+    # Show dynamic total (accounts for an open interval)
+    head.append(minutes_to_hhmm(day_total_from_points_dynamic(points, now_min)), style="#9CA3AF")
+    if not empty:
+        head.append("\n")
+    return head
+
+
+def _details(points: Sequence[int], now_min: Optional[int]) -> Text:
+    """Expanded in/out table with the day total."""
+    tbl = Text()
+    tbl.append("\n\n")
+    tbl.append(" Entrées/Sorties:\n\n", style="#9CA3AF")
+    for i in range(0, len(points), 2):
+        if i + 1 < len(points):
+            tbl.append(f"  - {minutes_to_hhmm(points[i])}  →  {minutes_to_hhmm(points[i + 1])}\n")
+        else:
+            tbl.append(f"  - {minutes_to_hhmm(points[i])}  →  {minutes_to_hhmm(now_min or 0)} (en cours)\n", style=FILL_STYLE)
+    mins = day_total_from_points_dynamic(points, now_min)
+    tbl.append(f"\n Total: {minutes_to_hhmm(mins)}", style="#9CA3AF")
+    return tbl
+
+
+def render_totals(total_effective: str, total_paid: str, remaining: str, title: str = "Ma semaine") -> Panel:
+    """Weekly summary panel shown above the day cards."""
+    body = (
+        f"[b]Total effectif[/b]: [green]{total_effective}[/green]\n"
+        f"[b]Total payé[/b]: [cyan]{total_paid}[/cyan]\n"
+        f"[b]Temps restant[/b]: [red]{remaining}[/red]"
+    )
+    return Panel(
+        body,
+        title=title,
+        border_style=CARD_BACKGROUND,
+        padding=(0, 1),
+        style=f"on {CARD_BACKGROUND}",
+        expand=True,
+    )
+
+
+def _panel(body: Text) -> Panel:
+    # Wrap in a Panel to restore background for day sections
+    return Panel(
+        body,
+        border_style=CARD_BACKGROUND,
+        padding=(0, 1),
+        style=f"on {CARD_BACKGROUND}",
+        expand=True,
+    )
+
+
+class DayCardRenderer:
+    """Render one day card, caching everything but the live pulse.
+
+    Parts are rebuilt when the punches, expansion state, width or (for a
+    day with an open punch) the current minute change; the timeline takes
+    the card's whole width. Between those, a closed day returns the same
+    Panel and a live day only recolors its live glyphs from `PULSE_PALETTE`.
+    """
+
+    def __init__(self) -> None:
+        self._key: Optional[tuple] = None
+        self._parts: Optional[Tuple[Text, Text, List[Tuple[str, bool]], Text, str, Optional[Text]]] = None
+        self._panel: Optional[Panel] = None
+
+    def render(
+        self,
+        title: str,
+        points: Sequence[int],
+        expanded: bool,
+        is_today: bool,
+        width: int,
+        now: Optional[datetime] = None,
+    ) -> Panel:
+        if now is None:
+            now = datetime.now()
+        now_min = now.hour * 60 + now.minute if len(points) % 2 == 1 else None
+        key = (title, tuple(points), expanded, is_today, width, now_min)
+        if key != self._key:
+            self._key = key
+            self._parts = self._build(title, points, expanded, is_today, width, now_min)
+            self._panel = None
+        head, prefix, live, suffix, ticks, details = self._parts
+        if live:
+            color = pulse_style(now.timestamp())
+            timeline = Text.assemble(prefix, *((glyphs, _style(color, reverse)) for glyphs, reverse in live), suffix)
+            return _panel(self._body(head, timeline, ticks, details))
+        if self._panel is None:
+            self._panel = _panel(self._body(head, prefix, ticks, details))
+        return self._panel
+
+    @staticmethod
+    def _build(title: str, points: Sequence[int], expanded: bool, is_today: bool, width: int, now_min: Optional[int]):
+        head = _header(title, points, expanded, now_min)
+        if points:
+            columns = timeline_width(width - PANEL_CHROME)
+            prefix, live, suffix, ticks = timeline_segments(points, now_min, live=is_today, width=columns)
+        else:
+            prefix, live, suffix, ticks = Text(), [], Text(), ""
+        details = _details(points, now_min) if expanded and points else None
+        return head, prefix, live, suffix, ticks, details
+
+    @staticmethod
+    def _body(head: Text, timeline: Text, ticks: str, details: Optional[Text]) -> Text:
+        body = head.copy()
+        if timeline.plain:
+            body.append("\n")
+            body.append_text(timeline)
+            body.append("\n")
+            body.append(ticks, style="dim")
+        if details is not None:
+            body.append_text(details)
+        return body
@@ -0,0 +1,198 @@
+"""Analytics over the punch history, on columnar NumPy arrays.
+
+NumPy is an optional dependency, imported lazily: only `quelio stats`
+needs it. Rows from the history store are decoded in one pass into flat
+arrays (one entry per day, one per closed interval) and every aggregate
+is a vectorized reduction over them, so a year of a whole team costs a
+few array operations instead of a Python loop per day.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .api import ApiError
+from .constants import WEEKDAY_FR
+from .utils_time import minutes_to_hhmm
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Overtime histogram: 30-minute bins, the outer bins catch everything beyond
+OVERTIME_BIN = 30
+OVERTIME_RANGE = 240
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ApiError("`quelio stats` nécessite NumPy: .venv/bin/python -m pip install numpy")
+    return numpy
+
+
+class PunchColumns:
+    """Punches of many days as parallel arrays.
+
+    Per day: `day` (date ordinal), `first` and `last` punch (minutes) and
+    `closed` (even number of punches). Per closed interval: `interval_day`
+    (index into the day arrays), `start` and `end` (minutes).
+    """
+
+    def __init__(self, rows: Sequence[Tuple[str, str]]) -> None:
+        np = _numpy()
+        rows = [(iso, punches) for iso, punches in rows if punches]
+        self.day = np.fromiter((date.fromisoformat(iso).toordinal() for iso, _ in rows), np.int64, len(rows))
+        counts = np.fromiter((p.count(",") + 1 for _, p in rows), np.int64, len(rows))
+        if rows:
+            flat = np.array(",".join(p for _, p in rows).split(","), dtype=np.int64)
+        else:
+            flat = np.zeros(0, dtype=np.int64)
+        offsets = np.cumsum(counts) - counts
+        self.first = flat[offsets]
+        self.last = flat[offsets + counts - 1]
+        self.closed = counts % 2 == 0
+        # Position of each punch within its day; even positions followed by
+        # another punch open a closed interval.
+        per_punch_count = np.repeat(counts, counts)
+        position = np.arange(flat.size) - np.repeat(offsets, counts)
+        opens = np.flatnonzero((position % 2 == 0) & (position + 1 < per_punch_count))
+        self.interval_day = np.repeat(np.arange(len(rows)), counts)[opens]
+        self.start = flat[opens]
+        self.end = flat[opens + 1]
+
+    def __len__(self) -> int:
+        return int(self.day.size)
+
+    @classmethod
+    def concat(cls, parts: List["PunchColumns"]) -> "PunchColumns":
+        """Stack several accounts (day indices are shifted accordingly)."""
+        np = _numpy()
+        out = cls([])
+        shift = np.cumsum([0] + [len(p) for p in parts[:-1]])
+        for name in ("day", "first", "last", "closed", "start", "end"):
+            setattr(out, name, np.concatenate([getattr(p, name) for p in parts] or [getattr(out, name)]))
+        out.interval_day = np.concatenate(
+            [p.interval_day + s for p, s in zip(parts, shift)] or [out.interval_day]
+        )
+        return out
+
+
+def _weekday(ordinals: "np.ndarray") -> "np.ndarray":
+    # date.fromordinal(1) is a Monday: same numbering as date.weekday()
+    return (ordinals - 1) % 7
+
+
+def _streak(under: "np.ndarray", days: "np.ndarray") -> Optional[Dict]:
+    """Longest run of consecutive worked days under target."""
+    np = _numpy()
+    if not under.any():
+        return None
+    edges = np.diff(np.concatenate(([0], under.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    best = int(np.argmax(ends - starts))
+    return {
+        "days": int(ends[best] - starts[best]),
+        "from": date.fromordinal(int(days[starts[best]])).isoformat(),
+        "to": date.fromordinal(int(days[ends[best] - 1])).isoformat(),
+    }
+
+
+def compute(cols: PunchColumns, daily_target: float, work_days: Sequence[int], streak: bool = True) -> Dict:
+    """Aggregates of `cols`, JSON-serializable (minutes as numbers)."""
+    np = _numpy()
+    effective = np.bincount(cols.interval_day, weights=cols.end - cols.start, minlength=len(cols))
+    worked = effective > 0
+    days = cols.day[worked]
+    eff = effective[worked]
+    weekday = _weekday(days)
+    # Days off that were worked anyway count entirely as overtime
+    target = np.where(np.isin(weekday, list(work_days)), daily_target, 0.0)
+    overtime = eff - target
+
+    result: Dict = {"days_worked": int(days.size), "total_minutes": int(eff.sum())}
+    if days.size == 0:
+        return result
+    departures = cols.last[worked & cols.closed]
+    result.update(
+        {
+            "from": date.fromordinal(int(days.min())).isoformat(),
+            "to": date.fromordinal(int(days.max())).isoformat(),
+            "mean_daily_minutes": float(eff.mean()),
+            "mean_arrival": float(cols.first[worked].mean()),
+            "mean_departure": float(departures.mean()) if departures.size else None,
+        }
+    )
+
+    edges = np.arange(-OVERTIME_RANGE, OVERTIME_RANGE + OVERTIME_BIN, OVERTIME_BIN)
+    clipped = np.clip(overtime, edges[0], edges[-1] - 1)
+    hist, _ = np.histogram(clipped, bins=edges)
+    result["overtime"] = {
+        "mean": float(overtime.mean()),
+        "median": float(np.median(overtime)),
+        "total": float(overtime.sum()),
+        "histogram": [
+            {"from": int(lo), "to": int(hi), "days": int(n)} for lo, hi, n in zip(edges[:-1], edges[1:], hist)
+        ],
+    }
+    if streak:
+        # Person-level only: in a team the days of several people interleave
+        result["longest_under_target"] = _streak(overtime < 0, days)
+
+    count = np.bincount(weekday, minlength=7)
+    seen = count > 0
+    mean_eff = np.bincount(weekday, weights=eff, minlength=7)[seen] / count[seen]
+    mean_ot = np.bincount(weekday, weights=overtime, minlength=7)[seen] / count[seen]
+    result["weekdays"] = [
+        {"weekday": WEEKDAY_FR[wd], "days": int(count[wd]), "mean_minutes": float(m), "mean_overtime": float(o)}
+        for wd, m, o in zip(np.flatnonzero(seen), mean_eff, mean_ot)
+    ]
+    result["shortest_weekday"] = result["weekdays"][int(np.argmin(mean_ot))]["weekday"]
+    return result
+
+
+def _hhmm(minutes: Optional[float]) -> str:
+    return "--:--" if minutes is None else minutes_to_hhmm(int(round(minutes)))
+
+
+def format_text(title: str, result: Dict) -> List[str]:
+    """Human-readable report for one `compute()` result."""
+    lines = [title]
+    if not result["days_worked"]:
+        lines.append("  Aucun jour travaillé dans l'historique local sur cette période.")
+        return lines
+    lines += [
+        f"  Période              : {result['from']} → {result['to']} ({result['days_worked']} jours travaillés)",
+        f"  Total                : {_hhmm(result['total_minutes'])}",
+        f"  Moyenne par jour     : {_hhmm(result['mean_daily_minutes'])}",
+        f"  Arrivée moyenne      : {_hhmm(result['mean_arrival'])}",
+        f"  Départ moyen         : {_hhmm(result['mean_departure'])}",
+        f"  Écart à l'objectif   : moyenne {_hhmm(result['overtime']['mean'])},"
+        f" médiane {_hhmm(result['overtime']['median'])}, cumul {_hhmm(result['overtime']['total'])}",
+    ]
+    streak = result.get("longest_under_target", False)
+    if streak:
+        lines.append(f"  Plus longue série sous l'objectif : {streak['days']} jours ({streak['from']} → {streak['to']})")
+    elif streak is None:
+        lines.append("  Plus longue série sous l'objectif : aucune")
+    lines.append(f"  Jour le plus court   : {result['shortest_weekday']}")
+    lines.append("")
+    lines.append("  Par jour de semaine  :")
+    for wd in result["weekdays"]:
+        lines.append(
+            f"    {wd['weekday']:<9} {wd['days']:>4} j  moyenne {_hhmm(wd['mean_minutes'])}"
+            f"  écart {_hhmm(wd['mean_overtime']):>6}"
+        )
+    lines.append("")
+    lines.append("  Écart quotidien à l'objectif :")
+    hist = result["overtime"]["histogram"]
+    peak = max(b["days"] for b in hist) or 1
+    last = len(hist) - 1
+    for i, b in enumerate(hist):
+        low = "     " if i == 0 else f"{b['from']:+5d}"
+        high = "     " if i == last else f"{b['to']:+5d}"
+        bar = "█" * max(1 if b["days"] else 0, round(b["days"] / peak * 30))
+        lines.append(f"    {low} … {high} min  {bar} {b['days']}")
+    return lines
@@ -0,0 +1,169 @@
+"""Local history of fetched punches (SQLite, under `~/.badgecli`)."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .constants import HISTORY_PATH
+from .model import PunchDay, Week
+from .utils_time import day_paid_bonus, day_total_from_points, minutes_to_hhmm
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    account    TEXT NOT NULL,  -- 'username@api_url'
+    day        TEXT NOT NULL,  -- ISO 'YYYY-MM-DD', sorts chronologically
+    punches    TEXT NOT NULL,  -- minutes since midnight, comma separated
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weeks (
+    account    TEXT NOT NULL,
+    monday     TEXT NOT NULL,  -- ISO date of the Monday of a fully fetched week
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (account, monday)
+) WITHOUT ROWID;
+"""
+
+
+def _encode(minutes: Iterable[int]) -> str:
+    return ",".join(str(m) for m in minutes)
+
+
+def _decode(punches: str) -> tuple:
+    return tuple(int(m) for m in punches.split(",")) if punches else ()
+
+
+class HistoryStore:
+    """Every fetched day, deduplicated by (account, date).
+
+    The primary key doubles as the index for range queries, so reading a
+    month or a quarter is a single ordered index scan.
+    """
+
+    def __init__(self, path: str = HISTORY_PATH) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        # One connection is shared by every thread; writes must not interleave
+        # inside each other's transaction.
+        self._write_lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            with self._write_lock:
+                if self._conn is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def merge(self, account: str, days: Iterable[PunchDay], week: Optional[date] = None) -> int:
+        """Insert or update days; return how many rows actually changed.
+
+        `week` (any day of it) says that `days` is the whole of that week:
+        its stored days missing from `days`, or now without punches, are
+        deleted, as the server no longer has them.
+        """
+        now = time.time()
+        rows = [(account, d.date.isoformat(), _encode(d.minutes), now) for d in days if d.minutes]
+        conn = self.conn
+        with self._write_lock, conn:
+            before = conn.total_changes
+            if week is not None:
+                monday = week - timedelta(days=week.weekday())
+                kept = [iso for _account, iso, _punches, _now in rows]
+                conn.execute(
+                    "DELETE FROM days WHERE account = ? AND day BETWEEN ? AND ? "
+                    f"AND day NOT IN ({', '.join('?' * len(kept))})",
+                    (account, monday.isoformat(), (monday + timedelta(days=6)).isoformat(), *kept),
+                )
+            conn.executemany(
+                "INSERT INTO days (account, day, punches, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, day) DO UPDATE SET "
+                "punches = excluded.punches, updated_at = excluded.updated_at "
+                "WHERE punches != excluded.punches",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def mark_week(self, account: str, monday: date) -> None:
+        """Record that the whole week starting on `monday` has been fetched."""
+        conn = self.conn
+        with self._write_lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO weeks (account, monday, fetched_at) VALUES (?, ?, ?)",
+                (account, monday.isoformat(), time.time()),
+            )
+
+    def forget(self, account: str) -> int:
+        """Delete every day and fetched week of `account`; return the days removed."""
+        conn = self.conn
+        with self._write_lock, conn:
+            removed = conn.execute("DELETE FROM days WHERE account = ?", (account,)).rowcount
+            conn.execute("DELETE FROM weeks WHERE account = ?", (account,))
+            return removed
+
+    def fetched_weeks(self, account: str, start: date, end: date) -> Set[date]:
+        """Mondays in [start, end] whose week has already been fetched in full."""
+        cur = self.conn.execute(
+            "SELECT monday FROM weeks WHERE account = ? AND monday BETWEEN ? AND ?",
+            (account, start.isoformat(), end.isoformat()),
+        )
+        return {date.fromisoformat(iso) for (iso,) in cur}
+
+    def raw_days(self, account: str, start: date, end: date) -> List[Tuple[str, str]]:
+        """(ISO date, encoded punches) rows in [start, end], without decoding.
+
+        For bulk consumers (`stats`) that parse every row in one pass.
+        """
+        cur = self.conn.execute(
+            "SELECT day, punches FROM days WHERE account = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (account, start.isoformat(), end.isoformat()),
+        )
+        return cur.fetchall()
+
+    def days(self, account: str, start: date, end: date) -> List[PunchDay]:
+        """Days in [start, end] (inclusive), in chronological order."""
+        cur = self.conn.execute(
+            "SELECT day, punches FROM days WHERE account = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (account, start.isoformat(), end.isoformat()),
+        )
+        out = []
+        for iso, punches in cur:
+            d = date.fromisoformat(iso)
+            out.append(PunchDay(d.strftime("%d-%m-%Y"), d, _decode(punches)))
+        return out
+
+    def last_weeks(self, account: str, count: int, today: Optional[date] = None) -> List[PunchDay]:
+        """Days of the last `count` weeks, current week included."""
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        return self.days(account, monday - timedelta(weeks=count - 1), monday + timedelta(days=6))
+
+    def week(self, account: str, any_day: date, now: Optional[datetime] = None) -> Week:
+        """The Monday..Sunday week containing `any_day`, with computed totals."""
+        now = now or datetime.now()
+        monday = any_day - timedelta(days=any_day.weekday())
+        days = self.days(account, monday, monday + timedelta(days=6))
+        effective = sum(day_total_from_points(d.minutes) for d in days)
+        paid = effective + sum(day_paid_bonus(d.minutes, d.date, now) for d in days)
+        digest = hashlib.sha1(repr([(d.key, d.minutes) for d in days]).encode("utf-8")).hexdigest()
+        return Week(
+            {d.key: d for d in days},
+            total_effective=minutes_to_hhmm(effective),
+            total_paid=minutes_to_hhmm(paid),
+            digest=digest,
+        )
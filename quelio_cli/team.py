@@ -0,0 +1,142 @@
+"""Concurrent fetching of several accounts for team mode."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .aggregate import WeekTotals
+from .api import BadgeApi
+from .cache import CachedApi
+from .config import Profile
+from .constants import DEFAULT_CACHE_TTL
+from .model import Week, parse_week
+from .store import HistoryStore
+from .utils_time import day_total_from_points_dynamic
+
+DEFAULT_TEAM_JOBS = 6
+# Upstream requests per second across the whole team, and allowed burst
+DEFAULT_TEAM_RATE = 4.0
+DEFAULT_TEAM_BURST = 4
+
+
+class RateLimiter:
+    """Token bucket shared by every worker thread."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = max(0.001, float(rate))
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _RateLimitedAdapter:
+    """Transport adapter taking a `RateLimiter` token before each HTTP request.
+
+    Mounted on every client's session, so BadgeApi's retries, hedged
+    copies and week checks all count; answers served from the cache or
+    from another client's session cost nothing.
+    """
+
+    def __init__(self, adapter, limiter: RateLimiter) -> None:
+        self.adapter = adapter
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        return self.adapter.send(request, **kwargs)
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class TeamFetcher:
+    """Fetch every profile concurrently over one shared connection pool.
+
+    At most `jobs` requests are in flight and at most `rate` HTTP requests
+    per second start, whatever the team size (`adapter` replaces the
+    pooled transport, for tests). Results are yielded as they arrive so
+    a fast account never waits for a slow one.
+    """
+
+    def __init__(
+        self,
+        profiles: List[Profile],
+        passwords: Dict[str, str],
+        ttl: float = DEFAULT_CACHE_TTL,
+        jobs: int = DEFAULT_TEAM_JOBS,
+        rate: float = DEFAULT_TEAM_RATE,
+        history: HistoryStore | None = None,
+        adapter=None,
+    ) -> None:
+        self.profiles = profiles
+        jobs = max(1, jobs)
+        if adapter is None:
+            from requests.adapters import HTTPAdapter
+
+            hosts = {p.api_url for p in profiles}
+            adapter = HTTPAdapter(pool_connections=max(1, len(hosts)), pool_maxsize=jobs)
+        self.limiter = RateLimiter(rate, DEFAULT_TEAM_BURST)
+        self._adapter = _RateLimitedAdapter(adapter, self.limiter)
+        self.apis: Dict[str, CachedApi] = {
+            p.account: CachedApi(
+                BadgeApi(p.api_url, p.username, passwords[p.account], adapter=self._adapter, account=p.account),
+                ttl=ttl,
+                history=history,
+            )
+            for p in profiles
+        }
+        self._pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="quelio-team")
+
+    def _fetch_one(self, profile: Profile, force: bool) -> Week:
+        return parse_week(self.apis[profile.account].fetch(force=force, stale_ok=False))
+
+    def fetch_all(self, force: bool = False) -> Iterator[Tuple[Profile, Optional[Week], Optional[Exception]]]:
+        """Yield `(profile, week, None)` or `(profile, None, error)` in arrival order.
+
+        Any failure (API, network, unreadable cache) only concerns its profile.
+        """
+        futures = {self._pool.submit(self._fetch_one, p, force): p for p in self.profiles}
+        for future in as_completed(futures):
+            profile = futures[future]
+            try:
+                week = future.result()
+            except Exception as e:
+                yield profile, None, e
+            else:
+                yield profile, week, None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self._adapter.close()
+
+
+def summarize(week: Week, weekly_minutes: int, work_days: List[int], now: Optional[datetime] = None) -> Dict:
+    """Figures shown for one teammate: presence, today and week totals."""
+    now = now or datetime.now()
+    points = week.minutes(now.strftime("%d-%m-%Y"))
+    effective, _paid, remaining = WeekTotals(week, weekly_minutes, work_days, now).at(now)
+    return {
+        "present": len(points) % 2 == 1,
+        "since": points[-1] if len(points) % 2 == 1 else None,
+        "today": day_total_from_points_dynamic(points, now.hour * 60 + now.minute),
+        "week": effective,
+        "remaining": remaining,
+    }
@@ -0,0 +1,235 @@
+"""Day timeline geometry and pulse colors, shared by both dashboards.
+
+No Rich import here: the lite ANSI dashboard draws the same timeline
+without it. `render.py` wraps these in Rich renderables.
+
+A day is drawn from its merged intervals: `merge_intervals` turns the
+punches into sorted (start, end) minutes, `fit_window` picks the hours to
+show and `timeline_runs` lays them out over any width with eighth-of-a-
+column precision.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Default day window, widened to whole hours when punches fall outside it
+TIMELINE_START = 8 * 60
+TIMELINE_END = 18 * 60
+# Columns at the dashboard's usual card width, and the narrowest drawn
+TIMELINE_WIDTH = 40
+MIN_TIMELINE_WIDTH = 12
+# Hours between two ruler labels, the smallest that keeps them apart
+RULER_STEPS = (1, 2, 3, 4, 6, 12)
+
+FULL = "█"
+EMPTY = "─"
+# Left-anchored blocks, indexed by covered eighths of a column
+EIGHTHS = " ▏▎▍▌▋▊▉█"
+
+FILL_STYLE = "#7C3AED"
+EMPTY_STYLE = "#4B5563"
+CARD_BACKGROUND = "#1F2937"
+
+# Pulse animation of the live segment: a precomputed palette, one entry per
+# 10 Hz frame, blending the card background into purple along a sine wave.
+PULSE_PERIOD = 3.5
+PULSE_STEPS = 35
+PULSE_MIN_ALPHA = 0.35
+
+
+def _build_pulse_palette() -> List[str]:
+    base_bg = (0x1F, 0x29, 0x37)
+    base_purple = (0x7C, 0x3A, 0xED)
+    palette = []
+    for i in range(PULSE_STEPS):
+        ph = (math.sin(i / PULSE_STEPS * math.tau) + 1) / 2
+        alpha = PULSE_MIN_ALPHA + (1.0 - PULSE_MIN_ALPHA) * ph
+        r, g, b = (int(bg * (1 - alpha) + fg * alpha) for bg, fg in zip(base_bg, base_purple))
+        palette.append(f"#{r:02X}{g:02X}{b:02X}")
+    return palette
+
+
+PULSE_PALETTE = _build_pulse_palette()
+
+# (glyphs, kind, reverse): see `timeline_runs`
+Run = Tuple[str, str, bool]
+
+
+def pulse_style(timestamp: float) -> str:
+    """Return the live segment color for the given UNIX timestamp."""
+    phase = (timestamp % PULSE_PERIOD) / PULSE_PERIOD
+    return PULSE_PALETTE[int(phase * PULSE_STEPS) % PULSE_STEPS]
+
+
+def fit_window(intervals: Sequence[Tuple[int, int]]) -> Tuple[int, int]:
+    """Day window in minutes: 08:00–18:00 widened to whole hours around the data."""
+    start, end = TIMELINE_START, TIMELINE_END
+    if intervals:
+        start = min(start, min(s for s, _e in intervals) // 60 * 60)
+        end = max(end, -(-max(e for _s, e in intervals) // 60) * 60)
+    return max(0, start), min(24 * 60, end)
+
+
+def merge_intervals(points: Sequence[int], now_min: Optional[int]) -> Tuple[List[Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """Closed punches as sorted, merged (start, end) minutes, and the open punch.
+
+    The open punch runs from the last entry to `now_min`; it is None when
+    the day is closed or `now_min` is not given.
+    """
+    pairs = sorted((points[i], points[i + 1]) for i in range(0, len(points) - 1, 2))
+    merged: List[Tuple[int, int]] = []
+    for s, e in pairs:
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    live = None
+    if len(points) % 2 == 1 and now_min is not None:
+        live = (points[-1], max(points[-1], now_min))
+    return merged, live
+
+
+def _cell(pieces: List[Tuple[int, int, str]]) -> Run:
+    """A column shared by several spans, from their (start, end, kind) eighths.
+
+    Left-anchored coverage uses a left eighth block; right-anchored
+    coverage draws the uncovered left part instead, in reverse video.
+    Gaps inside a column cannot be drawn and are rounded to the side
+    holding most of the coverage (`timeline_runs` inlines the one-span case).
+    """
+    covered = sum(b - a for a, b, _kind in pieces)
+    weight: Dict[str, int] = {}
+    for a, b, kind in pieces:
+        weight[kind] = weight.get(kind, 0) + b - a
+    kind = max(weight, key=weight.__getitem__)
+    if covered >= 8:
+        return (FULL, kind, False)
+    center2 = sum((a + b) * (b - a) for a, b, _kind in pieces)  # 2 × weighted center × covered
+    if center2 < 8 * covered:
+        return (EIGHTHS[covered], kind, False)
+    return (EIGHTHS[8 - covered], kind, True)
+
+
+def timeline_runs(
+    intervals: Sequence[Tuple[int, int]],
+    live: Optional[Tuple[int, int]],
+    width: int,
+    window: Tuple[int, int],
+) -> List[Run]:
+    """Glyph runs of a `width`-column timeline over `window` (minutes).
+
+    Each run is (glyphs, kind, reverse) with kind "fill", "live" or
+    "empty"; a reverse run is drawn with its colors swapped (glyphs in the
+    card background over the kind color). Positions are resolved to an
+    eighth of a column and the work is proportional to the number of
+    intervals, not to the width.
+    """
+    start, end = window
+    scale = width * 8 / max(1, end - start)
+    limit = width * 8
+    spans: List[Tuple[int, int, str]] = []
+    ordered = [(s, e, "fill") for s, e in intervals]
+    if live is not None:
+        ordered.append((live[0], live[1], "live"))
+    prev = 0
+    for s, e, kind in ordered:
+        # int(x + 0.5): round half up, cheaper than round() for x >= 0
+        s8 = int((s - start) * scale + 0.5) if s > start else 0
+        if s8 < prev:
+            s8 = prev
+        if s8 >= limit:
+            break
+        e8 = int((e - start) * scale + 0.5) if e > start else 0
+        if e8 <= s8:
+            e8 = s8 + 1  # even a one-minute punch stays visible
+        if e8 > limit:
+            e8 = limit
+        spans.append((s8, e8, kind))
+        prev = e8
+
+    runs: List[Run] = []
+    col = 0
+    i = 0
+    n = len(spans)
+    while i < n:
+        s8, e8, kind = spans[i]
+        if s8 >> 3 > col:
+            runs.append((EMPTY * ((s8 >> 3) - col), "empty", False))
+            col = s8 >> 3
+        if s8 <= col << 3:
+            if e8 >> 3 > col:
+                runs.append((FULL * ((e8 >> 3) - col), kind, False))
+                col = e8 >> 3
+            if e8 <= col << 3:
+                i += 1
+                continue
+        # Column `col` is only partly covered
+        lo = col << 3
+        hi = lo + 8
+        if i + 1 == n or spans[i + 1][0] >= hi:
+            a = s8 - lo if s8 > lo else 0
+            b = e8 - lo if e8 < hi else 8
+            if a + b < 8:
+                runs.append((EIGHTHS[b - a], kind, False))
+            else:
+                runs.append((EIGHTHS[8 - b + a], kind, True))
+        else:
+            pieces = []
+            j = i
+            while j < n and spans[j][0] < hi:
+                pieces.append((max(spans[j][0], lo) - lo, min(spans[j][1], hi) - lo, spans[j][2]))
+                j += 1
+            runs.append(_cell(pieces))
+        while i < n and spans[i][1] <= hi:
+            i += 1
+        col += 1
+    if col < width:
+        runs.append((EMPTY * (width - col), "empty", False))
+    return _join(runs)
+
+
+def _join(runs: List[Run]) -> List[Run]:
+    joined: List[Run] = [runs[0]]
+    for run in runs[1:]:
+        last = joined[-1]
+        if last[1] == run[1] and last[2] == run[2]:
+            joined[-1] = (last[0] + run[0], last[1], last[2])
+        else:
+            joined.append(run)
+    return joined
+
+
+# (width, window) -> ruler; a handful of entries per terminal size
+_rulers: Dict[Tuple[int, Tuple[int, int]], str] = {}
+
+
+def ruler(width: int, window: Tuple[int, int]) -> str:
+    """Hour labels under a `width`-column timeline, `width` + 2 characters.
+
+    Each "HH" label starts at its hour's column, so with the one-column
+    margin in front of the timeline it sits across the hour boundary.
+    Hours are skipped (every 2, 3… hours) when labels would touch.
+    """
+    key = (width, window)
+    cached = _rulers.get(key)
+    if cached is not None:
+        return cached
+    start, end = window
+    hours = max(1, (end - start) // 60)
+    step = next((n for n in RULER_STEPS if n * width >= 4 * hours), RULER_STEPS[-1])
+    chars = [" "] * (width + 2)
+    first = -(-start // 60)
+    for hour in range(first, end // 60 + 1, step):
+        x = round((hour * 60 - start) * width / max(1, end - start))
+        if x + 2 <= len(chars):
+            chars[x : x + 2] = f"{hour % 24:02d}"
+    cached = _rulers[key] = "".join(chars).rstrip()
+    return cached
+
+
+def timeline_width(available: int) -> int:
+    """Timeline columns fitting `available` characters (margin and ruler overhang included)."""
+    return max(MIN_TIMELINE_WIDTH, available - 3)
@@ -0,0 +1,280 @@
+"""Opt-in instrumentation: timing spans, duration histograms and cProfile.
+
+Enabled by `quelio --trace[=FICHIER] <commande>` or the `QUELIO_PROFILE`
+environment variable, which also dumps a cProfile of the whole run:
+
+    QUELIO_PROFILE=1                  spans + ~/.badgecli/profile-<pid>.prof
+    QUELIO_PROFILE=/tmp/quelio.prof   spans + that profile file
+
+Spans are appended as JSON lines (one object per finished span) to
+`~/.badgecli/trace.jsonl` unless another file is given; a per-phase summary
+is printed to stderr on exit. When disabled, `span()` and `timed()` return a
+shared no-op context manager and `observe()` returns immediately.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, IO, List, Optional
+
+from .constants import CONFIG_DIR
+
+TRACE_PATH = os.path.join(CONFIG_DIR, "trace.jsonl")
+PROFILE_ENV = "QUELIO_PROFILE"
+
+# Histogram bucket upper bounds, in milliseconds (last bucket is open)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 125, 250, 500, 1000)
+
+
+class Histogram:
+    """Fixed-bucket duration histogram with count, total and max."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0..1)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _NoSpan:
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "id", "parent", "start", "_t0")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.id = next(tracer._ids)
+        self.parent: Optional[int] = None
+
+    def set(self, **attrs) -> None:
+        """Attach attributes known only once the work is done (status, size…)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        stack = self.tracer._stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self.id)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        ms = (time.perf_counter() - self._t0) * 1000
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._finish(self, ms)
+
+
+class _Timer:
+    __slots__ = ("tracer", "name", "_t0")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.observe(self.name, (time.perf_counter() - self._t0) * 1000)
+
+
+class Tracer:
+    """Process-wide collector. Use the module-level `TRACER`."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        # Histograms can be collected without spans (the dashboard overlay)
+        self.histograms_enabled = False
+        self.histograms: Dict[str, Histogram] = {}
+        self.path: Optional[str] = None
+        self._out: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._profiler = None
+        self._profile_path: Optional[str] = None
+
+    # --- setup --------------------------------------------------------------
+
+    def enable(self, path: Optional[str] = None) -> None:
+        if self.enabled:
+            if path and self._out is None:
+                self.path = path
+            return
+        self.enabled = True
+        self.histograms_enabled = True
+        self.path = path or TRACE_PATH
+        _instrument_connections()
+        atexit.register(self.close)
+
+    def enable_from_env(self) -> None:
+        value = os.environ.get(PROFILE_ENV, "").strip()
+        if not value or value == "0":
+            return
+        self.enable()
+        import cProfile
+
+        self._profile_path = value if value not in ("1", "true", "yes") else os.path.join(
+            CONFIG_DIR, f"profile-{os.getpid()}.prof"
+        )
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def close(self) -> None:
+        """Flush outputs: profile dump, span file, summary on stderr."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(self._profile_path)), exist_ok=True)
+            self._profiler.dump_stats(self._profile_path)
+            self._profiler = None
+            print(f"[trace] profil cProfile: {self._profile_path}", file=sys.stderr)
+        with self._lock:
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+        if self.enabled:
+            for line in self.summary():
+                print(f"[trace] {line}", file=sys.stderr)
+            print(f"[trace] spans: {self.path}", file=sys.stderr)
+
+    # --- recording ----------------------------------------------------------
+
+    def span(self, name: str, **attrs):
+        """Context manager timing `name`; no-op unless tracing is enabled."""
+        if not self.enabled:
+            return _NO_SPAN
+        return Span(self, name, attrs)
+
+    def observe(self, name: str, ms: float) -> None:
+        """Add one duration (milliseconds) to the `name` histogram."""
+        if not self.histograms_enabled:
+            return
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms.setdefault(name, Histogram())
+        hist.add(ms)
+
+    def timed(self, name: str):
+        """Time a block into the `name` histogram (for hot, frequent paths).
+
+        Returns the shared no-op context manager when histograms are off.
+        """
+        if not self.histograms_enabled:
+            return _NO_SPAN
+        return _Timer(self, name)
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span, ms: float) -> None:
+        self.observe(span.name, ms)
+        record = {
+            "name": span.name,
+            "id": span.id,
+            "parent": span.parent,
+            "start": round(span.start, 6),
+            "ms": round(ms, 3),
+            "thread": threading.current_thread().name,
+            "pid": os.getpid(),
+        }
+        if span.attrs:
+            record["attrs"] = span.attrs
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._out is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._out = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._out.write(line + "\n")
+
+    def summary(self) -> List[str]:
+        lines = []
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            lines.append(
+                f"{name:<22} n={h.count:<6} moy={h.mean:8.2f} ms  p95≤{h.percentile(0.95):7.2f} ms  max={h.max:8.2f} ms"
+            )
+        return lines
+
+
+TRACER = Tracer()
+span = TRACER.span
+observe = TRACER.observe
+timed = TRACER.timed
+
+
+def _instrument_connections() -> None:
+    """Time DNS+TCP and TLS setup of new HTTP connections (urllib3)."""
+    try:
+        from urllib3 import connection
+    except ImportError:  # pragma: no cover - requests not installed
+        return
+
+    def wrap(cls, attr: str, name: str) -> None:
+        original = getattr(cls, attr)
+        if getattr(original, "_quelio_traced", False):
+            return
+
+        def traced(self, *args, **kwargs):
+            with span(name, host=getattr(self, "host", None)):
+                return original(self, *args, **kwargs)
+
+        traced._quelio_traced = True
+        setattr(cls, attr, traced)
+
+    # connect() covers the whole setup (TLS included for HTTPS); the nested
+    # _new_conn() span is the DNS resolution + TCP handshake part.
+    wrap(connection.HTTPConnection, "_new_conn", "net.dns_tcp")
+    wrap(connection.HTTPConnection, "connect", "net.connect")
+    wrap(connection.HTTPSConnection, "connect", "net.connect")
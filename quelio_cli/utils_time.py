@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
-from .constants import WEEKDAY_FR
+from .constants import PAUSE_PAID_MINUTES, WEEKDAY_FR
+
+if TYPE_CHECKING:
+    from .model import Week
 
 
 def hhmm_to_minutes(hhmm: str) -> int:
@@ -23,50 +26,64 @@ def minutes_to_hhmm(total: int) -> str:
     return f"{sign}{h:02d}:{m:02d}"
 
 
-def day_total_from_points(points: List[str]) -> int:
-    """Sum pairwise durations (in/out). Ignores a trailing unmatched punch."""
-    mins = [hhmm_to_minutes(p) for p in points]
+def day_total_from_points(points: Sequence[int]) -> int:
+    """Sum pairwise durations (in/out minutes). Ignores a trailing unmatched punch."""
     total = 0
-    for i in range(0, len(mins) - 1, 2):
-        total += mins[i + 1] - mins[i]
+    for i in range(0, len(points) - 1, 2):
+        total += points[i + 1] - points[i]
     return total
 
 
-def day_total_from_points_dynamic(points: List[str], now_min: int | None = None) -> int:
+def day_total_from_points_dynamic(points: Sequence[int], now_min: int | None = None) -> int:
     """Compute total like `day_total_from_points`, but if an odd number of
     punches is present, extend the last one to current time (in minutes)."""
-    mins = [hhmm_to_minutes(p) for p in points]
     total = 0
-    for i in range(0, len(mins) - 1, 2):
-        total += mins[i + 1] - mins[i]
-    if len(mins) % 2 == 1:
+    for i in range(0, len(points) - 1, 2):
+        total += points[i + 1] - points[i]
+    if len(points) % 2 == 1:
         if now_min is None:
             now = datetime.now()
             now_min = now.hour * 60 + now.minute
-        total += max(0, int(now_min) - mins[-1])
+        total += max(0, int(now_min) - points[-1])
     return total
 
 
-def format_week_summary(hours: Dict[str, List[str]]) -> List[Tuple[str, str, int]]:
+def day_paid_bonus(points: Sequence[int], day: date, now: datetime) -> int:
+    """Return additional paid minutes for the given day.
+    Business rule: +7 min at 10:30 and +7 min at 15:30 if the day has work.
+    For past days, both bonuses are applied. For today, apply each bonus
+    only once its time has passed. For future days, none.
+    """
+    # If no work that day, no bonus
+    if day_total_from_points(points) <= 0:
+        return 0
+    # Compare day with now to decide if break times have occurred
+    if day < now.date():
+        # Past day: both bonuses apply
+        return PAUSE_PAID_MINUTES * 2
+    if day > now.date():
+        return 0
+    # Today: check current time against 10:30 and 15:30
+    bonus = 0
+    if (now.hour, now.minute) >= (10, 30):
+        bonus += PAUSE_PAID_MINUTES
+    if (now.hour, now.minute) >= (15, 30):
+        bonus += PAUSE_PAID_MINUTES
+    return bonus
+
+
+def format_week_summary(week: Week) -> List[Tuple[str, str, int]]:
     """Return [(date_key, weekday_label_fr, minutes_total), ...] sorted by date desc."""
-    rows: List[Tuple[str, str, int]] = []
-    for d, points in hours.items():
-        # d is 'dd-mm-YYYY' or 'dd-mm-YY'
-        try:
-            dt = datetime.strptime(d, "%d-%m-%Y")
-        except ValueError:
-            dt = datetime.strptime(d, "%d-%m-%y")
-        wd = WEEKDAY_FR[dt.weekday()]
-        rows.append((d, wd, day_total_from_points(points)))
-    rows.sort(key=lambda r: datetime.strptime(r[0], "%d-%m-%Y"), reverse=True)
-    return rows
-
-
-def current_week_dates() -> List[Tuple[str, str, datetime]]:
-    """Return current week dates Monday..Sunday.
+    days = sorted(week, key=lambda d: d.date, reverse=True)
+    return [(d.key, WEEKDAY_FR[d.date.weekday()], day_total_from_points(d.minutes)) for d in days]
+
+
+def current_week_dates(reference: date | None = None) -> List[Tuple[str, str, datetime]]:
+    """Return current week dates Monday..Sunday (or the week containing
+    `reference` when given).
     Each entry: (date_key 'dd-mm-YYYY', weekday_label_fr, datetime).
     """
-    today = datetime.now()
+    today = datetime.now() if reference is None else datetime.combine(reference, datetime.min.time())
     monday = today - timedelta(days=today.weekday())
     days: List[Tuple[str, str, datetime]] = []
     for i in range(7):
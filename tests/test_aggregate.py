@@ -0,0 +1,58 @@
+from datetime import date, datetime
+
+from quelio_cli.aggregate import WeekTotals
+from quelio_cli.constants import PAUSE_PAID_MINUTES
+from quelio_cli.model import parse_week
+
+# Wednesday; Monday and Tuesday are closed, Wednesday is open since 08:00
+NOW = datetime(2024, 1, 17, 11, 0)
+WEEK = parse_week(
+    {
+        "hours": {
+            "15-01-2024": ["08:00", "12:00", "13:00", "17:00"],
+            "16-01-2024": ["09:00", "12:00"],
+            "17-01-2024": ["08:00"],
+        }
+    }
+)
+
+
+def totals(week=WEEK, now=NOW) -> WeekTotals:
+    return WeekTotals(week, 38 * 60, [0, 1, 2, 3, 4], now, reference=date(2024, 1, 15))
+
+
+def test_closed_days_and_open_interval():
+    effective, paid, remaining = totals().at(NOW)
+    assert effective == 8 * 60 + 3 * 60 + 3 * 60
+    # Past days get both bonuses; today has no closed interval yet
+    assert paid == effective + 4 * PAUSE_PAID_MINUTES
+    assert remaining == 38 * 60 - paid
+
+
+def test_open_interval_grows_with_time():
+    t = totals()
+    assert t.at(NOW.replace(hour=12))[0] - t.at(NOW)[0] == 60
+
+
+def test_missing_work_days_are_deducted():
+    t = totals(now=datetime(2024, 1, 19, 18, 0))
+    # Thursday and Friday have no punches: two days of 38h / 5
+    assert t.missing_minutes == 2 * 38 * 60 // 5
+
+
+def test_today_bonuses_follow_the_clock():
+    week = parse_week({"hours": {"17-01-2024": ["08:00", "10:00", "10:15"]}})
+    t = totals(week)
+    assert t.at(NOW.replace(hour=10, minute=29))[1] - t.at(NOW.replace(hour=10, minute=29))[0] == 0
+    morning = t.at(NOW.replace(hour=10, minute=30))
+    assert morning[1] - morning[0] == PAUSE_PAID_MINUTES
+    afternoon = t.at(NOW.replace(hour=15, minute=30))
+    assert afternoon[1] - afternoon[0] == 2 * PAUSE_PAID_MINUTES
+
+
+def test_next_change():
+    t = totals()
+    assert t.next_change(NOW.replace(second=30)) == NOW.replace(minute=1)
+    closed = totals(parse_week({"hours": {"17-01-2024": ["08:00", "09:00"]}}))
+    assert closed.next_change(NOW) == NOW.replace(hour=15, minute=30)
+    assert totals(parse_week({"hours": {}})).next_change(NOW) == datetime(2024, 1, 18)
@@ -0,0 +1,227 @@
+import json
+import time
+from datetime import date, timedelta
+
+import pytest
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from quelio_cli import credentials
+from quelio_cli.api import ApiError, BadgeApi, LoginRefused, WeekNotSupported
+
+TODAY = date.today()
+LAST_WEEK = TODAY - timedelta(weeks=1)
+
+
+def key(day: date) -> str:
+    return day.strftime("%d-%m-%Y")
+
+
+class FakeApi(BadgeApi):
+    """Answers from canned payloads instead of HTTP: `dated` for a `date` field, else `current`."""
+
+    def __init__(self, dated: dict, current: dict) -> None:
+        super().__init__("http://api.test/", "u", "p")
+        self.dated, self.current = dated, current
+        self.requests = []
+
+    def _fetch(self, extra, headers):
+        self.requests.append("date" in extra)
+        return dict(self.dated if "date" in extra else self.current)
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers each request with the next `(status, body, headers)` of `script`."""
+
+    def __init__(self, script) -> None:
+        super().__init__()
+        self.script = list(script)
+        self.requests = []
+
+    def send(self, request, **kwargs) -> Response:
+        self.requests.append(request)
+        status, body, headers = self.script.pop(0)
+        resp = Response()
+        resp.status_code = status
+        resp._content = json.dumps(body).encode("utf-8") if body is not None else b""
+        resp.headers = CaseInsensitiveDict(headers)
+        resp.request = request
+        resp.url = request.url
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def sent_since(request) -> bool:
+    return b'name="since"' in request.body
+
+
+FULL = {"hours": {"15-01-2024": ["08:00", "12:00"], "16-01-2024": ["09:00"]}, "cursor": "c1"}
+
+
+class FakeSpan:
+    def set(self, **attrs) -> None:
+        pass
+
+
+def test_days_outside_the_requested_week_mean_date_is_ignored():
+    current = {"hours": {key(TODAY): ["08:00"]}}
+    with pytest.raises(WeekNotSupported):
+        FakeApi(current, current).fetch(week=LAST_WEEK)
+
+
+def test_empty_past_week_is_checked_against_the_current_week():
+    api = FakeApi({"hours": {}}, {"hours": {key(TODAY): ["08:00"]}})
+    assert api.fetch(week=LAST_WEEK) == {"hours": {}}
+    assert api.requests == [True, False]
+    # Proven once, not compared again
+    api.fetch(week=LAST_WEEK)
+    assert api.requests == [True, False, True]
+
+
+def test_empty_past_and_current_weeks_are_not_trusted():
+    with pytest.raises(ApiError) as e:
+        FakeApi({"hours": {}}, {"hours": {}}).fetch(week=LAST_WEEK)
+    assert not isinstance(e.value, WeekNotSupported)
+
+
+def test_days_of_the_requested_week_are_trusted():
+    api = FakeApi({"hours": {key(LAST_WEEK): ["08:00"]}}, {"hours": {}})
+    api.fetch(week=LAST_WEEK)
+    assert api.requests == [True]
+
+
+def test_hedge_waits_for_the_p95():
+    api = BadgeApi("http://api.test/", "u", "p", hedge=True)
+    api._latencies.extend(range(1, 51))
+    assert api._hedge_after() == 48
+
+
+def test_hedged_copy_runs_on_its_own_session():
+    api = BadgeApi("http://api.test/", "u", "p", hedge=True)
+    api._latencies.extend([0.01] * 20)
+    api._expires = time.monotonic() + 5
+    session = api.session
+    seen = []
+
+    def call(s):
+        seen.append(s)
+        if s is session:
+            time.sleep(0.5)
+            return "first"
+        s.cookies.set("sid", "abc")
+        return "hedge"
+
+    try:
+        assert api._send(call, session, FakeSpan()) == "hedge"
+    finally:
+        api.close()
+    assert len(seen) == 2 and seen[1] is not session
+    # The server session opened by the winner is kept
+    assert session.cookies.get("sid") == "abc"
+
+
+def test_unchanged_week_answers_304_with_the_previous_data():
+    adapter = ScriptedAdapter([(200, FULL, {"ETag": '"v1"'}), (304, None, {})])
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    first = api.fetch()
+    assert "cursor" not in first and api.validators == ('"v1"', "c1")
+    assert api.fetch() is first
+    assert api.not_modified
+    conditional = adapter.requests[1]
+    assert conditional.headers["If-None-Match"] == '"v1"' and sent_since(conditional)
+
+
+def test_partial_answer_is_merged_into_the_previous_data():
+    partial = {"partial": True, "hours": {"15-01-2024": None, "17-01-2024": ["08:30"]}, "cursor": "c2"}
+    adapter = ScriptedAdapter([(200, FULL, {}), (200, partial, {"ETag": '"v2"'})])
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    api.fetch()
+    merged = api.fetch()
+    assert not api.not_modified
+    assert merged["hours"] == {"16-01-2024": ["09:00"], "17-01-2024": ["08:30"]}
+    assert "partial" not in merged and api.validators == ('"v2"', "c2")
+
+
+def test_partial_answer_to_a_plain_request_is_taken_as_is():
+    partial = {"partial": True, "hours": {"17-01-2024": ["08:30"]}}
+    api = BadgeApi("http://api.test/", "u", "p", adapter=ScriptedAdapter([(200, partial, {})]))
+    assert api.fetch()["hours"] == {"17-01-2024": ["08:30"]}
+
+
+@pytest.mark.parametrize("answer", [(401, {"error": "refusé"}, {}), (200, {"error": "refusé"}, {})])
+def test_refused_login_drops_the_cached_password(answer, monkeypatch, tmp_path):
+    monkeypatch.setattr(credentials, "SESSION_DIR", str(tmp_path))
+    monkeypatch.setattr(credentials, "_memo", {"u@http://api.test/": "old", "other@http://api.test/": "pwd"})
+    credentials._write_session("u@http://api.test/", "old", 60)
+    api = BadgeApi("http://api.test/", "u", "old", adapter=ScriptedAdapter([answer]), account="u@http://api.test/")
+    with pytest.raises(LoginRefused):
+        api.fetch()
+    assert credentials._memo == {"other@http://api.test/": "pwd"}
+    assert credentials._read_session("u@http://api.test/") is None
+
+
+def test_server_errors_keep_the_cached_password(monkeypatch):
+    monkeypatch.setattr(credentials, "_memo", {"u@http://api.test/": "pwd"})
+    api = BadgeApi("http://api.test/", "u", "pwd", adapter=ScriptedAdapter([(400, None, {})]), account="u@http://api.test/")
+    with pytest.raises(ApiError):
+        api.fetch()
+    assert credentials._memo == {"u@http://api.test/": "pwd"}
+
+
+def sent_password(request) -> bool:
+    return b'name="password"' in request.body
+
+
+WEEK_WITH_TOKEN = {"hours": {}, "token": "t1"}
+
+
+def test_token_is_reused_after_one_login():
+    adapter = ScriptedAdapter([(200, WEEK_WITH_TOKEN, {}), (200, {"hours": {}}, {}), (200, {"hours": {}}, {})])
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    for _ in range(3):
+        api.fetch()
+    assert [sent_password(r) for r in adapter.requests] == [True, False, False]
+    assert all(b"t1" in r.body for r in adapter.requests[1:])
+
+
+@pytest.mark.parametrize("status", [401, 400, 422])
+def test_refused_session_logs_in_again(status):
+    adapter = ScriptedAdapter(
+        [
+            (200, WEEK_WITH_TOKEN, {}),
+            (200, {"hours": {}}, {}),
+            (status, {"error": "session"}, {}),
+            (200, WEEK_WITH_TOKEN, {}),
+            (200, {"hours": {}}, {}),
+        ]
+    )
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    for _ in range(4):
+        api.fetch()
+    assert [sent_password(r) for r in adapter.requests] == [True, False, False, True, False]
+
+
+def test_server_without_sessions_stops_reuse():
+    adapter = ScriptedAdapter(
+        [(200, WEEK_WITH_TOKEN, {}), (401, None, {}), (200, WEEK_WITH_TOKEN, {}), (200, {"hours": {}}, {})]
+    )
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    for _ in range(3):
+        api.fetch()
+    assert [sent_password(r) for r in adapter.requests] == [True, False, True, True]
+
+
+def test_session_expired_between_slow_refreshes_keeps_reuse(monkeypatch):
+    adapter = ScriptedAdapter(
+        [(200, WEEK_WITH_TOKEN, {}), (401, None, {}), (200, WEEK_WITH_TOKEN, {}), (200, {"hours": {}}, {})]
+    )
+    api = BadgeApi("http://api.test/", "u", "p", adapter=adapter)
+    api.fetch()
+    # The next refresh comes long after the login
+    api._logged_in_at -= 3600
+    api.fetch()
+    api.fetch()
+    assert [sent_password(r) for r in adapter.requests] == [True, False, True, False]
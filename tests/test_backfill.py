@@ -0,0 +1,58 @@
+from datetime import date
+
+from quelio_cli.api import ApiError, TransientError
+from quelio_cli.backfill import backfill, mondays_between
+
+MONDAY = date(2024, 1, 15)
+
+
+class FlakyApi:
+    """Fails `failures` times, each failure having cost `attempts` requests."""
+
+    def __init__(self, failures: int, error: ApiError, attempts: int = 1) -> None:
+        self.failures, self.error = failures, error
+        self.attempts = 0
+        self.per_fetch = attempts
+        self.calls = 0
+
+    def fetch(self, week=None) -> dict:
+        self.calls += 1
+        self.attempts = self.per_fetch
+        if self.calls <= self.failures:
+            raise self.error
+        self.attempts = 1
+        return {"hours": {}}
+
+
+def run(api: FlakyApi, retries: int = 3):
+    return list(backfill(lambda: api, [MONDAY], jobs=1, retries=retries, backoff=0))
+
+
+def test_transient_errors_are_retried():
+    api = FlakyApi(2, TransientError("503"))
+    [(monday, week, error)] = run(api)
+    assert monday == MONDAY and week is not None and error is None
+    assert api.calls == 3
+
+
+def test_other_errors_are_not_retried():
+    api = FlakyApi(5, ApiError("HTTP 400"))
+    [(_, week, error)] = run(api)
+    assert week is None and str(error) == "HTTP 400"
+    assert api.calls == 1
+
+
+def test_client_retries_count_against_the_budget():
+    # The client already tried 3 times: with 3 retries, one more fetch only
+    api = FlakyApi(5, TransientError("503"), attempts=3)
+    [(_, week, error)] = run(api)
+    assert week is None and isinstance(error, TransientError)
+    assert api.calls == 2
+
+
+def test_mondays_between():
+    assert mondays_between(date(2024, 1, 17), date(2024, 1, 29)) == [
+        date(2024, 1, 15),
+        date(2024, 1, 22),
+        date(2024, 1, 29),
+    ]
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from quelio_cli.api import TransientError
+from quelio_cli.cache import CachedApi, CircuitBreaker, CircuitOpen
+
+
+class CountingApi:
+    username = "u"
+    api_url = "http://api.test/"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail = False
+
+    def fetch(self) -> dict:
+        self.calls += 1
+        if self.fail:
+            raise TransientError("down")
+        return {"hours": {}, "n": self.calls}
+
+
+def test_fresh_entry_is_served_without_fetching(tmp_path):
+    api = CountingApi()
+    cached = CachedApi(api, ttl=60, cache_dir=str(tmp_path))
+    assert cached.fetch()["n"] == 1
+    assert cached.fetch()["n"] == 1
+    assert api.calls == 1
+
+
+def test_stale_entry_is_served_then_revalidated(tmp_path):
+    api = CountingApi()
+    cached = CachedApi(api, ttl=60, cache_dir=str(tmp_path))
+    cached.fetch()
+    cached.ttl = 0.01
+    time.sleep(0.02)
+    assert cached.fetch()["n"] == 1
+    cached.wait(5)
+    assert api.calls == 2
+    cached.ttl = 60
+    assert cached.fetch()["n"] == 2
+
+
+def test_zero_ttl_always_fetches_synchronously(tmp_path):
+    api = CountingApi()
+    cached = CachedApi(api, ttl=0, cache_dir=str(tmp_path))
+    assert [cached.fetch()["n"] for _ in range(3)] == [1, 2, 3]
+    assert api.calls == 3
+
+
+def test_force_bypasses_a_fresh_entry(tmp_path):
+    api = CountingApi()
+    cached = CachedApi(api, ttl=60, cache_dir=str(tmp_path))
+    cached.fetch()
+    assert cached.fetch(force=True)["n"] == 2
+
+
+def test_open_circuit_serves_the_cache(tmp_path):
+    api = CountingApi()
+    cached = CachedApi(api, ttl=0, cache_dir=str(tmp_path))
+    cached.breaker.threshold = 1
+    cached.fetch()
+    api.fail = True
+    with pytest.raises(TransientError):
+        cached.fetch()
+    assert cached.fetch()["n"] == 1
+    assert cached.offline
+    assert api.calls == 2
+
+
+def test_open_circuit_without_cache_raises(tmp_path):
+    api = CountingApi()
+    api.fail = True
+    cached = CachedApi(api, ttl=60, cache_dir=str(tmp_path))
+    cached.breaker.threshold = 1
+    with pytest.raises(TransientError):
+        cached.fetch()
+    with pytest.raises(CircuitOpen):
+        cached.fetch()
+    assert api.calls == 1
+
+
+def test_breaker_backs_off_and_closes(tmp_path):
+    breaker = CircuitBreaker(str(tmp_path / "b"), threshold=2, cooldown=10, max_cooldown=15)
+    breaker.record_failure()
+    assert breaker.retry_in() == 0
+    breaker.record_failure()
+    assert 9 < breaker.retry_in() <= 10
+    breaker.record_failure()
+    assert 14 < breaker.retry_in() <= 15
+    breaker.record_success()
+    assert breaker.retry_in() == 0
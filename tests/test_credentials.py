@@ -0,0 +1,74 @@
+import os
+import stat
+
+import pytest
+
+from quelio_cli import credentials
+
+ACCOUNT = "u@http://api.test/"
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(credentials, "SESSION_DIR", str(tmp_path / "session"))
+    monkeypatch.setattr(credentials, "_memo", {})
+    # No keyring backend in tests: fall through to the environment
+    monkeypatch.setattr(credentials, "_keyring_failed", True)
+    for var in credentials.ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("BADGECLI_PASSWORD", "secret")
+
+
+def test_session_cache_is_private():
+    assert credentials.resolve_password(ACCOUNT, cache_ttl=60) == "secret"
+    path = credentials._session_path(ACCOUNT)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(credentials.SESSION_DIR).st_mode) == 0o700
+    assert credentials._read_session(ACCOUNT) == "secret"
+
+
+def test_disabled_cache_writes_nothing():
+    credentials.resolve_password(ACCOUNT)
+    assert not os.path.exists(credentials._session_path(ACCOUNT))
+
+
+def test_session_cache_serves_the_next_command(monkeypatch):
+    credentials.resolve_password(ACCOUNT, cache_ttl=60)
+    monkeypatch.setattr(credentials, "_memo", {})
+    monkeypatch.delenv("BADGECLI_PASSWORD")
+    assert credentials.resolve_password(ACCOUNT, cache_ttl=60) == "secret"
+
+
+def test_readable_by_others_is_ignored():
+    credentials._write_session(ACCOUNT, "secret", 60)
+    os.chmod(credentials._session_path(ACCOUNT), 0o644)
+    assert credentials._read_session(ACCOUNT) is None
+
+
+def test_other_account_file_is_ignored():
+    credentials._write_session(ACCOUNT, "secret", 60)
+    os.replace(credentials._session_path(ACCOUNT), credentials._session_path("other@http://api.test/"))
+    assert credentials._read_session("other@http://api.test/") is None
+
+
+def test_expired_entry_is_removed():
+    credentials._write_session(ACCOUNT, "secret", -1)
+    assert credentials._read_session(ACCOUNT) is None
+    assert not os.path.exists(credentials._session_path(ACCOUNT))
+
+
+def test_invalidate_drops_memo_and_file():
+    credentials.resolve_password(ACCOUNT, cache_ttl=60)
+    credentials.invalidate(ACCOUNT)
+    assert ACCOUNT not in credentials._memo
+    assert not os.path.exists(credentials._session_path(ACCOUNT))
+
+
+def test_prompt_says_whether_the_password_is_kept(monkeypatch, capsys):
+    monkeypatch.delenv("BADGECLI_PASSWORD")
+    monkeypatch.setattr("getpass.getpass", lambda prompt: "typed")
+    assert credentials.resolve_password(ACCOUNT, cache_ttl=60) == "typed"
+    assert "gardé 60 s pour cette session" in capsys.readouterr().err
+    assert credentials._read_session(ACCOUNT) == "typed"
+    credentials.resolve_password("other@http://api.test/")
+    assert "non stocké" in capsys.readouterr().err
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from quelio_cli.config import Config
+from quelio_cli.daemon import Daemon, DaemonClient
+
+
+class CountingApi:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self, force: bool = False, stale_ok: bool = True) -> dict:
+        self.calls += 1
+        return {"hours": {}, "n": self.calls}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    conf = Config(api_url="http://api.test/", username="u", cache_ttl=60)
+    d = Daemon(conf, "secret", path=str(tmp_path / "d.sock"))
+    d.api = CountingApi()
+    d._poll_loop = lambda: None  # refreshed by hand in the tests
+    thread = threading.Thread(target=d.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if d._server is not None:
+            break
+        thread.join(0.01)
+    yield d
+    d.stop()
+    thread.join(5)
+
+
+def test_daemon_without_data_is_not_used(daemon):
+    assert DaemonClient.connect(daemon.conf, daemon.path) is None
+    daemon.refresh()
+    client = DaemonClient.connect(daemon.conf, daemon.path)
+    assert client is not None
+    assert client.fetch()["n"] == 1
+
+
+def test_stale_ok_false_refreshes_old_data(daemon):
+    daemon.refresh()
+    client = DaemonClient.connect(daemon.conf, daemon.path)
+    assert client.fetch(stale_ok=False)["n"] == 1
+    daemon.fetched_at -= 120
+    assert client.fetch()["n"] == 1
+    assert client.fetch(stale_ok=False)["n"] == 2
+
+
+def test_forced_requests_wait_for_the_upstream_deadline(daemon, monkeypatch):
+    daemon.refresh()
+    client = DaemonClient.connect(daemon.conf, daemon.path)
+    timeouts = []
+    request = client.request
+    monkeypatch.setattr(client, "request", lambda op, timeout=None, **f: timeouts.append(timeout) or request(op, timeout, **f))
+    assert client.fetch(force=True)["n"] == 2
+    assert timeouts == [daemon.conf.request_deadline + client.timeout]
@@ -0,0 +1,135 @@
+import csv
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from quelio_cli.api import ApiError
+from quelio_cli.backfill import backfill
+from quelio_cli.constants import PAUSE_PAID_MINUTES
+from quelio_cli.export import day_rows, format_for, in_order, write_csv, write_jsonl, write_parquet
+from quelio_cli.model import parse_week
+
+NOW = datetime(2024, 1, 17, 11, 0)
+WEEK = parse_week(
+    {
+        "hours": {
+            "17-01-2024": ["08:00"],
+            "15-01-2024": ["08:00", "12:00", "13:00", "17:00"],
+            "16-01-2024": ["09:00"],
+        }
+    }
+)
+MONDAYS = [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]
+
+
+def test_in_order_restores_the_week_order():
+    failure = ApiError("503")
+    results = [(MONDAYS[2], "c", None), (MONDAYS[0], "a", None), (MONDAYS[1], None, failure)]
+    assert list(in_order(results, MONDAYS)) == [
+        (MONDAYS[0], "a", None),
+        (MONDAYS[1], None, failure),
+        (MONDAYS[2], "c", None),
+    ]
+
+
+def test_in_order_yields_as_soon_as_possible():
+    seen = []
+
+    def results():
+        for monday in (MONDAYS[0], MONDAYS[2], MONDAYS[1]):
+            seen.append(monday)
+            yield monday, None, None
+
+    ordered = in_order(results(), MONDAYS)
+    assert next(ordered)[0] == MONDAYS[0]
+    assert seen == [MONDAYS[0]]
+
+
+def test_day_rows():
+    rows = day_rows("Ana", WEEK, date(2024, 1, 1), date(2024, 1, 31), NOW)
+    assert [row["date"] for row in rows] == [date(2024, 1, 15), date(2024, 1, 16), date(2024, 1, 17)]
+    monday, tuesday, today = rows
+    assert monday["weekday"] == "lundi" and monday["punches"] == ["08:00", "12:00", "13:00", "17:00"]
+    assert monday["effective_minutes"] == 8 * 60
+    assert monday["paid_minutes"] == 8 * 60 + 2 * PAUSE_PAID_MINUTES
+    # A forgotten exit on a past day counts for nothing and is not "open"
+    assert tuesday["effective_minutes"] == 0 and not tuesday["open"]
+    # Today's open punch runs until now
+    assert today["effective_minutes"] == 3 * 60 and today["open"]
+
+
+def test_day_rows_keep_to_the_range():
+    rows = day_rows("Ana", WEEK, date(2024, 1, 16), date(2024, 1, 16), NOW)
+    assert [row["date"] for row in rows] == [date(2024, 1, 16)]
+
+
+def test_format_for():
+    assert format_for("out.JSONL") == "jsonl"
+    assert format_for("out.pq") == "parquet"
+    assert format_for("-") == "csv"
+    assert format_for("out.csv", "jsonl") == "jsonl"
+
+
+def batches():
+    rows = day_rows("Ana", WEEK, date(2024, 1, 1), date(2024, 1, 31), NOW)
+    return [rows[:1], [], rows[1:]]
+
+
+def test_write_csv(tmp_path):
+    path = tmp_path / "out.csv"
+    assert write_csv(batches(), str(path)) == 3
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == ["name", "date", "weekday", "punches", "effective_minutes", "paid_minutes", "open"]
+    assert lines[1][:4] == ["Ana", "2024-01-15", "lundi", "08:00 12:00 13:00 17:00"]
+    assert lines[3][-1] == "1"
+
+
+def test_write_jsonl(tmp_path):
+    path = tmp_path / "out.jsonl"
+    assert write_jsonl(batches(), str(path)) == 3
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["date"] for r in records] == ["2024-01-15", "2024-01-16", "2024-01-17"]
+    assert records[0]["punches"] == ["08:00", "12:00", "13:00", "17:00"]
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    assert write_parquet(batches(), str(path)) == 3
+    table = pq.read_table(str(path))
+    assert table.column("date").to_pylist() == [date(2024, 1, 15), date(2024, 1, 16), date(2024, 1, 17)]
+    assert table.column("open").to_pylist() == [False, False, True]
+
+
+def test_slow_first_week_keeps_the_reorder_buffer_small():
+    mondays = [date(2024, 1, 1) + timedelta(weeks=i) for i in range(12)]
+    release = threading.Event()
+    started = []
+
+    class SlowFirstWeek:
+        attempts = 1
+
+        def fetch(self, week=None) -> dict:
+            started.append(week)
+            if week == mondays[0]:
+                release.wait(5)
+            return {"hours": {}}
+
+    results = backfill(SlowFirstWeek, mondays, jobs=3, ordered=True)
+    ahead = []
+
+    def watched():
+        for result in results:
+            ahead.append(result[0])
+            if len(ahead) == 2:
+                # Weeks 1 and 2 are in: nothing later may start before week 0 ends
+                time.sleep(0.2)
+                assert sorted(started) == mondays[:3]
+                release.set()
+            yield result
+
+    assert [monday for monday, _week, _error in in_order(watched(), mondays)] == mondays
@@ -0,0 +1,61 @@
+from quelio_cli.config import Config
+from quelio_cli.lite import LiteDashboard, Palette, Screen
+from quelio_cli.store import HistoryStore
+
+PLAIN = "\x1b[0m"
+
+
+def frame(*rows):
+    return [[(row, None, None, False)] for row in rows]
+
+
+def test_first_frame_is_a_full_repaint():
+    out = Screen(Palette()).draw(frame("ab", "cd"), 4, 2)
+    assert out.startswith("\x1b[0m\x1b[2J")
+    assert "ab" in out and "cd" in out
+
+
+def test_unchanged_frame_writes_nothing():
+    screen = Screen(Palette())
+    screen.draw(frame("hello", "world"), 10, 2)
+    assert screen.draw(frame("hello", "world"), 10, 2) == ""
+
+
+def test_only_changed_cells_are_rewritten():
+    screen = Screen(Palette())
+    screen.draw(frame("hello world", "second"), 20, 2)
+    assert screen.draw(frame("hello World", "second"), 20, 2) == f"\x1b[1;7H{PLAIN}W"
+
+
+def test_close_changes_are_written_in_one_run():
+    screen = Screen(Palette())
+    screen.draw(frame("abcdefgh"), 20, 1)
+    # Unchanged `bc` between two changes is cheaper to rewrite than to skip
+    assert screen.draw(frame("AbcDefgh"), 20, 1) == f"\x1b[1;1H{PLAIN}AbcD"
+
+
+def test_resize_and_invalidate_repaint_everything():
+    screen = Screen(Palette())
+    screen.draw(frame("abc"), 10, 1)
+    assert screen.draw(frame("abc"), 12, 1).startswith("\x1b[0m\x1b[2J")
+    screen.invalidate()
+    assert screen.draw(frame("abc"), 12, 1).startswith("\x1b[0m\x1b[2J")
+
+
+def dashboard(tmp_path) -> LiteDashboard:
+    conf = Config(api_url="http://api.test/", username="u", poll_interval=0)
+    return LiteDashboard(conf, api=None, history=HistoryStore(str(tmp_path / "h.sqlite3")))
+
+
+def test_focus_reports_are_not_end_of_input(tmp_path):
+    app = dashboard(tmp_path)
+    assert app._on_input(b"\x1b[O")
+    assert not app.focused
+    assert app._on_input(b"\x1b[I")
+    assert app.focused
+
+
+def test_end_of_input_and_q_quit(tmp_path):
+    app = dashboard(tmp_path)
+    assert not app._on_input(b"")
+    assert not app._on_input(b"\x1b[Iq")
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from quelio_cli.api import ApiError
+from quelio_cli.model import parse_week
+
+
+def test_punches_become_sorted_minutes():
+    week = parse_week({"hours": {"15-01-24": ["13:00", "08:30", "12:00", "17:05"]}})
+    day = week.days["15-01-2024"]
+    assert day.date == date(2024, 1, 15)
+    assert day.minutes == (510, 720, 780, 1025)
+    assert not day.is_open
+
+
+def test_missing_day_has_no_punches():
+    week = parse_week({"hours": {"15-01-2024": ["08:00"]}})
+    assert week.minutes("16-01-2024") == ()
+    assert week.days["15-01-2024"].is_open
+
+
+def test_digest_follows_the_payload():
+    a = parse_week({"hours": {"15-01-2024": ["08:00"]}})
+    b = parse_week({"hours": {"15-01-2024": ["08:00"]}})
+    c = parse_week({"hours": {"15-01-2024": ["08:01"]}})
+    assert a.digest == b.digest != c.digest
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"hours": []},
+        {"hours": {"32-01-2024": []}},
+        {"hours": {"15-01-2024": "08:00"}},
+        {"hours": {"15-01-2024": ["8h00"]}},
+        {"hours": {"15-01-2024": ["24:00"]}},
+    ],
+)
+def test_malformed_payloads_raise(payload):
+    with pytest.raises(ApiError):
+        parse_week(payload)
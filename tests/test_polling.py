@@ -0,0 +1,64 @@
+import random
+from datetime import datetime, timedelta
+
+from quelio_cli.model import parse_week
+from quelio_cli.polling import IDLE_FACTOR, MAX_POLL_INTERVAL, MIN_POLL_INTERVAL, PollScheduler
+from quelio_cli.utils_time import current_week_dates
+
+WEEK = current_week_dates()
+MONDAY_KEY, _, MONDAY = WEEK[0]
+TUESDAY_KEY, _, TUESDAY = WEEK[1]
+
+
+def at(day: datetime, hhmm: str) -> datetime:
+    h, m = hhmm.split(":")
+    return day.replace(hour=int(h), minute=int(m), second=0, microsecond=0)
+
+
+def scheduler(interval: float = 60) -> PollScheduler:
+    return PollScheduler(interval, [0, 1, 2, 3, 4], rng=random.Random(0))
+
+
+def test_open_punch_polls_at_full_rate():
+    week = parse_week({"hours": {TUESDAY_KEY: ["08:00"]}})
+    assert 54 <= scheduler().next_delay(week, at(TUESDAY, "11:00")) <= 66
+
+
+def test_near_a_usual_badge_time_polls_at_full_rate():
+    week = parse_week({"hours": {MONDAY_KEY: ["08:00", "12:00"]}})
+    assert scheduler().next_delay(week, at(TUESDAY, "11:50")) <= 66
+
+
+def test_idle_wakes_up_before_the_next_usual_time():
+    week = parse_week({"hours": {MONDAY_KEY: ["08:00", "12:00"]}})
+    # Next window opens at 11:40, 20 minutes away, before the idle delay ends
+    delay = scheduler(300).next_delay(week, at(TUESDAY, "11:20"))
+    assert 0.9 * 20 * 60 <= delay <= 1.1 * 20 * 60
+
+
+def test_idle_without_usual_times():
+    delay = scheduler().next_delay(parse_week({"hours": {}}), at(TUESDAY, "11:00"))
+    assert 0.9 * 60 * IDLE_FACTOR <= delay <= 1.1 * 60 * IDLE_FACTOR
+
+
+def test_days_off_are_idle():
+    week = parse_week({"hours": {MONDAY_KEY: ["08:00", "12:00"]}})
+    sunday = MONDAY + timedelta(days=6)
+    assert scheduler().next_delay(week, at(sunday, "11:55")) >= 0.9 * 60 * IDLE_FACTOR
+
+
+def test_errors_back_off_and_reset():
+    s = scheduler()
+    week = parse_week({"hours": {TUESDAY_KEY: ["08:00"]}})
+    for _ in range(20):
+        s.record_error()
+    assert 60 <= s.next_delay(week, at(TUESDAY, "11:00")) <= MAX_POLL_INTERVAL
+    s.record_success()
+    assert s.next_delay(week, at(TUESDAY, "11:00")) <= 66
+    # A long outage (days of failed polls) keeps the ceiling
+    s.errors = 5000
+    assert 60 <= s.next_delay(week, at(TUESDAY, "11:00")) <= MAX_POLL_INTERVAL
+
+
+def test_interval_has_a_floor():
+    assert PollScheduler(1).interval == MIN_POLL_INTERVAL
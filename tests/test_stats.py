@@ -0,0 +1,89 @@
+import sys
+from datetime import date
+
+import pytest
+
+from quelio_cli.api import ApiError
+from quelio_cli.utils_time import day_total_from_points
+
+np = pytest.importorskip("numpy")
+
+from quelio_cli.stats import PunchColumns, compute  # noqa: E402
+
+TARGET = 38 * 60 / 5
+WORK_DAYS = [0, 1, 2, 3, 4]
+# (ISO day, punches) as `HistoryStore.raw_days` returns them
+ROWS = [
+    ("2024-01-13", "600,660"),  # Saturday: all overtime
+    ("2024-01-15", "480,720,780,1020"),  # 8h: under target
+    ("2024-01-16", "480,720,780"),  # open punch: only 4h count
+    ("2024-01-17", "450,720,750,1050"),  # 9h30: over target, breaks the streak
+    ("2024-01-18", "540,720"),
+    ("2024-01-19", ""),  # no punch: not worked
+    ("2024-01-22", "480,700,760,990"),
+    ("2024-01-23", "480,600"),
+]
+
+
+def reference(rows):
+    """The same figures, one day at a time."""
+    worked = []
+    for iso, punches in rows:
+        points = [int(m) for m in punches.split(",")] if punches else []
+        total = day_total_from_points(points)
+        if total > 0:
+            day = date.fromisoformat(iso)
+            target = TARGET if day.weekday() in WORK_DAYS else 0
+            worked.append((day, points, total, total - target))
+    best, run = (0, None, None), []
+    for day, _points, _total, overtime in worked:
+        run = run + [day] if overtime < 0 else []
+        if len(run) > best[0]:
+            best = (len(run), run[0], run[-1])
+    return worked, best
+
+
+def test_totals_match_a_per_day_loop():
+    worked, _best = reference(ROWS)
+    result = compute(PunchColumns(ROWS), TARGET, WORK_DAYS)
+    assert result["days_worked"] == len(worked)
+    assert result["total_minutes"] == sum(total for _d, _p, total, _o in worked)
+    assert result["mean_arrival"] == pytest.approx(np.mean([p[0] for _d, p, _t, _o in worked]))
+    closed = [p[-1] for _d, p, _t, _o in worked if len(p) % 2 == 0]
+    assert result["mean_departure"] == pytest.approx(np.mean(closed))
+    overtime = [o for _d, _p, _t, o in worked]
+    assert result["overtime"]["total"] == pytest.approx(sum(overtime))
+    assert result["overtime"]["median"] == pytest.approx(np.median(overtime))
+    assert sum(b["days"] for b in result["overtime"]["histogram"]) == len(worked)
+    saturday = next(wd for wd in result["weekdays"] if wd["weekday"] == "samedi")
+    assert saturday["mean_overtime"] == 60
+
+
+def test_streak_matches_a_per_day_loop():
+    _worked, (days, first, last) = reference(ROWS)
+    streak = compute(PunchColumns(ROWS), TARGET, WORK_DAYS)["longest_under_target"]
+    assert streak == {"days": days, "from": first.isoformat(), "to": last.isoformat()}
+    # Thursday then Monday and Tuesday: days without work do not break a streak
+    assert streak["days"] == 3
+
+
+def test_no_day_under_target():
+    rows = [("2024-01-15", "480,1080")]
+    assert compute(PunchColumns(rows), TARGET, WORK_DAYS)["longest_under_target"] is None
+
+
+def test_empty_history():
+    assert compute(PunchColumns([]), TARGET, WORK_DAYS) == {"days_worked": 0, "total_minutes": 0}
+    assert compute(PunchColumns([("2024-01-15", "")]), TARGET, WORK_DAYS)["days_worked"] == 0
+
+
+def test_concat_keeps_days_apart():
+    both = PunchColumns.concat([PunchColumns(ROWS[:3]), PunchColumns(ROWS[3:])])
+    whole = compute(PunchColumns(ROWS), TARGET, WORK_DAYS, streak=False)
+    assert compute(both, TARGET, WORK_DAYS, streak=False) == whole
+
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(ApiError):
+        PunchColumns(ROWS)
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from quelio_cli.api import TransientError
+from quelio_cli.commands import status
+
+MONDAY = {"15-01-2024": ["08:00", "12:00"]}
+PAYLOADS = [
+    {"hours": dict(MONDAY), "total_effective": "04:00"},
+    # Unchanged: nothing printed
+    {"hours": dict(MONDAY), "total_effective": "04:00"},
+    TransientError("HTTP 503"),
+    {"hours": {**MONDAY, "16-01-2024": ["09:00", "10:30"]}, "total_effective": "05:30"},
+    # Tuesday removed by the server
+    {"hours": dict(MONDAY), "total_effective": "04:00"},
+]
+
+
+class ScriptedApi:
+    def __init__(self, answers) -> None:
+        self.answers = list(answers)
+
+    def fetch(self, force: bool = False, stale_ok: bool = True) -> dict:
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class Stop(Exception):
+    pass
+
+
+def watch(monkeypatch, fmt: str) -> None:
+    api = ScriptedApi(PAYLOADS)
+
+    def sleep(_seconds):
+        if not api.answers:
+            raise Stop
+
+    monkeypatch.setattr(status.time, "sleep", sleep)
+    with pytest.raises(Stop):
+        status._watch(api, 60, fmt)
+
+
+def test_watch_prints_only_changes(monkeypatch, capsys):
+    watch(monkeypatch, "text")
+    out, err = capsys.readouterr()
+    snapshot = [line for line in out.splitlines() if line and not line.startswith("[")]
+    assert "  Total effectif : 04:00" in snapshot and "- lundi 15-01-2024 : 04:00" in snapshot
+    # Later lines are timestamped changes
+    lines = [line.split("] ", 1)[1] for line in out.splitlines() if line.startswith("[")]
+    assert lines == [
+        "Total effectif : 05:30  Total payé : ?",
+        "- mardi 16-01-2024 : 01:30",
+        "Total effectif : 04:00  Total payé : ?",
+        "- 16-01-2024 : retiré",
+    ]
+    assert "Erreur de chargement: HTTP 503" in err
+
+
+def test_watch_jsonl_records(monkeypatch, capsys):
+    watch(monkeypatch, "jsonl")
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    for record in records:
+        assert record.pop("time")
+    assert records == [
+        {"type": "totals", "total_effective": "04:00", "total_paid": None},
+        {
+            "type": "day",
+            "date": "15-01-2024",
+            "weekday": "lundi",
+            "minutes": 240,
+            "total": "04:00",
+            "punches": ["08:00", "12:00"],
+        },
+        {"type": "error", "message": "HTTP 503"},
+        {"type": "totals", "total_effective": "05:30", "total_paid": None},
+        {
+            "type": "day",
+            "date": "16-01-2024",
+            "weekday": "mardi",
+            "minutes": 90,
+            "total": "01:30",
+            "punches": ["09:00", "10:30"],
+        },
+        {"type": "totals", "total_effective": "04:00", "total_paid": None},
+        {"type": "removed", "date": "16-01-2024"},
+    ]
@@ -0,0 +1,38 @@
+from datetime import date
+
+from quelio_cli.model import parse_week
+from quelio_cli.store import HistoryStore
+
+WEEK = parse_week({"hours": {"15-01-2024": ["08:00", "12:00"], "16-01-2024": ["09:00"]}})
+
+
+def test_forget_only_removes_one_account(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    for account in ("a@api", "b@api"):
+        store.merge(account, WEEK)
+        store.mark_week(account, date(2024, 1, 15))
+    assert store.forget("a@api") == 2
+    assert store.days("a@api", date(2024, 1, 1), date(2024, 12, 31)) == []
+    assert store.fetched_weeks("a@api", date(2024, 1, 1), date(2024, 12, 31)) == set()
+    assert len(store.days("b@api", date(2024, 1, 1), date(2024, 12, 31))) == 2
+    assert store.fetched_weeks("b@api", date(2024, 1, 1), date(2024, 12, 31)) == {date(2024, 1, 15)}
+
+
+def test_merging_a_whole_week_drops_days_the_server_removed(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    store.merge("a@api", WEEK)
+    store.merge("a@api", parse_week({"hours": {"22-01-2024": ["08:00"]}}))
+    # Tuesday removed, Monday emptied, nothing else in the week
+    assert store.merge("a@api", parse_week({"hours": {"15-01-2024": []}}), week=date(2024, 1, 17)) == 2
+    assert store.days("a@api", date(2024, 1, 15), date(2024, 1, 21)) == []
+    # Other weeks are untouched
+    assert len(store.days("a@api", date(2024, 1, 22), date(2024, 1, 28))) == 1
+
+
+def test_merging_a_whole_week_keeps_its_days(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    store.merge("a@api", WEEK)
+    changed = parse_week({"hours": {"15-01-2024": ["08:00", "12:30"]}})
+    assert store.merge("a@api", changed, week=date(2024, 1, 15)) == 2
+    [monday] = store.days("a@api", date(2024, 1, 15), date(2024, 1, 21))
+    assert monday.minutes == (480, 750)
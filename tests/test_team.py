@@ -0,0 +1,75 @@
+import json
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from quelio_cli.api import ApiError
+from quelio_cli.config import Profile
+from quelio_cli.team import TeamFetcher
+
+PROFILES = [Profile(name, name.lower(), "http://api.test/") for name in ("Ana", "Bob", "Cy")]
+
+
+class FakeApi:
+    def __init__(self, result) -> None:
+        self.result = result
+
+    def fetch(self, force: bool = False, stale_ok: bool = True) -> dict:
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_each_failure_only_concerns_its_profile():
+    fetcher = TeamFetcher(PROFILES, {p.account: "pwd" for p in PROFILES})
+    results = [{"hours": {}}, ApiError("refusé"), OSError("disque plein")]
+    fetcher.apis = {p.account: FakeApi(r) for p, r in zip(PROFILES, results)}
+    try:
+        got = {p.name: (week, error) for p, week, error in fetcher.fetch_all()}
+    finally:
+        fetcher.close()
+    assert got["Ana"][0] is not None and got["Ana"][1] is None
+    assert str(got["Bob"][1]) == "refusé"
+    assert isinstance(got["Cy"][1], OSError)
+
+
+class FlakyAdapter(BaseAdapter):
+    """Answers 503 to the first `failures` requests, then an empty week."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.requests = 0
+
+    def send(self, request, **kwargs) -> Response:
+        self.requests += 1
+        resp = Response()
+        resp.status_code = 503 if self.requests <= self.failures else 200
+        resp._content = json.dumps({"hours": {}}).encode("utf-8")
+        resp.request = request
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+class CountingLimiter:
+    def __init__(self) -> None:
+        self.tokens = 0
+
+    def acquire(self) -> None:
+        self.tokens += 1
+
+
+def test_every_http_request_takes_a_token():
+    transport = FlakyAdapter(failures=2)
+    fetcher = TeamFetcher(PROFILES[:1], {PROFILES[0].account: "pwd"}, adapter=transport)
+    limiter = fetcher._adapter.limiter = CountingLimiter()
+    api = fetcher.apis[PROFILES[0].account].api
+    try:
+        # The client's own retries go through the shared transport too
+        api.fetch()
+    finally:
+        fetcher.close()
+    assert transport.requests == 3
+    assert limiter.tokens == 3
@@ -0,0 +1,86 @@
+import pytest
+
+from quelio_cli.timeline import (
+    EIGHTHS,
+    EMPTY,
+    FULL,
+    MIN_TIMELINE_WIDTH,
+    fit_window,
+    merge_intervals,
+    ruler,
+    timeline_runs,
+    timeline_width,
+)
+
+
+def width_of(runs) -> int:
+    return sum(len(glyphs) for glyphs, _kind, _reverse in runs)
+
+
+def test_merge_intervals_sorts_and_merges_overlaps():
+    merged, live = merge_intervals([600, 700, 480, 620, 800, 900], None)
+    assert merged == [(480, 700), (800, 900)]
+    assert live is None
+
+
+def test_merge_intervals_open_punch_runs_until_now():
+    assert merge_intervals([480, 720, 780], 800) == ([(480, 720)], (780, 800))
+    # A clock behind the last punch never draws a negative span
+    assert merge_intervals([780], 700)[1] == (780, 780)
+    assert merge_intervals([780], None)[1] is None
+
+
+def test_fit_window_widens_to_whole_hours():
+    assert fit_window([]) == (8 * 60, 18 * 60)
+    assert fit_window([(7 * 60 + 30, 12 * 60), (13 * 60, 19 * 60 + 10)]) == (7 * 60, 20 * 60)
+
+
+def test_empty_day_is_one_empty_run():
+    assert timeline_runs([], None, 20, (0, 160)) == [(EMPTY * 20, "empty", False)]
+
+
+@pytest.mark.parametrize("width", [MIN_TIMELINE_WIDTH, 13, 40, 97])
+def test_runs_always_fill_the_width(width):
+    intervals = [(8 * 60 + 7, 10 * 60 + 1), (10 * 60 + 2, 10 * 60 + 3), (13 * 60, 17 * 60 + 59)]
+    runs = timeline_runs(intervals, (18 * 60, 18 * 60 + 20), width, (8 * 60, 19 * 60))
+    assert width_of(runs) == width
+    assert {kind for _glyphs, kind, _reverse in runs} == {"fill", "live", "empty"}
+
+
+def test_partial_columns_use_eighth_blocks():
+    # One minute is one eighth of a column over this window
+    assert timeline_runs([(0, 12)], None, 10, (0, 80)) == [
+        (FULL + EIGHTHS[4], "fill", False),
+        (EMPTY * 8, "empty", False),
+    ]
+    # Right-anchored coverage: the uncovered left part in reverse video
+    assert timeline_runs([], (4, 16), 10, (0, 80))[:2] == [
+        (EIGHTHS[4], "live", True),
+        (FULL, "live", False),
+    ]
+
+
+def test_one_minute_punch_stays_visible():
+    runs = timeline_runs([(600, 600)], None, 10, (0, 24 * 60))
+    assert any(kind == "fill" for _glyphs, kind, _reverse in runs)
+
+
+def test_shared_column_goes_to_the_main_kind():
+    # 2 eighths of fill then 3 of live in the first column: drawn as live
+    runs = timeline_runs([(0, 2)], (5, 8), 10, (0, 80))
+    assert runs[0] == (EIGHTHS[3], "live", True)
+    assert width_of(runs) == 10
+
+
+def test_ruler_labels_hours():
+    line = ruler(40, (8 * 60, 18 * 60))
+    assert line.startswith("08") and line.endswith("18")
+    assert len(line) <= 42
+    # Too narrow for every hour: labels are spaced out but never touch
+    narrow = ruler(12, (0, 24 * 60))
+    assert "  " in narrow and all(len(label) == 2 for label in narrow.split())
+
+
+def test_timeline_width_has_a_floor():
+    assert timeline_width(43) == 40
+    assert timeline_width(5) == MIN_TIMELINE_WIDTH
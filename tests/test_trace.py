@@ -0,0 +1,18 @@
+from quelio_cli.trace import Tracer
+
+
+def test_timed_is_a_shared_no_op_when_histograms_are_off():
+    tracer = Tracer()
+    assert tracer.timed("a") is tracer.timed("b")
+    with tracer.timed("a"):
+        pass
+    assert tracer.histograms == {}
+
+
+def test_timed_records_into_the_histogram():
+    tracer = Tracer()
+    tracer.histograms_enabled = True
+    for _ in range(3):
+        with tracer.timed("render"):
+            pass
+    assert tracer.histograms["render"].count == 3